@@ -0,0 +1,149 @@
+"""
+Write-behind tracking of ``last_login`` and ``last_seen``.
+
+Logins and authenticated requests only note a timestamp in a per-process
+buffer, keyed by user id. Repeated events for a user coalesce into one
+entry, and a background thread writes each buffer out every
+ACTIVITY_FLUSH_INTERVAL seconds. The write is a few batched UPDATEs (one
+CASE expression per batch) instead of a write per event.
+
+The final flush happens at interpreter exit, so a graceful worker shutdown
+(SIGTERM handled by gunicorn or runserver) does not drop pending timestamps.
+A hard kill loses at most one interval of activity, which is acceptable for
+informational columns.
+
+Timestamps never move backwards. Each UPDATE keeps the later of the stored
+value and the buffered one, so flushes from several workers can land in any
+order.
+"""
+
+import atexit
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+UPDATE_BATCH_SIZE = 500
+
+
+class ActivityBuffer:
+    """Coalesces per-user activity timestamps and flushes them in batches."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    def record_login(self, user_id, when=None):
+        self._record(user_id, when or timezone.now(), login=True)
+
+    def record_seen(self, user_id, when=None):
+        self._record(user_id, when or timezone.now(), login=False)
+
+    def _record(self, user_id, when, login):
+        if not settings.ACTIVITY_TRACKING:
+            return
+        with self._lock:
+            last_login, last_seen = self._pending.get(user_id, (None, None))
+            if login and (last_login is None or when > last_login):
+                last_login = when
+            if last_seen is None or when > last_seen:
+                last_seen = when
+            self._pending[user_id] = (last_login, last_seen)
+            pending = len(self._pending)
+        if pending >= settings.ACTIVITY_MAX_PENDING:
+            self._wakeup.set()
+        self._ensure_thread()
+
+    def flush(self):
+        """Write every buffered timestamp now; returns the number of users."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        from .models.user import CustomUser
+
+        logins, seen_only = [], []
+        for user_id, (last_login, last_seen) in pending.items():
+            user = CustomUser(pk=user_id)
+            user.last_seen = _latest("last_seen", last_seen)
+            if last_login is None:
+                seen_only.append(user)
+            else:
+                user.last_login = _latest("last_login", last_login)
+                logins.append(user)
+        try:
+            CustomUser.objects.bulk_update(
+                logins, ["last_login", "last_seen"], batch_size=UPDATE_BATCH_SIZE
+            )
+            CustomUser.objects.bulk_update(
+                seen_only, ["last_seen"], batch_size=UPDATE_BATCH_SIZE
+            )
+        except Exception:
+            logger.exception("Dropped activity for %d user(s)", len(pending))
+            return 0
+        logger.debug("Flushed activity for %d user(s)", len(pending))
+        return len(pending)
+
+    def _ensure_thread(self):
+        if self._thread is not None or settings.ACTIVITY_FLUSH_INTERVAL <= 0:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="activity-flusher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(settings.ACTIVITY_FLUSH_INTERVAL)
+            self._wakeup.clear()
+            self.flush()
+            # This thread's connection would otherwise outlive CONN_MAX_AGE
+            connection.close()
+
+    def shutdown(self):
+        """Stop the flusher thread and write whatever is still buffered."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def reset(self):
+        """Forget buffered events and the flusher thread (after fork, or in tests)."""
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+
+def _latest(field, value):
+    """Expression keeping the later of the stored column and ``value``."""
+    value = Value(value)
+    return Greatest(Coalesce(F(field), value), value)
+
+
+ACTIVITY = ActivityBuffer()
+os.register_at_fork(after_in_child=ACTIVITY.reset)
+atexit.register(ACTIVITY.shutdown)
+
+
+def record_login(user_id):
+    ACTIVITY.record_login(user_id)
+
+
+def record_seen(user_id):
+    ACTIVITY.record_seen(user_id)
@@ -1,7 +1,18 @@
+from datetime import timedelta
+
 from django.contrib import admin
 from django.contrib.admin.forms import AdminAuthenticationForm
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+from django.urls import path
+from django.utils import timezone
 
+from .export import EXPORT_FORMATS, export_users, parse_fields, parse_since
+from .models.audit import AuthAuditEvent
 from .models.user import CustomUser
+from .pagination import EstimatedCountPaginator
+from .search import filter_users
 
 
 class EmailAdminAuthenticationForm(AdminAuthenticationForm):
@@ -12,5 +23,103 @@ class EmailAdminAuthenticationForm(AdminAuthenticationForm):
         self.fields["username"].label = "Email"
 
 
+class LeanChangeList(ChangeList):
+    """Changelist that loads only the displayed columns."""
+
+    def get_queryset(self, request):
+        concrete = {field.name for field in self.model._meta.concrete_fields}
+        columns = [name for name in self.list_display if name in concrete]
+        return super().get_queryset(request).only(*columns)
+
+
+@admin.register(CustomUser)
+class CustomUserAdmin(admin.ModelAdmin):
+    """
+    User admin that stays fast on multi-million-row tables.
+
+    - Row counts come from EstimatedCountPaginator, and the unfiltered total
+      is not shown, so no changelist page runs an unbounded COUNT(*).
+    - Rows are loaded with .only() the displayed columns.
+    - Sorting is limited to indexed columns (pk, email).
+    - Search uses the same prefix-first email lookup as search-users.
+    """
+
+    list_display = ("email", "is_active", "is_staff", "date_joined", "last_login")
+    ordering = ("-pk",)
+    sortable_by = ("email",)
+    search_fields = ("email",)
+    search_help_text = "Email prefix (falls back to substring if nothing matches)"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return LeanChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        return filter_users(queryset, search_term), False
+
+    def get_urls(self):
+        export = path(
+            "export/",
+            self.admin_site.admin_view(self.export_view),
+            name="api_customuser_export",
+        )
+        return [export, *super().get_urls()]
+
+    def export_view(self, request):
+        """
+        Stream the user table as CSV or JSON Lines.
+
+        GET /admin/api/customuser/export/?format=csv&fields=id,email&since=2024-01-01
+        - format: csv (default) or jsonl
+        - fields: comma-separated subset of api.export.EXPORT_FIELDS
+        - since: only users who joined at or after this ISO date/datetime;
+          unlike watermark-driven incremental runs there is no overlap
+        """
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        fmt = request.GET.get("format", "csv")
+        if fmt not in EXPORT_FORMATS:
+            return HttpResponseBadRequest(
+                f"format must be one of: {', '.join(EXPORT_FORMATS)}"
+            )
+        try:
+            fields = parse_fields(request.GET.get("fields"))
+            since = parse_since(request.GET.get("since"))
+        except ValueError as exc:
+            return HttpResponseBadRequest(str(exc))
+
+        response = StreamingHttpResponse(
+            export_users(fmt, fields, since, overlap=timedelta(0)),
+            content_type=EXPORT_FORMATS[fmt],
+        )
+        filename = f"users-{timezone.now():%Y%m%dT%H%M%S}.{fmt}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+@admin.register(AuthAuditEvent)
+class AuthAuditEventAdmin(admin.ModelAdmin):
+    """Read-only audit trail, newest first, filtered by time and event."""
+
+    list_display = ("created_at", "event", "email", "user_id", "ip")
+    list_filter = ("event",)
+    ordering = ("-created_at",)
+    sortable_by = ()
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
 admin.site.login_form = EmailAdminAuthenticationForm
-admin.site.register(CustomUser)
@@ -1,5 +1,6 @@
 from django.apps import AppConfig
 from django.conf import settings
+from django.db.models.signals import post_migrate, pre_migrate
 
 
 class ApiConfig(AppConfig):
@@ -18,6 +19,12 @@ class ApiConfig(AppConfig):
         This check ensures that the test user is not accidentally left in the
         production database, which would be a critical security risk.
         """
+        from api import signals  # noqa: F401  (connects model signal receivers)
+        from api.online_migrations import capture_migrate_output, release_migrate_output
+
+        pre_migrate.connect(capture_migrate_output, sender=self)
+        post_migrate.connect(release_migrate_output, sender=self)
+
         if not settings.DEBUG:
             from api.models.user import CustomUser
 
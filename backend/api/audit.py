@@ -0,0 +1,227 @@
+"""
+Asynchronous, batched auth audit log.
+
+Request handlers call ``record(...)``, which only stamps the event and puts
+it on a bounded in-process queue. A background thread drains the queue and
+bulk-inserts AuthAuditEvent rows: up to AUDIT_BATCH_SIZE rows per INSERT,
+at most AUDIT_FLUSH_INTERVAL seconds after an event was queued.
+
+When the queue is full (the database is slow or down) new events are
+dropped rather than blocking the request; drops are counted in the
+api_audit_events_total{outcome="dropped"} metric and logged. Pending
+events are written at process exit. Emails are truncated to the column
+length when recorded, and a batch the database rejects is retried row by
+row, so one bad event cannot take the rest of its batch down with it.
+
+``client_ip(request)`` is the address the rate limits key on (see
+api.throttling), so audit rows and throttle decisions agree.
+
+``purge(before)`` implements retention: it deletes events older than a
+cutoff in chunks, each its own short transaction.
+"""
+
+import atexit
+import ipaddress
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.throttling import BaseThrottle
+
+from .metrics import AUDIT_EVENTS
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLog:
+    """Bounded queue of audit events plus the thread that writes them."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget queued events and the writer thread (after fork, or in tests)."""
+        self._queue = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+        self._last_drop_log = 0.0
+
+    @property
+    def queue(self):
+        if self._queue is None:
+            with self._lock:
+                if self._queue is None:
+                    self._queue = queue.Queue(maxsize=settings.AUDIT_QUEUE_SIZE)
+        return self._queue
+
+    def record(self, event, user_id=None, email="", ip=None, **detail):
+        if not settings.AUDIT_LOG:
+            return
+        from .models.audit import AuthAuditEvent
+
+        # Failed logins record whatever the client typed
+        email = (email or "")[: AuthAuditEvent._meta.get_field("email").max_length]
+        entry = (timezone.now(), event, user_id, email, ip, detail)
+        try:
+            self.queue.put_nowait(entry)
+        except queue.Full:
+            AUDIT_EVENTS.inc((event, "dropped"))
+            now = time.monotonic()
+            if now - self._last_drop_log > 10:
+                self._last_drop_log = now
+                logger.warning("Audit queue full; dropping events")
+            return
+        AUDIT_EVENTS.inc((event, "queued"))
+        self._ensure_thread()
+
+    def flush(self):
+        """Write every queued event now; returns the number written."""
+        written = 0
+        while True:
+            batch = self._drain(settings.AUDIT_BATCH_SIZE)
+            if not batch:
+                return written
+            written += self._write(batch)
+
+    def _drain(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        from .models.audit import AuthAuditEvent
+
+        rows = [
+            AuthAuditEvent(
+                created_at=created_at,
+                event=event,
+                user_id=user_id,
+                email=email,
+                ip=ip,
+                detail=detail,
+            )
+            for created_at, event, user_id, email, ip, detail in batch
+        ]
+        if self._insert(rows):
+            written, failed = rows, []
+        else:
+            # Find the rejected row(s) instead of losing the whole batch
+            written, failed = [], []
+            for row in rows:
+                (written if self._insert([row]) else failed).append(row)
+            logger.error(
+                "Failed to write %d of %d audit event(s)", len(failed), len(rows)
+            )
+        for outcome, outcome_rows in (("written", written), ("failed", failed)):
+            counts = {}
+            for row in outcome_rows:
+                counts[row.event] = counts.get(row.event, 0) + 1
+            for event, count in counts.items():
+                AUDIT_EVENTS.inc((event, outcome), count)
+        return len(written)
+
+    def _insert(self, rows):
+        from .models.audit import AuthAuditEvent
+
+        try:
+            # A savepoint when flushed inside a request's transaction
+            with transaction.atomic():
+                AuthAuditEvent.objects.bulk_create(rows)
+        except Exception:
+            logger.exception("Failed to write %d audit event(s)", len(rows))
+            return False
+        return True
+
+    def _ensure_thread(self):
+        if self._thread is not None or settings.AUDIT_FLUSH_INTERVAL <= 0:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        interval = settings.AUDIT_FLUSH_INTERVAL
+        batch_size = settings.AUDIT_BATCH_SIZE
+        while not self._stopping:
+            try:
+                first = self.queue.get(timeout=interval)
+            except queue.Empty:
+                continue
+            # Give the batch up to one interval to fill before writing it
+            deadline = time.monotonic() + interval
+            batch = [first]
+            while len(batch) < batch_size and not self._stopping:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+            connection.close()
+
+    def shutdown(self):
+        """Stop the writer thread and write whatever is still queued."""
+        self._stopping = True
+        if self._thread is not None:
+            self._thread.join(timeout=settings.AUDIT_FLUSH_INTERVAL + 5)
+        if self._queue is not None:
+            self.flush()
+
+
+AUDIT_LOG = AuditLog()
+os.register_at_fork(after_in_child=AUDIT_LOG.reset)
+atexit.register(AUDIT_LOG.shutdown)
+
+
+def record(event, user_id=None, email="", ip=None, **detail):
+    """Queue an audit event; never blocks and never touches the database."""
+    AUDIT_LOG.record(event, user_id, email, ip, **detail)
+
+
+def client_ip(request):
+    """
+    The client address as the rate limits identify it: REMOTE_ADDR, or the
+    X-Forwarded-For entry NUM_PROXIES hops back. None if it is not an IP.
+    """
+    try:
+        return str(ipaddress.ip_address(BaseThrottle().get_ident(request)))
+    except ValueError:
+        return None
+
+
+def purge(before, chunk_size=5000, pause=0.0):
+    """
+    Delete events created before ``before``, oldest first, ``chunk_size`` rows
+    per DELETE (a created_at index range scan, then a primary-key delete).
+    Yields the running total after each chunk.
+    """
+    from .models.audit import AuthAuditEvent
+
+    expired = AuthAuditEvent.objects.filter(created_at__lt=before).order_by(
+        "created_at"
+    )
+    deleted = 0
+    while True:
+        # Materialised first: MySQL rejects LIMIT inside an IN subquery
+        pks = list(expired.values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            return
+        deleted += AuthAuditEvent.objects.filter(pk__in=pks).delete()[0]
+        yield deleted
+        if pause:
+            time.sleep(pause)
@@ -0,0 +1,18 @@
+from rest_framework_simplejwt import authentication
+
+from .activity import record_seen
+from .timing import phase
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    """Simple JWT authentication with Server-Timing phases and last-seen tracking."""
+
+    def get_validated_token(self, raw_token):
+        with phase("jwt"):
+            return super().get_validated_token(raw_token)
+
+    def get_user(self, validated_token):
+        with phase("auth_db"):
+            user = super().get_user(validated_token)
+        record_seen(user.pk)
+        return user
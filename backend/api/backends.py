@@ -0,0 +1,74 @@
+"""
+Authentication backend with effective permissions cached across requests.
+
+ModelBackend memoises a user's permission sets on the user object, so every
+request (every admin page load for staff) queries user_permissions and the
+group permissions again. CachedModelBackend stores both sets per user in the
+shared cache instead.
+
+Entries are invalidated by the receivers in api.signals: membership and
+direct-permission changes (m2m_changed on groups and user_permissions) and
+user saves drop the affected users' entries; changes that can affect many
+users at once (a group's permissions, deleted groups, created or deleted
+permissions) bump a generation that is part of every key. As with the
+ETag cache, multi-worker deployments need a shared CACHE_URL.
+"""
+
+import time
+
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+PERMISSIONS_CACHE_KEY = "auth:perms:{generation}:{user_id}"
+PERMISSIONS_GENERATION_CACHE_KEY = "auth:perms-generation"
+PERMISSIONS_CACHE_TIMEOUT = 3600
+
+
+def permissions_generation():
+    """Return the current permissions generation (seeded from the clock)."""
+    generation = cache.get(PERMISSIONS_GENERATION_CACHE_KEY)
+    if generation is None:
+        cache.add(PERMISSIONS_GENERATION_CACHE_KEY, time.time_ns(), None)
+        generation = cache.get(PERMISSIONS_GENERATION_CACHE_KEY)
+    return generation
+
+
+def bump_permissions_generation():
+    """Invalidate every user's cached permissions."""
+    try:
+        cache.incr(PERMISSIONS_GENERATION_CACHE_KEY)
+    except ValueError:
+        cache.set(PERMISSIONS_GENERATION_CACHE_KEY, time.time_ns(), None)
+
+
+def invalidate_permissions(*user_ids):
+    """Drop the cached permissions of the given users."""
+    generation = permissions_generation()
+    cache.delete_many(
+        [
+            PERMISSIONS_CACHE_KEY.format(generation=generation, user_id=user_id)
+            for user_id in user_ids
+        ]
+    )
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend whose permission sets come from the shared cache."""
+
+    def _get_permissions(self, user_obj, obj, from_name):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        perm_cache_name = f"_{from_name}_perm_cache"
+        if not hasattr(user_obj, perm_cache_name):
+            key = PERMISSIONS_CACHE_KEY.format(
+                generation=permissions_generation(), user_id=user_obj.pk
+            )
+            cached = cache.get(key)
+            if cached is None:
+                cached = (
+                    super()._get_permissions(user_obj, obj, "user"),
+                    super()._get_permissions(user_obj, obj, "group"),
+                )
+                cache.set(key, cached, PERMISSIONS_CACHE_TIMEOUT)
+            user_obj._user_perm_cache, user_obj._group_perm_cache = cached
+        return getattr(user_obj, perm_cache_name)
@@ -0,0 +1,115 @@
+"""
+HTTP conditional request helpers (ETag / If-Match / If-None-Match).
+
+Profile ETags are derived from ``CustomUser.version``, which is bumped on
+every profile write, so they change exactly when the representation does.
+The current profile ETag is mirrored into the cache so a matching
+``If-None-Match`` can be answered without loading the user row.
+
+Search ETags are derived from a global search generation stored in the
+cache. Any user write bumps the generation, so every cached search result
+is invalidated at once.
+
+Cache entries are invalidated from the worker that performs the write, so
+deployments running several workers need a shared ``CACHE_URL``.
+"""
+
+import hashlib
+import time
+
+from django.core.cache import cache
+
+PROFILE_ETAG_CACHE_KEY = "auth:profile-etag:{user_id}"
+PROFILE_ETAG_CACHE_TIMEOUT = 300
+SEARCH_GENERATION_CACHE_KEY = "auth:search-generation"
+
+
+def user_etag(user):
+    """Return the strong ETag for a user's profile representation."""
+    return f'"u{user.pk}-v{user.version}"'
+
+
+def search_etag(query):
+    """Return the ETag for a search query at the current search generation."""
+    digest = hashlib.md5(query.encode(), usedforsecurity=False).hexdigest()[:16]
+    return f'"s{search_generation()}-{digest}"'
+
+
+def parse_etags(header):
+    """
+    Split an If-Match / If-None-Match header into a list of entity tags.
+
+    Returns ["*"] for the wildcard and an empty list for a missing header.
+    """
+    if not header:
+        return []
+    header = header.strip()
+    if header == "*":
+        return ["*"]
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def if_match_satisfied(header, etag):
+    """
+    Evaluate an If-Match header against the current ETag.
+
+    A missing header is always satisfied. The W/ prefix is ignored: our ETags
+    are version-exact and are only weakened by the compression middleware.
+    """
+    tags = parse_etags(header)
+    if not tags or tags == ["*"]:
+        return True
+    return etag in {tag.removeprefix("W/") for tag in tags}
+
+
+def if_none_match_matches(header, etag):
+    """
+    Evaluate an If-None-Match header against the current ETag (weak comparison).
+
+    Returns True when the client's copy is current and 304 should be sent.
+    """
+    tags = parse_etags(header)
+    if tags == ["*"]:
+        return True
+    return etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in tags}
+
+
+def get_cached_profile_etag(user_id):
+    """Return the cached profile ETag for a user id, or None on a miss."""
+    return cache.get(PROFILE_ETAG_CACHE_KEY.format(user_id=user_id))
+
+
+def cache_profile_etag(user):
+    """Store the user's current profile ETag in the cache."""
+    cache.set(
+        PROFILE_ETAG_CACHE_KEY.format(user_id=user.pk),
+        user_etag(user),
+        PROFILE_ETAG_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_profile_etag(user_id):
+    """Drop the cached profile ETag for a user id."""
+    cache.delete(PROFILE_ETAG_CACHE_KEY.format(user_id=user_id))
+
+
+def search_generation():
+    """
+    Return the current search generation.
+
+    A missing generation (cold or evicted cache) is seeded from the clock so
+    it can never repeat a value that clients may still hold ETags for.
+    """
+    generation = cache.get(SEARCH_GENERATION_CACHE_KEY)
+    if generation is None:
+        cache.add(SEARCH_GENERATION_CACHE_KEY, time.time_ns(), None)
+        generation = cache.get(SEARCH_GENERATION_CACHE_KEY)
+    return generation
+
+
+def bump_search_generation():
+    """Invalidate every outstanding search ETag."""
+    try:
+        cache.incr(SEARCH_GENERATION_CACHE_KEY)
+    except ValueError:
+        cache.set(SEARCH_GENERATION_CACHE_KEY, time.time_ns(), None)
@@ -0,0 +1,78 @@
+"""
+Readiness check behind /api/health/ready.
+
+The database ping runs on a single dedicated thread (with its own, reused
+connection) and the caller waits at most HEALTH_READY_TIMEOUT seconds for
+it, so a hung database makes the probe fail fast instead of tying up a
+worker. While a slow ping is still outstanding no second one is started.
+
+The result is kept for HEALTH_READY_CACHE_SECONDS per process: probes from
+several proxies every second cost at most one ping per interval.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.db import connection
+
+
+def _ping():
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    except Exception:
+        # Drop the broken connection so the next ping reconnects
+        connection.close()
+        raise
+
+
+class Readiness:
+    """Cached, time-bounded database ping."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget the cached result and the ping thread (after fork, or in tests)."""
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = None
+        self._checked_at = None
+        self._result = None
+
+    def check(self):
+        """Return (ready, reason); reason is "" when ready."""
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._checked_at is not None
+                and now - self._checked_at < settings.HEALTH_READY_CACHE_SECONDS
+            ):
+                return self._result
+            self._result = self._ping()
+            self._checked_at = time.monotonic()
+            return self._result
+
+    def _ping(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="health-ping"
+            )
+        if self._pending is None or self._pending.done():
+            self._pending = self._executor.submit(_ping)
+        try:
+            self._pending.result(timeout=settings.HEALTH_READY_TIMEOUT)
+        except FutureTimeout:
+            return False, "database timeout"
+        except Exception as exc:
+            return False, f"database error: {exc.__class__.__name__}"
+        return True, ""
+
+
+READINESS = Readiness()
+os.register_at_fork(after_in_child=READINESS.reset)
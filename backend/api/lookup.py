@@ -0,0 +1,60 @@
+"""
+Bulk user lookup behind GET /api/auth/users/.
+
+Each user's public representation (UserSerializer's fields) is cached per
+user id. A lookup reads every requested id with one cache round trip and
+loads only the misses, with a single in_bulk() query restricted to those
+columns. Cached entries are dropped whenever the user row changes (see
+api.signals and the profile update view).
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from .serializers import UserSerializer
+
+USER_CACHE_KEY = "auth:user:{user_id}"
+USER_CACHE_TIMEOUT = 300
+LOOKUP_FIELDS = tuple(UserSerializer.Meta.fields)
+LOOKUP_LIMIT = 100
+# Largest value a (big)int primary key can hold
+MAX_USER_ID = 2**63 - 1
+
+User = get_user_model()
+
+
+def invalidate_cached_user(user_id):
+    """Drop the cached representation of a user."""
+    cache.delete(USER_CACHE_KEY.format(user_id=user_id))
+
+
+def lookup_users(ids, fields=LOOKUP_FIELDS):
+    """
+    Return the users with the given ids, in the order of ``ids``, as dicts
+    holding ``fields``. Unknown ids are left out; duplicates are returned
+    once.
+    """
+    ids = list(dict.fromkeys(ids))
+    keys = {user_id: USER_CACHE_KEY.format(user_id=user_id) for user_id in ids}
+    cached = cache.get_many(keys.values())
+    found = {user_id: cached[key] for user_id, key in keys.items() if key in cached}
+
+    missing = [user_id for user_id in ids if user_id not in found]
+    if missing:
+        loaded = {
+            user_id: {field: getattr(user, field) for field in LOOKUP_FIELDS}
+            for user_id, user in User.objects.only(*LOOKUP_FIELDS)
+            .in_bulk(missing)
+            .items()
+        }
+        cache.set_many(
+            {keys[user_id]: data for user_id, data in loaded.items()},
+            USER_CACHE_TIMEOUT,
+        )
+        found.update(loaded)
+
+    return [
+        {field: found[user_id][field] for field in fields}
+        for user_id in ids
+        if user_id in found
+    ]
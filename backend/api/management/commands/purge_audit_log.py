@@ -0,0 +1,49 @@
+"""
+Delete auth audit events past the retention window, in chunks.
+
+Each chunk is its own short DELETE, so purging a large backlog never holds
+long locks on the audit table. Run it from cron, e.g. daily:
+    python manage.py purge_audit_log
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.audit import purge
+
+
+class Command(BaseCommand):
+    help = "Delete auth audit events older than the retention window"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.AUDIT_RETENTION_DAYS,
+            help="Keep this many days of events (default: AUDIT_RETENTION_DAYS).",
+        )
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between chunks to spare replicas.",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 0 or options["chunk_size"] < 1:
+            raise CommandError("--days must be >= 0 and --chunk-size >= 1")
+
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        deleted = 0
+        for deleted in purge(cutoff, options["chunk_size"], options["pause"]):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"  deleted {deleted:,} events")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Purged {deleted:,} audit events older than {cutoff:%Y-%m-%d %H:%M}"
+            )
+        )
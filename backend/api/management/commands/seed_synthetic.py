@@ -0,0 +1,239 @@
+"""
+Generate large volumes of synthetic users for benchmarking.
+
+Rows are built deterministically from --seed and the row index, so the same
+arguments always produce the same users regardless of --workers or
+--batch-size, and re-running is idempotent (existing emails are skipped).
+Every row shares one precomputed password hash.
+
+Example:
+    python manage.py seed_synthetic --count 5000000 --workers 8
+"""
+
+import multiprocessing
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from api.conditional import bump_search_generation
+from api.models.user import CustomUser
+
+FIRST_NAMES = (
+    "james mary john patricia robert jennifer michael linda william elizabeth "
+    "david barbara richard susan joseph jessica thomas sarah charles karen "
+    "maria wei ana li jose fatima mohammed nguyen olga hiroshi priya ahmed "
+    "emma noah olivia liam sofia lucas mia ethan chloe leo"
+).split()
+LAST_NAMES = (
+    "smith johnson williams brown jones garcia miller davis rodriguez martinez "
+    "hernandez lopez gonzalez wilson anderson thomas taylor moore jackson martin "
+    "lee perez thompson white harris sanchez clark ramirez lewis robinson "
+    "kim chen wang singh kumar muller silva rossi novak ivanov"
+).split()
+# Free-mail providers dominate; the rest is a long tail of company domains.
+FREEMAIL_DOMAINS = (
+    ("gmail.com", 35),
+    ("yahoo.com", 10),
+    ("outlook.com", 8),
+    ("hotmail.com", 7),
+    ("icloud.com", 5),
+    ("proton.me", 2),
+)
+COMPANY_DOMAINS = 500
+COMPANY_SHARE = 33
+
+# Zipf-like weights so a few names account for most addresses. Weights are
+# kept cumulative so random.choices doesn't re-sum them for every row.
+FIRST_WEIGHTS = list(accumulate(1 / rank for rank in range(1, len(FIRST_NAMES) + 1)))
+LAST_WEIGHTS = list(accumulate(1 / rank for rank in range(1, len(LAST_NAMES) + 1)))
+DOMAINS = [name for name, _ in FREEMAIL_DOMAINS] + [
+    f"corp{n:03d}.example.com" for n in range(COMPANY_DOMAINS)
+]
+DOMAIN_WEIGHTS = list(
+    accumulate(
+        [weight for _, weight in FREEMAIL_DOMAINS]
+        + [
+            COMPANY_SHARE / rank / sum(1 / r for r in range(1, COMPANY_DOMAINS + 1))
+            for rank in range(1, COMPANY_DOMAINS + 1)
+        ]
+    )
+)
+
+
+def local_part(rng, index):
+    first = rng.choices(FIRST_NAMES, cum_weights=FIRST_WEIGHTS)[0]
+    last = rng.choices(LAST_NAMES, cum_weights=LAST_WEIGHTS)[0]
+    pattern = rng.randrange(5)
+    if pattern == 0:
+        name = f"{first}.{last}"
+    elif pattern == 1:
+        name = f"{first}{last}"
+    elif pattern == 2:
+        name = f"{first[0]}{last}"
+    elif pattern == 3:
+        name = f"{first}_{last}"
+    else:
+        name = first
+    # The index keeps addresses unique while preserving shared prefixes.
+    return f"{name}{index}"
+
+
+def domain(rng):
+    return rng.choices(DOMAINS, cum_weights=DOMAIN_WEIGHTS)[0]
+
+
+def build_users(options, start, stop):
+    """Build the (unsaved) users for rows ``start`` to ``stop``."""
+    rng = random.Random()
+    until = options["joined_until"]
+    span = options["days"] * 86400
+    count = options["count"]
+    users = []
+    for index in range(start, stop):
+        # Seeding per row keeps output independent of batching and workers.
+        rng.seed(options["seed"] * 10**12 + index)
+        # Join dates grow with the index, like an auto-increment key would.
+        offset = span * (count - index) / count + rng.uniform(0, 3600)
+        date_joined = until - timedelta(seconds=offset)
+        last_login = None
+        if rng.random() < options["login_ratio"]:
+            last_login = date_joined + (until - date_joined) * rng.random()
+        users.append(
+            CustomUser(
+                email=f"{local_part(rng, index)}@{domain(rng)}",
+                password=options["password_hash"],
+                is_active=rng.random() < options["active_ratio"],
+                is_staff=rng.random() < options["staff_ratio"],
+                date_joined=date_joined,
+                last_login=last_login,
+            )
+        )
+    return users
+
+
+def insert_batch(task):
+    options, start, stop = task
+    users = build_users(options, start, stop)
+    CustomUser.objects.bulk_create(users, ignore_conflicts=True)
+    return len(users)
+
+
+class Command(BaseCommand):
+    help = "[DEV] Generate synthetic users for benchmarking"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=1_000_000)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help="Inserting processes (forced to 1 on SQLite).",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--start", type=int, default=0, help="First row index.")
+        parser.add_argument("--active-ratio", type=float, default=0.92)
+        parser.add_argument("--staff-ratio", type=float, default=0.01)
+        parser.add_argument(
+            "--login-ratio",
+            type=float,
+            default=0.7,
+            help="Share of users with a last_login.",
+        )
+        parser.add_argument(
+            "--days", type=int, default=3 * 365, help="Spread of date_joined."
+        )
+        parser.add_argument(
+            "--joined-until",
+            default=None,
+            help="Newest date_joined (ISO date, default today UTC).",
+        )
+        parser.add_argument("--password", default="Synthetic123")
+
+    def handle(self, *args, **options):
+        for ratio in ("active_ratio", "staff_ratio", "login_ratio"):
+            if not 0 <= options[ratio] <= 1:
+                raise CommandError(f"--{ratio.replace('_', '-')} must be in [0, 1]")
+        if options["count"] < 0 or options["batch_size"] < 1:
+            raise CommandError("--count must be >= 0 and --batch-size >= 1")
+
+        workers = max(1, options["workers"])
+        if connection.vendor == "sqlite" and workers > 1:
+            self.stdout.write(
+                self.style.WARNING("  SQLite has one writer; using 1 worker")
+            )
+            workers = 1
+
+        if options["joined_until"] is None:
+            until = datetime.now(timezone.utc).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
+        else:
+            try:
+                until = datetime.fromisoformat(options["joined_until"])
+            except ValueError:
+                raise CommandError("--joined-until must be an ISO date")
+            if until.tzinfo is None:
+                until = until.replace(tzinfo=timezone.utc)
+
+        task_options = {
+            "seed": options["seed"],
+            "count": options["start"] + options["count"],
+            "active_ratio": options["active_ratio"],
+            "staff_ratio": options["staff_ratio"],
+            "login_ratio": options["login_ratio"],
+            "days": options["days"],
+            "joined_until": until,
+            "password_hash": make_password(
+                options["password"], salt=f"synthetic{options['seed']}"
+            ),
+        }
+        first, last = options["start"], options["start"] + options["count"]
+        tasks = [
+            (task_options, start, min(start + options["batch_size"], last))
+            for start in range(first, last, options["batch_size"])
+        ]
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"🌱 Generating {options['count']:,} users with {workers} worker(s)..."
+            )
+        )
+        started = time.perf_counter()
+        done = 0
+        if workers == 1:
+            results = map(insert_batch, tasks)
+            pool = None
+        else:
+            # Forked children must not share the parent's DB socket.
+            connections.close_all()
+            pool = multiprocessing.get_context("fork").Pool(workers)
+            results = pool.imap_unordered(insert_batch, tasks)
+        try:
+            for rows in results:
+                done += rows
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"  {done:>12,} / {options['count']:,} "
+                    f"({done / options['count']:.0%}) "
+                    f"{done / elapsed:>10,.0f} rows/s"
+                )
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        # bulk_create bypasses post_save, so cached searches must be dropped here.
+        bump_search_generation()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Generated {done:,} users in {elapsed:.1f}s "
+                f"({done / elapsed if elapsed else 0:,.0f} rows/s)"
+            )
+        )
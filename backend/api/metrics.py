@@ -0,0 +1,363 @@
+"""
+In-process metrics registry with Prometheus text exposition.
+
+Counters and fixed-bucket histograms are declared at import time:
+
+    requests = Counter("api_requests_total", "Requests.", ["action", "status"])
+    requests.inc(("login", "200"))
+
+Values live in a per-process store. With METRICS_DIR unset the store is a
+plain list (single-process servers, tests). With METRICS_DIR set every worker
+process writes to its own mmap'd file in that directory and the exposition
+sums all files, so pre-fork servers report totals across workers. The
+directory must be emptied when the server (re)starts; the production
+image's entrypoint does this before starting gunicorn.
+
+Each label combination resolves to fixed store slots the first time it is
+seen, so an observation is a dict lookup plus a few in-place float updates.
+"""
+
+import bisect
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_double = struct.Struct("d")
+_header = struct.Struct("i")
+
+
+class _MemoryStore:
+    """Slot values held in a Python list."""
+
+    def __init__(self):
+        self.keys = {}
+        self.values = []
+
+    def slot(self, key):
+        self.keys[key] = len(self.values)
+        self.values.append(0.0)
+        return self.keys[key]
+
+    def inc(self, slot, amount):
+        self.values[slot] += amount
+
+    def items(self):
+        return [(key, self.values[slot]) for key, slot in self.keys.items()]
+
+
+class _MmapStore:
+    """
+    Slot values held in a per-process mmap'd file.
+
+    Layout: a 4-byte header holding the number of bytes used (padded to 8),
+    then entries of ``[4-byte key length][utf-8 key, padded][float64 value]``
+    with each value 8-byte aligned.
+    """
+
+    INITIAL_SIZE = 64 * 1024
+
+    def __init__(self, path):
+        self.path = path
+        self.keys = {}
+        self._file = open(path, "w+b")
+        self._size = self.INITIAL_SIZE
+        self._file.truncate(self._size)
+        self._mm = mmap.mmap(self._file.fileno(), self._size)
+        self._used = 8
+        _header.pack_into(self._mm, 0, self._used)
+
+    def slot(self, key):
+        encoded = key.encode()
+        padded = len(encoded) + (8 - (4 + len(encoded)) % 8) % 8
+        entry_size = 4 + padded + 8
+        if self._used + entry_size > self._size:
+            self._grow(self._used + entry_size)
+
+        offset = self._used
+        struct.pack_into(f"i{padded}sd", self._mm, offset, len(encoded), encoded, 0.0)
+        self._used += entry_size
+        # Publish the entry only after it is fully written
+        _header.pack_into(self._mm, 0, self._used)
+        self.keys[key] = offset + 4 + padded
+        return self.keys[key]
+
+    def inc(self, slot, amount):
+        mm = self._mm
+        _double.pack_into(mm, slot, _double.unpack_from(mm, slot)[0] + amount)
+
+    def items(self):
+        return [
+            (key, _double.unpack_from(self._mm, slot)[0])
+            for key, slot in self.keys.items()
+        ]
+
+    def _grow(self, needed):
+        while self._size < needed:
+            self._size *= 2
+        self._mm.close()
+        self._file.truncate(self._size)
+        self._mm = mmap.mmap(self._file.fileno(), self._size)
+
+    @staticmethod
+    def read(path):
+        """Read every (key, value) entry from a store file."""
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < 8:
+            return []
+        used = _header.unpack_from(data, 0)[0]
+        entries, pos = [], 8
+        while pos < used:
+            length = _header.unpack_from(data, pos)[0]
+            padded = length + (8 - (4 + length) % 8) % 8
+            key_start, key_end = pos + 4, pos + 4 + length
+            key = data[key_start:key_end].decode()
+            value = _double.unpack_from(data, pos + 4 + padded)[0]
+            entries.append((key, value))
+            pos += 4 + padded + 8
+        return entries
+
+
+class Registry:
+    """Holds metric families and the current process's value store."""
+
+    def __init__(self):
+        self.metrics = []
+        self._store = None
+
+    @property
+    def store(self):
+        if self._store is None:
+            metrics_dir = settings.METRICS_DIR
+            if metrics_dir:
+                Path(metrics_dir).mkdir(parents=True, exist_ok=True)
+                path = Path(metrics_dir) / f"metrics_{os.getpid()}.db"
+                self._store = _MmapStore(path)
+            else:
+                self._store = _MemoryStore()
+        return self._store
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def reset(self):
+        """Drop the store and every resolved slot (after fork, or in tests)."""
+        self._store = None
+        for metric in self.metrics:
+            metric.slots.clear()
+
+    def collect(self):
+        """Return summed (key, value) pairs across all worker processes."""
+        totals = {}
+        if settings.METRICS_DIR:
+            self.store  # ensure this process's file exists
+            for path in sorted(Path(settings.METRICS_DIR).glob("metrics_*.db")):
+                for key, value in _MmapStore.read(path):
+                    totals[key] = totals.get(key, 0.0) + value
+        else:
+            for key, value in self.store.items():
+                totals[key] = value
+        return totals
+
+    def exposition(self):
+        """Render every metric in Prometheus text format (version 0.0.4)."""
+        totals = self.collect()
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render(totals))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+os.register_at_fork(after_in_child=REGISTRY.reset)
+
+
+def _key(sample, labels):
+    return json.dumps([sample, labels], separators=(",", ":"))
+
+
+def _format_value(value):
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\""))
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry
+        self.slots = {}
+        registry.register(self)
+
+    def _labels(self, labelvalues):
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return [[name, str(value)] for name, value in zip(self.labelnames, labelvalues)]
+
+    def _header(self):
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label combination."""
+
+    type = "counter"
+
+    def inc(self, labelvalues=(), amount=1.0):
+        slot = self.slots.get(labelvalues)
+        with _lock:
+            if slot is None:
+                slot = self.slots[labelvalues] = self.registry.store.slot(
+                    _key(self.name, self._labels(labelvalues))
+                )
+            self.registry.store.inc(slot, amount)
+
+    def render(self, totals):
+        lines = self._header()
+        for key, value in totals.items():
+            sample, labels = json.loads(key)
+            if sample == self.name:
+                lines.append(f"{sample}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Fixed-bucket distribution per label combination."""
+
+    type = "histogram"
+
+    def __init__(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, **kwargs
+    ):
+        self.upper_bounds = tuple(sorted(buckets)) + (math.inf,)
+        super().__init__(name, documentation, labelnames, **kwargs)
+
+    def observe(self, labelvalues, value):
+        slots = self.slots.get(labelvalues)
+        index = bisect.bisect_left(self.upper_bounds, value)
+        with _lock:
+            if slots is None:
+                slots = self.slots[labelvalues] = self._create_slots(labelvalues)
+            inc = self.registry.store.inc
+            inc(slots[index], 1.0)
+            inc(slots[-2], value)
+            inc(slots[-1], 1.0)
+
+    def _create_slots(self, labelvalues):
+        labels = self._labels(labelvalues)
+        store = self.registry.store
+        buckets = [
+            store.slot(
+                _key(f"{self.name}_bucket", labels + [["le", _format_value(bound)]])
+            )
+            for bound in self.upper_bounds
+        ]
+        return (
+            *buckets,
+            store.slot(_key(f"{self.name}_sum", labels)),
+            store.slot(_key(f"{self.name}_count", labels)),
+        )
+
+    def render(self, totals):
+        # Buckets are stored per-bucket; the exposition format is cumulative
+        series = {}
+        for key, value in totals.items():
+            sample, labels = json.loads(key)
+            if not sample.startswith(self.name + "_"):
+                continue
+            suffix = sample.removeprefix(self.name + "_")
+            le = labels.pop()[1] if suffix == "bucket" else None
+            values = series.setdefault(json.dumps(labels), {"buckets": {}})
+            if le is not None:
+                values["buckets"][le] = value
+            elif suffix in ("sum", "count"):
+                values[suffix] = value
+
+        lines = self._header()
+        for labels_key, values in series.items():
+            labels = json.loads(labels_key)
+            cumulative = 0.0
+            for bound in self.upper_bounds:
+                le = _format_value(bound)
+                cumulative += values["buckets"].get(le, 0.0)
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(labels + [['le', le]])} "
+                    f"{_format_value(cumulative)}"
+                )
+            for suffix in ("sum", "count"):
+                lines.append(
+                    f"{self.name}_{suffix}{_format_labels(labels)} "
+                    f"{_format_value(values.get(suffix, 0.0))}"
+                )
+        return lines
+
+
+# ============================================================================
+# API metrics
+# ============================================================================
+
+REQUESTS = Counter(
+    "api_requests_total",
+    "API requests by viewset action and response status.",
+    ["action", "status"],
+)
+REQUEST_DURATION = Histogram(
+    "api_request_duration_seconds",
+    "API request latency by viewset action (excluding rendering).",
+    ["action"],
+)
+
+
+def observe_request(action, status_code, duration):
+    """Record one finished API request."""
+    REQUESTS.inc((action, status_code))
+    REQUEST_DURATION.observe((action,), duration)
+
+
+AUDIT_EVENTS = Counter(
+    "api_audit_events_total",
+    "Auth audit events by type and outcome (queued, dropped, written, failed).",
+    ["event", "outcome"],
+)
+
+
+RATE_LIMIT_DECISIONS = Counter(
+    "api_rate_limit_decisions_total",
+    "Rate limit checks by throttle scope and decision (allowed, limited).",
+    ["scope", "decision"],
+)
+
+
+COALESCED_CALLS = Counter(
+    "api_coalesced_calls_total",
+    "Singleflight calls by group and role (leader ran the call; follower and "
+    "shared received another caller's result in this or another worker).",
+    ["group", "role"],
+)
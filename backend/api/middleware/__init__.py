@@ -0,0 +1,10 @@
+from .compression import CompressionMiddleware, mark_uncompressible
+from .health import HealthCheckMiddleware
+from .timing import ServerTimingMiddleware
+
+__all__ = [
+    "CompressionMiddleware",
+    "HealthCheckMiddleware",
+    "ServerTimingMiddleware",
+    "mark_uncompressible",
+]
@@ -0,0 +1,155 @@
+"""
+Response compression middleware (brotli when installed, gzip otherwise).
+
+Compresses responses whose content type is in COMPRESSION_CONTENT_TYPES and
+whose body is at least COMPRESSION_MIN_SIZE bytes. Streaming responses are
+compressed incrementally and flushed every COMPRESSION_STREAM_FLUSH_SIZE
+input bytes.
+
+BREACH: a compressed body that reflects user input next to a secret leaks the
+secret through its length. Views returning secrets (e.g. the token pair from
+login) opt out with ``mark_uncompressible(response)``, and text/html is not in
+the default allowlist so CSRF-token-bearing admin pages are never compressed.
+"""
+
+import gzip
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+UNCOMPRESSIBLE_ATTR = "uncompressible"
+
+_accept_encoding_re = re.compile(r"\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?")
+
+
+def mark_uncompressible(response):
+    """Exclude a response from compression (it carries secrets)."""
+    setattr(response, UNCOMPRESSIBLE_ATTR, True)
+    return response
+
+
+def accepted_encodings(header, codings):
+    """
+    Return the members of ``codings`` a client accepts (q > 0), as a set.
+
+    A coding listed explicitly takes its own quality, so ``br;q=0, *``
+    refuses br even though the wildcard accepts everything else.
+    """
+    qualities = {}
+    for match in _accept_encoding_re.finditer(header or ""):
+        coding, quality = match.group(1).lower(), match.group(2)
+        try:
+            qualities[coding] = 1.0 if quality is None else float(quality)
+        except ValueError:
+            continue
+    wildcard = qualities.get("*", 0)
+    return {coding for coding in codings if qualities.get(coding, wildcard) > 0}
+
+
+def choose_encoding(header):
+    """Pick the best supported encoding for an Accept-Encoding header."""
+    supported = ("br", "gzip") if brotli is not None else ("gzip",)
+    accepted = accepted_encodings(header, supported)
+    for coding in supported:
+        if coding in accepted:
+            return coding
+    return None
+
+
+def compress(data, encoding):
+    """Compress a complete body."""
+    if encoding == "br":
+        return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def compress_stream(chunks, encoding):
+    """
+    Compress an iterable of byte chunks incrementally.
+
+    The compressor is flushed whenever COMPRESSION_STREAM_FLUSH_SIZE input
+    bytes have accumulated, so the client keeps receiving data without a
+    flush marker being paid for every small chunk.
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        process, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        # wbits=31 selects the gzip container
+        compressor = zlib.compressobj(
+            settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31
+        )
+        process, finish = compressor.compress, compressor.flush
+
+        def flush():
+            return compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    flush_size = settings.COMPRESSION_STREAM_FLUSH_SIZE
+    pending = 0
+    for chunk in chunks:
+        data = process(chunk)
+        pending += len(chunk)
+        if pending >= flush_size:
+            data += flush()
+            pending = 0
+        if data:
+            yield data
+    yield finish()
+
+
+class CompressionMiddleware:
+    """Compress eligible responses according to the client's Accept-Encoding."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self._is_compressible(response):
+            return response
+
+        # The representation varies by Accept-Encoding whether or not this
+        # particular client gets a compressed body
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING"))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding
+            )
+            del response.headers["Content-Length"]
+        else:
+            if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+                return response
+            compressed = compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # A strong ETag names the uncompressed bytes; weaken it
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def _is_compressible(self, response):
+        if getattr(response, UNCOMPRESSIBLE_ATTR, False):
+            return False
+        if response.status_code < 200 or response.status_code in (204, 304):
+            return False
+        if response.has_header("Content-Encoding"):
+            return False
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        return content_type in settings.COMPRESSION_CONTENT_TYPES
@@ -0,0 +1,28 @@
+"""
+Health probe middleware.
+
+Answers /api/health/live and /api/health/ready before the rest of the
+middleware stack (timing, compression, CORS, sessions, CSRF, auth) and before
+URL resolution and host validation, so ingress probes stay cheap and work
+with whatever Host header the proxy sends. Keep it first in MIDDLEWARE.
+"""
+
+from ..views.health import live, ready
+
+PROBES = {
+    "/api/health/live": live,
+    "/api/health/live/": live,
+    "/api/health/ready": ready,
+    "/api/health/ready/": ready,
+}
+
+
+class HealthCheckMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        probe = PROBES.get(request.path_info)
+        if probe is not None:
+            return probe(request)
+        return self.get_response(request)
@@ -0,0 +1,48 @@
+"""
+Server-Timing middleware.
+
+When SERVER_TIMING is enabled, phases recorded through api.timing.phase() are
+logged on the "api.timing" logger as structured fields and, when
+SERVER_TIMING_HEADER is also enabled, exposed as a Server-Timing header.
+"""
+
+import logging
+from time import perf_counter
+
+from django.conf import settings
+
+from ..timing import collect
+
+logger = logging.getLogger("api.timing")
+
+
+class ServerTimingMiddleware:
+    """Collect per-phase timings for each request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.SERVER_TIMING:
+            return self.get_response(request)
+
+        start = perf_counter()
+        with collect() as timing:
+            response = self.get_response(request)
+        timing.durations["total"] = perf_counter() - start
+
+        if settings.SERVER_TIMING_HEADER:
+            response.headers["Server-Timing"] = timing.as_header()
+        logger.info(
+            "%s %s %s",
+            request.method,
+            request.path,
+            response.status_code,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                **timing.as_log_fields(),
+            },
+        )
+        return response
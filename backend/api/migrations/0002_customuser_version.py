@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-19 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2 on 2026-10-19 11:05
+
+from django.db import migrations
+
+import api.models.user
+from api.online_migrations import AddFieldOnline
+
+
+class Migration(migrations.Migration):
+
+    # Online index builds cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("api", "0002_customuser_version"),
+    ]
+
+    operations = [
+        # Indexed but not yet unique: 0004 backfills it and 0005 adds the
+        # unique constraint once collisions have been set aside.
+        AddFieldOnline(
+            model_name="customuser",
+            name="email_canonical",
+            field=api.models.user.CanonicalEmailField(
+                db_index=True, editable=False, max_length=254, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,77 @@
+"""
+Backfill CustomUser.email_canonical in batches.
+
+Each batch is committed on its own (the migration is non-atomic), so a large
+table is never locked by one long transaction and an interrupted run resumes
+where it stopped. When several emails differ only by case, the oldest
+account (lowest pk) gets the canonical key; the others keep a NULL key, are
+reported in migrate's output and can still log in with their exact email
+until they are merged or renamed.
+"""
+
+from django.db import migrations, transaction
+
+from api.online_migrations import report
+
+BATCH_SIZE = 2000
+
+
+def backfill_email_canonical(apps, schema_editor):
+    User = apps.get_model("api", "CustomUser")
+    users = User.objects.using(schema_editor.connection.alias)
+    filled, collisions, last_pk = 0, [], 0
+    while True:
+        batch = list(
+            users.filter(pk__gt=last_pk, email_canonical__isnull=True)
+            .order_by("pk")
+            .only("pk", "email")[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+
+        by_key = {}
+        for user in batch:
+            by_key.setdefault(user.email.strip().lower(), []).append(user)
+        owners = dict(
+            users.filter(email_canonical__in=by_key).values_list(
+                "email_canonical", "pk"
+            )
+        )
+        updates = []
+        for key, group in by_key.items():
+            for user in group:
+                if key in owners:
+                    collisions.append((user.pk, user.email, owners[key]))
+                else:
+                    owners[key] = user.pk
+                    user.email_canonical = key
+                    updates.append(user)
+        with transaction.atomic(using=schema_editor.connection.alias):
+            users.bulk_update(updates, ["email_canonical"])
+        filled += len(updates)
+        report(f"\n    {filled} user(s) so far, up to pk {last_pk}", level=2)
+
+    if filled or collisions:
+        report(
+            f"\n  Backfilled email_canonical for {filled} user(s), "
+            f"{len(collisions)} collision(s)\n"
+        )
+    for pk, email, owner_pk in collisions:
+        report(
+            f"  collision: user {pk} <{email}> matches user {owner_pk} "
+            "case-insensitively; left without a canonical email\n"
+        )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("api", "0003_customuser_email_canonical"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_email_canonical, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2 on 2026-10-19 11:05
+
+from django.db import migrations
+
+import api.models.user
+from api.online_migrations import AlterFieldOnline
+
+
+class Migration(migrations.Migration):
+
+    # The unique index is built concurrently, then the plain one dropped
+    atomic = False
+
+    dependencies = [
+        ("api", "0004_backfill_email_canonical"),
+    ]
+
+    operations = [
+        AlterFieldOnline(
+            model_name="customuser",
+            name="email_canonical",
+            field=api.models.user.CanonicalEmailField(
+                editable=False, max_length=254, null=True, unique=True
+            ),
+        ),
+    ]
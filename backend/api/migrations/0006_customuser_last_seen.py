@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-19 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_customuser_email_canonical_unique"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="last_seen",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2 on 2026-10-19 11:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0006_customuser_last_seen"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuthAuditEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField()),
+                (
+                    "event",
+                    models.CharField(
+                        choices=[
+                            ("login_success", "Login Success"),
+                            ("login_failure", "Login Failure"),
+                            ("register", "Register"),
+                            ("email_change", "Email Change"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("user_id", models.PositiveBigIntegerField(blank=True, null=True)),
+                ("email", models.CharField(blank=True, max_length=254)),
+                ("ip", models.GenericIPAddressField(blank=True, null=True)),
+                ("detail", models.JSONField(blank=True, default=dict)),
+            ],
+            options={
+                "verbose_name": "Auth audit event",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="authauditevent",
+            index=models.Index(fields=["created_at"], name="auth_audit_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="authauditevent",
+            index=models.Index(
+                fields=["user_id", "created_at"], name="auth_audit_user_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+from api.online_migrations import AddIndexOnline
+
+
+class Migration(migrations.Migration):
+
+    # Online index builds cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("api", "0007_authauditevent"),
+    ]
+
+    operations = [
+        AddIndexOnline(
+            model_name="customuser",
+            index=models.Index(fields=["date_joined"], name="user_date_joined_idx"),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from .audit import AuthAuditEvent
 from .user import CustomUser
 
-__all__ = ["CustomUser"]
+__all__ = ["AuthAuditEvent", "CustomUser"]
@@ -0,0 +1,47 @@
+from django.db import models
+
+
+class AuthAuditEvent(models.Model):
+    """
+    Append-only record of an authentication event.
+
+    Rows are written in batches by api.audit and never updated. Every query
+    is a time range (optionally per user), served by the created_at and
+    (user_id, created_at) indexes; retention purges delete the oldest rows
+    in chunks. user_id is a plain column rather than a foreign key so events
+    outlive the user and inserts don't pay for constraint checks.
+
+    Available Fields:
+    - id (int): Primary key, auto-generated
+    - created_at (datetime): When the event happened (not when it was written)
+    - event (str): One of Event
+    - user_id (int): Subject user's id (nullable, e.g. failed logins)
+    - email (str): Email the event refers to (the attempted one for failures)
+    - ip (str): Client address (nullable)
+    - detail (dict): Event-specific data, e.g. old/new email
+    """
+
+    class Event(models.TextChoices):
+        LOGIN_SUCCESS = "login_success"
+        LOGIN_FAILURE = "login_failure"
+        REGISTER = "register"
+        EMAIL_CHANGE = "email_change"
+
+    created_at = models.DateTimeField()
+    event = models.CharField(max_length=32, choices=Event.choices)
+    user_id = models.PositiveBigIntegerField(null=True, blank=True)
+    email = models.CharField(max_length=254, blank=True)
+    ip = models.GenericIPAddressField(null=True, blank=True)
+    detail = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        verbose_name = "Auth audit event"
+        indexes = [
+            models.Index(fields=["created_at"], name="auth_audit_created_idx"),
+            models.Index(
+                fields=["user_id", "created_at"], name="auth_audit_user_created_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.created_at:%Y-%m-%d %H:%M:%S} {self.event} {self.email}"
@@ -1,5 +1,25 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.db.models import Q
+
+from ..timing import phase
+
+
+def canonical_email(email):
+    """Return the case-insensitive lookup key for an email address."""
+    return email.strip().lower()
+
+
+class CanonicalEmailField(models.CharField):
+    """
+    Holds ``canonical_email(instance.email)``, recomputed whenever the row is
+    saved (``bulk_create`` included, which skips ``Model.save``).
+    """
+
+    def pre_save(self, model_instance, add):
+        value = canonical_email(model_instance.email) if model_instance.email else None
+        setattr(model_instance, self.attname, value)
+        return value
 
 
 class CustomUserManager(BaseUserManager):
@@ -27,6 +47,30 @@ class CustomUserManager(BaseUserManager):
 
         return self.create_user(email, password, **extra_fields)
 
+    def filter_by_email(self, email):
+        """Users whose email matches ``email`` case-insensitively (index seek)."""
+        return self.filter(email_canonical=canonical_email(email))
+
+    def get_by_natural_key(self, username):
+        """
+        Look users up by canonical email so logins ignore case.
+
+        Rows left without a canonical email by the 0004 backfill (case
+        collisions) still match on their exact email, in the same query.
+        """
+        matches = Q(email_canonical=canonical_email(username)) | Q(
+            email=username, email_canonical__isnull=True
+        )
+        with phase("db"):
+            candidates = list(self.filter(matches)[:2])
+        # An exact match wins over a case-insensitive one
+        for user in candidates:
+            if user.email == username:
+                return user
+        if not candidates:
+            raise self.model.DoesNotExist
+        return candidates[0]
+
 
 class CustomUser(AbstractUser):
     """
@@ -35,17 +79,28 @@ class CustomUser(AbstractUser):
     Available Fields:
     - id (int): Primary key, auto-generated
     - email (str): Unique email address, used for authentication
+    - email_canonical (str): Lowercased email, the unique case-insensitive
+      lookup key for authentication (nullable only for unresolved
+      collisions reported by the backfill migration)
     - password (str): Hashed password
     - is_active (bool): Whether the user account is active (default: True)
     - is_staff (bool): Whether the user can access the admin interface (default: False)
     - is_superuser (bool): Whether the user has all permissions (default: False)
     - date_joined (datetime): Timestamp when the user account was created
     - last_login (datetime): Timestamp of the last successful login (nullable)
+    - last_seen (datetime): Timestamp of the last authenticated request
+      (nullable; both are written behind by api.activity)
+    - version (int): Row version, bumped on every profile write; backs ETags
     - groups (ManyToMany): Groups the user belongs to for permission management
     - user_permissions (ManyToMany): Specific permissions assigned to the user
     """
 
     email = models.EmailField(unique=True)
+    email_canonical = CanonicalEmailField(
+        max_length=254, unique=True, null=True, editable=False
+    )
+    version = models.PositiveIntegerField(default=1, editable=False)
+    last_seen = models.DateTimeField(null=True, blank=True, editable=False)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -60,6 +115,33 @@ class CustomUser(AbstractUser):
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
+        indexes = [
+            # Incremental exports and reports filter on date_joined
+            models.Index(fields=["date_joined"], name="user_date_joined_idx"),
+        ]
+
+    def set_password(self, raw_password):
+        with phase("hash"):
+            super().set_password(raw_password)
+
+    def check_password(self, raw_password):
+        with phase("hash"):
+            return super().check_password(raw_password)
+
+    def save(self, *args, **kwargs):
+        """
+        Bump the row version on every update so profile ETags change, and
+        keep email_canonical in step with email.
+        """
+        update_fields = kwargs.get("update_fields")
+        if not self._state.adding and (update_fields is None or update_fields):
+            self.version += 1
+            if update_fields is not None:
+                update_fields = {*update_fields, "version"}
+                if "email" in update_fields:
+                    update_fields.add("email_canonical")
+                kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.email
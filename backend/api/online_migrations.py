@@ -0,0 +1,489 @@
+"""
+Migration operations that do not lock large tables.
+
+A plain AddIndex holds a write lock on the table for the whole build, and a
+RunPython backfill in an atomic migration is one long transaction; on a
+multi-million-row user table either blocks logins for the duration of the
+deploy. Use these instead, in migrations with ``atomic = False``:
+
+``AddIndexOnline`` / ``RemoveIndexOnline``
+    Same migration state as AddIndex / RemoveIndex. The DDL runs as
+    ``CREATE INDEX CONCURRENTLY`` on PostgreSQL and with
+    ``ALGORITHM=INPLACE LOCK=NONE`` on MySQL (which fails rather than
+    silently falling back to a locking build). Re-running after an
+    interruption is safe: an index that already exists is kept, and an
+    invalid leftover of an interrupted concurrent build is dropped and
+    rebuilt.
+
+``AddFieldOnline`` / ``AlterFieldOnline``
+    Same migration state as AddField / AlterField. The column is added
+    without its indexes (a metadata-only change for a nullable column
+    without a default), then the indexes implied by ``db_index`` and
+    ``unique`` are built as above, under the names Django would give them,
+    plus PostgreSQL's ``_like`` pattern-ops index. A unique constraint is
+    built as a unique index first and attached with ``ADD CONSTRAINT ...
+    USING INDEX`` on PostgreSQL. AlterFieldOnline only handles changes to
+    ``db_index`` and ``unique``; new indexes are built before the old ones
+    are dropped.
+
+``BackfillField``
+    Sets a column on the rows that still need it, ``batch_size`` rows per
+    UPDATE, each batch committed on its own, sleeping ``pause`` seconds
+    between batches. Progress is the data itself (rows that no longer match
+    ``where``), so an interrupted run resumes where it stopped.
+
+Other backends (SQLite) run the regular DDL.
+
+Operations and data migrations report through ``report()``, which writes to
+the running migrate command's stdout at its verbosity (captured from the
+pre_migrate signal, see ApiConfig.ready()).
+"""
+
+import sys
+import time
+
+from django.db import NotSupportedError, migrations, models, router, transaction
+from django.db.migrations.operations.base import Operation
+from django.db.models import Q
+
+# Verbosity and stdout of the running migrate command; the defaults apply
+# when an operation runs outside one (e.g. called directly from a test)
+_MIGRATE_OUTPUT_DEFAULTS = {"verbosity": 1, "stdout": None}
+_migrate_output = dict(_MIGRATE_OUTPUT_DEFAULTS)
+
+
+def capture_migrate_output(verbosity=1, stdout=None, **kwargs):
+    """pre_migrate receiver: report() follows this migrate run's output."""
+    _migrate_output.update(verbosity=verbosity, stdout=stdout)
+
+
+def release_migrate_output(**kwargs):
+    """post_migrate receiver: back to the defaults once the run is over."""
+    _migrate_output.update(_MIGRATE_OUTPUT_DEFAULTS)
+
+
+def report(message, level=1):
+    """Write ``message`` to migrate's stdout if its verbosity is >= ``level``."""
+    if _migrate_output["verbosity"] < level:
+        return
+    stdout = _migrate_output["stdout"]
+    if stdout is None:
+        sys.stdout.write(message)
+    else:
+        # A command OutputWrapper; messages carry their own newlines
+        stdout.write(message, ending="")
+
+
+MYSQL_ONLINE_DDL = " ALGORITHM=INPLACE LOCK=NONE"
+ONLINE_VENDORS = {"postgresql", "mysql"}
+INDEX_ATTRIBUTES = ("db_index", "unique")
+
+
+def _require_non_atomic(operation, schema_editor):
+    if schema_editor.connection.in_atomic_block:
+        raise NotSupportedError(
+            f"{operation.__class__.__name__} cannot run inside a transaction; "
+            "set atomic = False on the migration."
+        )
+
+
+def _constraints(schema_editor, model):
+    if schema_editor.collect_sql:  # sqlmigrate: show the full DDL
+        return {}
+    with schema_editor.connection.cursor() as cursor:
+        return schema_editor.connection.introspection.get_constraints(
+            cursor, model._meta.db_table
+        )
+
+
+def _index_names(schema_editor, model):
+    return {
+        name
+        for name, info in _constraints(schema_editor, model).items()
+        if info["index"]
+    }
+
+
+def _drop_invalid_postgres_index(schema_editor, name):
+    """Drop an INVALID index left behind by an interrupted concurrent build."""
+    if schema_editor.collect_sql:
+        return False
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = %s AND NOT i.indisvalid",
+            [name],
+        )
+        invalid = cursor.fetchone() is not None
+    if invalid:
+        schema_editor.execute(
+            f"DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(name)}"
+        )
+    return invalid
+
+
+def add_index_online(schema_editor, model, index):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        _drop_invalid_postgres_index(schema_editor, index.name)
+    if index.name in _index_names(schema_editor, model):
+        return
+    if vendor == "postgresql":
+        schema_editor.execute(
+            index.create_sql(model, schema_editor, concurrently=True), params=None
+        )
+    elif vendor == "mysql":
+        sql = index.create_sql(model, schema_editor)
+        schema_editor.execute(str(sql) + MYSQL_ONLINE_DDL, params=None)
+    else:
+        schema_editor.add_index(model, index)
+
+
+def remove_index_online(schema_editor, model, index):
+    if not schema_editor.collect_sql and index.name not in _index_names(
+        schema_editor, model
+    ):
+        return
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(index.remove_sql(model, schema_editor, concurrently=True))
+    elif vendor == "mysql":
+        sql = index.remove_sql(model, schema_editor)
+        schema_editor.execute(str(sql) + MYSQL_ONLINE_DDL)
+    else:
+        schema_editor.remove_index(model, index)
+
+
+def add_unique_online(schema_editor, model, field, name):
+    table = schema_editor.quote_name(model._meta.db_table)
+    column = schema_editor.quote_name(field.column)
+    quoted = schema_editor.quote_name(name)
+    if schema_editor.connection.vendor == "postgresql":
+        _drop_invalid_postgres_index(schema_editor, name)
+        if name not in _constraints(schema_editor, model):
+            schema_editor.execute(
+                f"CREATE UNIQUE INDEX CONCURRENTLY {quoted} ON {table} ({column})"
+            )
+        # Still a bare index (not in pg_constraint): attach it as the
+        # constraint, a catalog-only change
+        info = _constraints(schema_editor, model).get(name)
+        if info is None or info["index"]:
+            schema_editor.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {quoted} UNIQUE USING INDEX {quoted}"
+            )
+    elif name not in _constraints(schema_editor, model):
+        schema_editor.execute(
+            f"CREATE UNIQUE INDEX {quoted} ON {table} ({column}){MYSQL_ONLINE_DDL}"
+        )
+
+
+def remove_unique_online(schema_editor, model, name):
+    if not schema_editor.collect_sql and name not in _constraints(schema_editor, model):
+        return
+    table = schema_editor.quote_name(model._meta.db_table)
+    quoted = schema_editor.quote_name(name)
+    if schema_editor.connection.vendor == "postgresql":
+        # Catalog-only; the backing index goes with the constraint
+        schema_editor.execute(f"ALTER TABLE {table} DROP CONSTRAINT {quoted}")
+    else:
+        schema_editor.execute(f"DROP INDEX {quoted} ON {table}{MYSQL_ONLINE_DDL}")
+
+
+def _like_opclass(schema_editor, field):
+    """The pattern-ops class of PostgreSQL's ``_like`` index, if any."""
+    db_type = field.db_type(schema_editor.connection) or ""
+    if field.db_parameters(schema_editor.connection).get("collation"):
+        return None
+    if db_type.startswith("varchar"):
+        return "varchar_pattern_ops"
+    if db_type.startswith("text"):
+        return "text_pattern_ops"
+    return None
+
+
+def _field_index_name(schema_editor, model, field, suffix):
+    return schema_editor._create_index_name(
+        model._meta.db_table, [field.column], suffix=suffix
+    )
+
+
+def _is_indexed(field):
+    return field.db_index or field.unique
+
+
+def add_field_indexes_online(schema_editor, model, field, old_field=None):
+    """Build the indexes ``field`` implies that ``old_field`` lacked."""
+    if field.unique and not (old_field and old_field.unique):
+        add_unique_online(
+            schema_editor,
+            model,
+            field,
+            _field_index_name(schema_editor, model, field, "_uniq"),
+        )
+    elif field.db_index and not field.unique and not (old_field and old_field.db_index):
+        add_index_online(
+            schema_editor,
+            model,
+            models.Index(
+                fields=[field.name],
+                name=_field_index_name(schema_editor, model, field, ""),
+            ),
+        )
+    if (
+        schema_editor.connection.vendor == "postgresql"
+        and _is_indexed(field)
+        and not (old_field and _is_indexed(old_field))
+    ):
+        opclass = _like_opclass(schema_editor, field)
+        if opclass:
+            add_index_online(
+                schema_editor,
+                model,
+                models.Index(
+                    fields=[field.name],
+                    name=_field_index_name(schema_editor, model, field, "_like"),
+                    opclasses=[opclass],
+                ),
+            )
+
+
+def _field_constraint_names(schema_editor, model, field, suffix, **filters):
+    """Existing constraints on ``field``'s column; Django's name for sqlmigrate."""
+    if schema_editor.collect_sql:
+        return [_field_index_name(schema_editor, model, field, suffix)]
+    return schema_editor._constraint_names(model, [field.column], **filters)
+
+
+def remove_field_indexes_online(schema_editor, model, old_field, field):
+    """Drop the indexes ``old_field`` implied that ``field`` no longer does."""
+    like_name = _field_index_name(schema_editor, model, old_field, "_like")
+    if old_field.unique and not field.unique:
+        for name in _field_constraint_names(
+            schema_editor, model, old_field, "_uniq", unique=True, primary_key=False
+        ):
+            remove_unique_online(schema_editor, model, name)
+    plain = old_field.db_index and not old_field.unique
+    if plain and not (field.db_index and not field.unique):
+        for name in _field_constraint_names(
+            schema_editor,
+            model,
+            old_field,
+            "",
+            index=True,
+            unique=False,
+            type_=models.Index.suffix,
+            exclude={like_name},
+        ):
+            remove_index_online(
+                schema_editor, model, models.Index(fields=[old_field.name], name=name)
+            )
+    if (
+        schema_editor.connection.vendor == "postgresql"
+        and _is_indexed(old_field)
+        and not _is_indexed(field)
+    ):
+        remove_index_online(
+            schema_editor, model, models.Index(fields=[old_field.name], name=like_name)
+        )
+
+
+def _column_exists(schema_editor, model, field):
+    introspection = schema_editor.connection.introspection
+    with schema_editor.connection.cursor() as cursor:
+        description = introspection.get_table_description(cursor, model._meta.db_table)
+    return field.column in {column.name for column in description}
+
+
+def _without_indexes(field, model):
+    """A copy of ``field`` with no db_index or unique, bound to ``model``."""
+    name, path, args, kwargs = field.deconstruct()
+    kwargs.update(db_index=False, unique=False)
+    bare = field.__class__(*args, **kwargs)
+    bare.set_attributes_from_name(name)
+    bare.model = model
+    return bare
+
+
+class AddIndexOnline(migrations.AddIndex):
+    """AddIndex built without blocking writes to the table."""
+
+    def describe(self):
+        return super().describe() + " (online)"
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        _require_non_atomic(self, schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            add_index_online(schema_editor, model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        _require_non_atomic(self, schema_editor)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            remove_index_online(schema_editor, model, self.index)
+
+
+class RemoveIndexOnline(migrations.RemoveIndex):
+    """RemoveIndex dropped without blocking writes to the table."""
+
+    def describe(self):
+        return super().describe() + " (online)"
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        _require_non_atomic(self, schema_editor)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            from_model_state = from_state.models[app_label, self.model_name_lower]
+            index = from_model_state.get_index_by_name(self.name)
+            remove_index_online(schema_editor, model, index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        _require_non_atomic(self, schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            to_model_state = to_state.models[app_label, self.model_name_lower]
+            index = to_model_state.get_index_by_name(self.name)
+            add_index_online(schema_editor, model, index)
+
+
+class AddFieldOnline(migrations.AddField):
+    """AddField whose db_index / unique indexes are built without blocking writes."""
+
+    def describe(self):
+        return super().describe() + " (online)"
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        _require_non_atomic(self, schema_editor)
+        if schema_editor.connection.vendor not in ONLINE_VENDORS:
+            return super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        field = model._meta.get_field(self.name)
+        # A re-run after an interrupted index build finds the column in place
+        if schema_editor.collect_sql or not _column_exists(schema_editor, model, field):
+            schema_editor.add_field(model, _without_indexes(field, model))
+        add_field_indexes_online(schema_editor, model, field)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        _require_non_atomic(self, schema_editor)
+        super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class AlterFieldOnline(migrations.AlterField):
+    """
+    AlterField changing only ``db_index`` / ``unique``, with the new indexes
+    built before the old ones are dropped and neither step blocking writes.
+    """
+
+    def describe(self):
+        return super().describe() + " (online)"
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._alter(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._alter(app_label, schema_editor, from_state, to_state)
+
+    def _alter(self, app_label, schema_editor, from_state, to_state):
+        _require_non_atomic(self, schema_editor)
+        from_model = from_state.apps.get_model(app_label, self.model_name)
+        to_model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, to_model):
+            return
+        old_field = from_model._meta.get_field(self.name)
+        field = to_model._meta.get_field(self.name)
+        if _index_free(old_field) != _index_free(field):
+            raise ValueError(
+                f"{self.__class__.__name__} can only change "
+                f"{' and '.join(INDEX_ATTRIBUTES)}; use AlterField."
+            )
+        if schema_editor.connection.vendor not in ONLINE_VENDORS:
+            schema_editor.alter_field(from_model, old_field, field)
+            return
+        add_field_indexes_online(schema_editor, to_model, field, old_field)
+        remove_field_indexes_online(schema_editor, from_model, old_field, field)
+
+
+def _index_free(field):
+    """A field's deconstruction without the attributes that only add indexes."""
+    name, path, args, kwargs = field.deconstruct()
+    for attribute in INDEX_ATTRIBUTES:
+        kwargs.pop(attribute, None)
+    return name, path, args, kwargs
+
+
+class BackfillField(Operation):
+    """
+    Set ``field_name`` to ``value`` (a constant or an expression such as
+    ``Lower("email")``) on every row matching ``where``, which defaults to
+    the field being NULL.
+
+    Rows are walked once in primary key order, so the run always ends, but
+    a row that starts matching ``where`` behind the cursor while it runs is
+    left as it is. ``where`` should stop matching a row once it has been
+    backfilled: a re-run then touches only the rows still pending, and a
+    ``where`` that keeps matching makes every re-run rewrite the whole set.
+
+    Reversing is a no-op: the column keeps its values.
+    """
+
+    reversible = True
+    reduces_to_sql = False
+
+    def __init__(
+        self, model_name, field_name, value, where=None, batch_size=1000, pause=0.0
+    ):
+        self.model_name = model_name
+        self.field_name = field_name
+        self.value = value
+        self.where = where
+        self.batch_size = batch_size
+        self.pause = pause
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def describe(self):
+        return f"Backfill {self.model_name}.{self.field_name} in batches"
+
+    @property
+    def migration_name_fragment(self):
+        return f"backfill_{self.model_name.lower()}_{self.field_name.lower()}"
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        _require_non_atomic(self, schema_editor)
+        alias = schema_editor.connection.alias
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not router.allow_migrate_model(alias, model):
+            return
+        where = self.where or Q(**{f"{self.field_name}__isnull": True})
+        pending = model._base_manager.using(alias).filter(where)
+
+        updated, last_pk = 0, None
+        while True:
+            batch = pending.order_by("pk")
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            pks = list(batch.values_list("pk", flat=True)[: self.batch_size])
+            if not pks:
+                break
+            last_pk = pks[-1]
+            with transaction.atomic(using=alias):
+                updated += pending.filter(pk__in=pks).update(
+                    **{self.field_name: self.value}
+                )
+            report(f"\n    {updated} row(s) so far, up to pk {last_pk}", level=2)
+            if self.pause:
+                time.sleep(self.pause)
+
+        if updated:
+            report(
+                f"\n  Backfilled {self.model_name}.{self.field_name} "
+                f"on {updated} row(s)\n"
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        pass
@@ -0,0 +1,57 @@
+"""
+Paginators that avoid exact ``COUNT(*)`` on large tables.
+"""
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def estimated_count(model, using="default"):
+    """
+    Return the planner's row estimate for ``model``'s table, or None.
+
+    PostgreSQL and MySQL keep an estimate in their catalogs; reading it is
+    constant-time. Other backends (SQLite) have none.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == "postgresql":
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)"
+    elif connection.vendor == "mysql":
+        sql = (
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+        )
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [table])
+        row = cursor.fetchone()
+    # PostgreSQL reports -1 for tables that were never analyzed
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator whose count never scans a large table.
+
+    - Unfiltered querysets over ``exact_threshold`` rows use the catalog
+      estimate.
+    - Everything else is counted exactly, but only up to ``count_limit``
+      rows; larger results expose the first ``count_limit`` rows as pages.
+    """
+
+    exact_threshold = 10_000
+    count_limit = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.has_filters():
+            estimate = estimated_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.exact_threshold:
+                return estimate
+        return queryset[: self.count_limit].count()
@@ -0,0 +1,11 @@
+from rest_framework import renderers
+
+from .timing import phase
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """DRF JSON renderer with a Server-Timing render phase."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with phase("render"):
+            return super().render(data, accepted_media_type, renderer_context)
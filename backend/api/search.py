@@ -0,0 +1,77 @@
+"""
+User search shared by the search-users endpoint and the admin changelist.
+
+Prefix matches run against the lowercase, indexed ``email_canonical``
+column as ``LIKE 'q%'`` with the query lowercased, which PostgreSQL answers
+from the varchar_pattern_ops ``_like`` index Django creates next to the
+unique index, and MySQL from the unique index itself (see prefix_lookup()).
+SQLite's LIKE never uses an index, so local development scans. Substring
+matches (``LIKE '%q%'``) always scan the table. Both callers therefore try
+the prefix first and only fall back to a substring match when the prefix
+does not produce enough results; rows without a canonical email (case
+collisions set aside by migration 0004) are only found by the substring.
+
+Concurrent identical endpoint searches share one execution through
+SEARCH_FLIGHTS (see api.singleflight).
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+
+from .models.user import canonical_email
+from .singleflight import Group
+
+SEARCH_LIMIT = 10
+
+User = get_user_model()
+
+SEARCH_FLIGHTS = Group(
+    "search_users",
+    across_workers=settings.SEARCH_COALESCE_ACROSS_WORKERS,
+    lock_timeout=settings.SEARCH_COALESCE_LOCK_TIMEOUT,
+)
+
+
+def prefix_lookup(queryset, query):
+    """Return filter kwargs for an index-served prefix match on ``query``."""
+    # email_canonical is lowercase, so both lookups match the same rows. On
+    # MySQL startswith is LIKE BINARY, which cannot use the case-insensitive
+    # index, while the plain LIKE of istartswith can; on PostgreSQL
+    # istartswith wraps the column in UPPER() and defeats the index.
+    if connections[queryset.db].vendor == "mysql":
+        lookup = "email_canonical__istartswith"
+    else:
+        lookup = "email_canonical__startswith"
+    return {lookup: canonical_email(query)}
+
+
+def find_users(query, limit=SEARCH_LIMIT, fields=("id", "email")):
+    """Return up to ``limit`` users matching ``query``, prefix matches first."""
+    prefix = prefix_lookup(User.objects.all(), query)
+    results = list(
+        User.objects.filter(**prefix)
+        .order_by("email_canonical")
+        .values(*fields)[:limit]
+    )
+    if len(results) < limit:
+        results += (
+            User.objects.filter(email__icontains=query)
+            .exclude(**prefix)
+            .order_by("email")
+            .values(*fields)[: limit - len(results)]
+        )
+    return results
+
+
+def filter_users(queryset, query):
+    """
+    Narrow ``queryset`` to users matching ``query`` without a limit.
+
+    Uses the prefix match when it finds anything, otherwise the substring
+    match.
+    """
+    prefix = queryset.filter(**prefix_lookup(queryset, query))
+    if prefix.exists():
+        return prefix
+    return queryset.filter(email__icontains=query)
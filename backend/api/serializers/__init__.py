@@ -1,5 +1,6 @@
 from .user import (
     CustomTokenObtainPairSerializer,
+    ProfileUpdateSerializer,
     UserRegistrationSerializer,
     UserSerializer,
 )
@@ -7,5 +8,6 @@ from .user import (
 __all__ = [
     "UserSerializer",
     "UserRegistrationSerializer",
+    "ProfileUpdateSerializer",
     "CustomTokenObtainPairSerializer",
 ]
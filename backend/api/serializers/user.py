@@ -2,8 +2,15 @@ from django.contrib.auth import get_user_model
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from ..timing import phase
+
 User = get_user_model()
 
+EMAIL_ERROR_MESSAGES = {
+    "invalid": "Please enter a valid email address.",
+    "required": "Email is required.",
+}
+
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -13,13 +20,7 @@ class UserSerializer(serializers.ModelSerializer):
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
-    email = serializers.EmailField(
-        required=True,
-        error_messages={
-            "invalid": "Please enter a valid email address.",
-            "required": "Email is required.",
-        },
-    )
+    email = serializers.EmailField(required=True, error_messages=EMAIL_ERROR_MESSAGES)
     password = serializers.CharField(
         write_only=True,
         min_length=8,
@@ -42,7 +43,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         fields = ["email", "password", "password_confirm"]
 
     def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
+        if User.objects.filter_by_email(value).exists():
             raise serializers.ValidationError(
                 "This email address is already registered."
             )
@@ -68,11 +69,20 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return user
 
 
+class ProfileUpdateSerializer(serializers.Serializer):
+    """Validates PUT /api/auth/profile/ input; uniqueness is checked by the view."""
+
+    email = serializers.EmailField(
+        required=False, max_length=254, error_messages=EMAIL_ERROR_MESSAGES
+    )
+
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     username_field = User.USERNAME_FIELD
 
     @classmethod
     def get_token(cls, user):
-        token = super().get_token(user)
-        token["email"] = user.email
-        return token
+        with phase("mint"):
+            token = super().get_token(user)
+            token["email"] = user.email
+            return token
@@ -0,0 +1,84 @@
+"""
+Model signal receivers for the api app.
+
+Connected from ApiConfig.ready().
+
+Cache invalidation runs in transaction.on_commit(): dropping an entry inside
+a still-open transaction lets a concurrent request re-cache the old rows
+before the change commits. Outside a transaction the callback runs at once.
+"""
+
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import bump_permissions_generation, invalidate_permissions
+from .conditional import bump_search_generation, invalidate_profile_etag
+from .lookup import invalidate_cached_user
+
+User = get_user_model()
+
+
+def _on_commit(using, func, *args):
+    transaction.on_commit(partial(func, *args), using=using)
+
+
+def _invalidate_user(user_id):
+    invalidate_profile_etag(user_id)
+    invalidate_cached_user(user_id)
+    bump_search_generation()
+    # is_active and is_superuser feed into the cached permission sets
+    invalidate_permissions(user_id)
+
+
+@receiver(post_save, sender=User, dispatch_uid="api.user_saved")
+@receiver(post_delete, sender=User, dispatch_uid="api.user_deleted")
+def invalidate_user_etags(sender, instance, using, **kwargs):
+    """Invalidate cached ETags and representations when a user row changes."""
+    _on_commit(using, _invalidate_user, instance.pk)
+
+
+@receiver(
+    m2m_changed, sender=User.groups.through, dispatch_uid="api.user_groups_changed"
+)
+@receiver(
+    m2m_changed,
+    sender=User.user_permissions.through,
+    dispatch_uid="api.user_permissions_changed",
+)
+def invalidate_user_permissions(
+    sender, instance, action, reverse, pk_set, using, **kwargs
+):
+    """Drop cached permissions of users whose groups or permissions changed."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        _on_commit(using, invalidate_permissions, instance.pk)
+    elif pk_set:
+        _on_commit(using, invalidate_permissions, *pk_set)
+    elif action == "post_clear":
+        # group.user_set.clear(): the affected users are no longer known
+        _on_commit(using, bump_permissions_generation)
+
+
+@receiver(
+    m2m_changed,
+    sender=Group.permissions.through,
+    dispatch_uid="api.group_permissions_changed",
+)
+def invalidate_group_permissions(sender, action, using, **kwargs):
+    """A group's permissions changed: every member's set may be stale."""
+    if action in ("post_add", "post_remove", "post_clear"):
+        _on_commit(using, bump_permissions_generation)
+
+
+@receiver(post_delete, sender=Group, dispatch_uid="api.group_deleted")
+@receiver(post_save, sender=Permission, dispatch_uid="api.permission_saved")
+@receiver(post_delete, sender=Permission, dispatch_uid="api.permission_deleted")
+def invalidate_all_permissions(sender, using, **kwargs):
+    """Deleted groups and created or deleted permissions affect many users."""
+    _on_commit(using, bump_permissions_generation)
@@ -0,0 +1,102 @@
+"""
+Request coalescing ("singleflight") for identical concurrent reads.
+
+``Group.do(key, fn)`` runs ``fn`` once per key at a time: the first caller
+(the leader) runs it, callers arriving with the same key while it is in
+flight wait and receive the leader's result or exception. Nothing is
+cached once the flight lands, so keys must already encode whatever makes a
+result stale (search keys carry the search generation).
+
+With ``across_workers`` the leader also takes a short cache lock and
+publishes its result in the cache, so a leader in another worker process
+waits for that result instead of querying too. This needs a shared
+CACHE_URL; if the lock holder does not publish within ``lock_timeout`` the
+waiter runs ``fn`` itself.
+
+Calls are counted in api_coalesced_calls_total{group,role}; the coalescing
+ratio is (follower + shared) / all calls.
+"""
+
+import threading
+import time
+
+from django.core.cache import cache
+
+from .metrics import COALESCED_CALLS
+
+LOCK_KEY = "singleflight:{group}:lock:{key}"
+RESULT_KEY = "singleflight:{group}:result:{key}"
+POLL_INTERVAL = 0.01
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class Group:
+    """A namespace of in-flight calls shared by the threads of one process."""
+
+    def __init__(self, name, across_workers=False, lock_timeout=2.0):
+        self.name = name
+        self.across_workers = across_workers
+        self.lock_timeout = lock_timeout
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def do(self, key, fn):
+        """Return ``fn()``, sharing one execution among concurrent callers."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            COALESCED_CALLS.inc((self.name, "follower"))
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._lead(key, fn)
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def _lead(self, key, fn):
+        if not self.across_workers:
+            COALESCED_CALLS.inc((self.name, "leader"))
+            return fn()
+
+        lock_key = LOCK_KEY.format(group=self.name, key=key)
+        result_key = RESULT_KEY.format(group=self.name, key=key)
+        deadline = time.monotonic() + self.lock_timeout
+        while not cache.add(lock_key, 1, self.lock_timeout):
+            # Another worker is running fn; wait for what it publishes
+            shared = cache.get(result_key)
+            if shared is not None:
+                COALESCED_CALLS.inc((self.name, "shared"))
+                return shared[0]
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(POLL_INTERVAL)
+
+        COALESCED_CALLS.inc((self.name, "leader"))
+        try:
+            result = fn()
+            # Wrapped so a None result is distinguishable from a miss
+            cache.set(result_key, (result,), self.lock_timeout)
+        finally:
+            cache.delete(lock_key)
+        return result
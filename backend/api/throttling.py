@@ -0,0 +1,120 @@
+"""
+Sliding-window rate limits for the unauthenticated auth endpoints.
+
+login and register are the only AllowAny endpoints and each one costs a
+password hash, so they are limited per client IP and per submitted email.
+DRF checks throttles in APIView.initial(), before the action runs, so a
+rejected request never reaches the database or the hasher.
+
+Each limit is a sliding-window counter: requests are counted in fixed
+windows with an atomic cache increment, and the count is estimated as
+
+    current_window + previous_window * (fraction of previous window still
+                                        inside the sliding window)
+
+That is two cache operations per check regardless of the rate, unlike DRF's
+SimpleRateThrottle, which stores and rewrites a timestamp list per client.
+Every attempt counts, including rejected ones, so a client hammering the
+endpoint stays limited until it slows down. Rates come from
+REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]; a rate of None disables a scope.
+
+Counters live in the default cache, so limits are shared across workers only
+when CACHE_URL points at a shared cache. Clients are identified by
+REMOTE_ADDR, or by X-Forwarded-For only as far back as NUM_PROXIES trusted
+hops; submitted emails are hashed so the key length stays bounded.
+"""
+
+import hashlib
+import math
+import time
+
+from rest_framework.throttling import SimpleRateThrottle
+
+from .metrics import RATE_LIMIT_DECISIONS
+from .models.user import canonical_email
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """SimpleRateThrottle rates and cache, with an O(1) sliding-window counter."""
+
+    cache_format = "throttle:{scope}:{ident}:{window}"
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        ident = self.get_cache_key(request, view)
+        if ident is None:
+            return True
+
+        now = time.time()
+        window, offset = divmod(now, self.duration)
+        key = self.cache_format.format(
+            scope=self.scope, ident=ident, window=int(window)
+        )
+        previous_key = self.cache_format.format(
+            scope=self.scope, ident=ident, window=int(window) - 1
+        )
+        # Two windows must survive: the current one and the one it slides over
+        self.cache.add(key, 0, self.duration * 2)
+        try:
+            current = self.cache.incr(key)
+        except ValueError:  # evicted between add() and incr()
+            self.cache.set(key, 1, self.duration * 2)
+            current = 1
+        previous = self.cache.get(previous_key, 0)
+
+        self.current, self.previous, self.offset = current, previous, offset
+        weight = 1 - offset / self.duration
+        allowed = current + previous * weight <= self.num_requests
+        RATE_LIMIT_DECISIONS.inc((self.scope, "allowed" if allowed else "limited"))
+        return allowed
+
+    def wait(self):
+        """
+        Seconds until a retry would be allowed.
+
+        The rejected request is already in ``current`` and the retry counts
+        too, so the retry needs a free slot on top of ``current``.
+        """
+        limit, window = self.num_requests, self.duration
+        headroom = limit - self.current - 1
+        if headroom >= 0 and self.previous:
+            # Retry in this window once enough of the previous one slid out
+            at = window * (1 - headroom / self.previous)
+            if at < window:
+                return max(1, math.ceil(at - self.offset))
+        # Retry in the next window, where this window's count is the previous
+        # one and the retry is the only request so far
+        at = window * max(0, 1 - (limit - 1) / self.current)
+        return max(1, math.ceil(window - self.offset + at))
+
+
+class IPThrottle(SlidingWindowThrottle):
+    def get_cache_key(self, request, view):
+        return self.get_ident(request)
+
+
+class EmailThrottle(SlidingWindowThrottle):
+    def get_cache_key(self, request, view):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        # Hashed: the raw address is unbounded client input, and memcached
+        # rejects keys over 250 bytes
+        return hashlib.sha256(canonical_email(email).encode()).hexdigest()
+
+
+class LoginIPThrottle(IPThrottle):
+    scope = "login_ip"
+
+
+class LoginEmailThrottle(EmailThrottle):
+    scope = "login_email"
+
+
+class RegisterIPThrottle(IPThrottle):
+    scope = "register_ip"
+
+
+class RegisterEmailThrottle(EmailThrottle):
+    scope = "register_email"
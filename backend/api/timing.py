@@ -0,0 +1,83 @@
+"""
+Per-request phase timing for the Server-Timing header and structured logs.
+
+ServerTimingMiddleware installs a ServerTiming collector for the request when
+SERVER_TIMING is enabled. Hot paths wrap their phases in ``phase("name")``;
+repeated phases accumulate. With timing disabled ``phase`` is a context-var
+read returning a shared no-op context manager.
+
+Phases recorded:
+- jwt: access token decode and signature check (authentication class)
+- auth_db: user lookup during JWT authentication
+- db: user lookup by the login authentication backend
+- hash: password hashing and verification
+- mint: refresh/access token creation
+- render: response rendering
+"""
+
+import contextlib
+from contextvars import ContextVar
+from time import perf_counter
+
+_current_timing = ContextVar("server_timing", default=None)
+_noop_phase = contextlib.nullcontext()
+
+
+class _Phase:
+    __slots__ = ("timing", "name", "start")
+
+    def __init__(self, timing, name):
+        self.timing = timing
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+
+    def __exit__(self, *exc_info):
+        durations = self.timing.durations
+        durations[self.name] = durations.get(self.name, 0.0) + (
+            perf_counter() - self.start
+        )
+
+
+class ServerTiming:
+    """Accumulated phase durations (seconds) for one request."""
+
+    def __init__(self):
+        self.durations = {}
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def as_header(self):
+        """Format as a Server-Timing header value (durations in ms)."""
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.2f}"
+            for name, seconds in self.durations.items()
+        )
+
+    def as_log_fields(self):
+        """Format as structured log fields (durations in ms)."""
+        return {
+            f"{name}_ms": round(seconds * 1000, 3)
+            for name, seconds in self.durations.items()
+        }
+
+
+def phase(name):
+    """Time the enclosed block as ``name`` for the current request, if enabled."""
+    timing = _current_timing.get()
+    if timing is None:
+        return _noop_phase
+    return timing.phase(name)
+
+
+@contextlib.contextmanager
+def collect():
+    """Install a ServerTiming collector for the duration of the block."""
+    timing = ServerTiming()
+    token = _current_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _current_timing.reset(token)
@@ -1,7 +1,7 @@
 from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
 
-from .views import AuthViewSet
+from .views import AuthViewSet, batch, live, metrics, ready
 
 router = DefaultRouter()
 router.register(r"auth", AuthViewSet, basename="auth")
@@ -13,5 +13,10 @@ urlpatterns = [
         AuthViewSet.as_view({"get": "search_users"}),
         name="auth-search-users",
     ),
+    path("batch/", batch, name="batch"),
+    path("metrics", metrics, name="metrics"),
+    # Normally answered by HealthCheckMiddleware before reaching the URLconf
+    path("health/live", live, name="health-live"),
+    path("health/ready", ready, name="health-ready"),
     path("", include(router.urls)),
 ]
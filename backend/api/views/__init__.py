@@ -1,3 +1,6 @@
 from .auth import AuthViewSet
+from .batch import batch
+from .health import live, ready
+from .metrics import metrics
 
-__all__ = ["AuthViewSet"]
+__all__ = ["AuthViewSet", "batch", "live", "metrics", "ready"]
@@ -1,17 +1,54 @@
+from time import perf_counter
+
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db.models import F
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 
+from .. import audit
+from ..activity import record_login, record_seen
+from ..authentication import JWTAuthentication
+from ..conditional import (
+    bump_search_generation,
+    cache_profile_etag,
+    get_cached_profile_etag,
+    if_match_satisfied,
+    if_none_match_matches,
+    search_etag,
+    user_etag,
+)
+from ..lookup import (
+    LOOKUP_FIELDS,
+    LOOKUP_LIMIT,
+    MAX_USER_ID,
+    invalidate_cached_user,
+    lookup_users,
+)
+from ..metrics import observe_request
+from ..middleware import mark_uncompressible
+from ..models.audit import AuthAuditEvent
+from ..models.user import canonical_email
+from ..search import SEARCH_FLIGHTS, find_users
 from ..serializers import (
     CustomTokenObtainPairSerializer,
+    ProfileUpdateSerializer,
     UserRegistrationSerializer,
     UserSerializer,
 )
+from ..throttling import (
+    LoginEmailThrottle,
+    LoginIPThrottle,
+    RegisterEmailThrottle,
+    RegisterIPThrottle,
+)
 
 User = get_user_model()
+Event = AuthAuditEvent.Event
 
 
 class AuthViewSet(viewsets.ViewSet):
@@ -22,6 +59,7 @@ class AuthViewSet(viewsets.ViewSet):
     - POST /api/auth/register/ - User registration
     - GET /api/auth/profile/ - Get current user profile
     - PUT /api/auth/profile/ - Update current user profile
+    - GET /api/auth/users/ - Look up users by id
     """
 
     def get_permissions(self):
@@ -35,6 +73,90 @@ class AuthViewSet(viewsets.ViewSet):
             return [AllowAny()]
         return [IsAuthenticated()]
 
+    def get_throttles(self):
+        """
+        Rate-limit the AllowAny actions per client IP and per email.
+
+        DRF checks these before the action runs, so a limited request costs
+        two cache operations and no query or password hash.
+        """
+        if self.action == "login":
+            return [LoginIPThrottle(), LoginEmailThrottle()]
+        if self.action == "register":
+            return [RegisterIPThrottle(), RegisterEmailThrottle()]
+        return []
+
+    def dispatch(self, request, *args, **kwargs):
+        """Record request count and latency per action."""
+        start = perf_counter()
+        response = super().dispatch(request, *args, **kwargs)
+        observe_request(
+            self.action or "unknown", response.status_code, perf_counter() - start
+        )
+        return response
+
+    def perform_authentication(self, request):
+        """
+        Answer conditional GETs from cached ETags before touching the DB.
+
+        For profile and search_users, a request carrying a valid JWT and an
+        If-None-Match that matches the cached ETag is authenticated from the
+        token alone; the action then returns 304 without loading the user.
+        Anything else falls through to regular (DB-backed) authentication.
+
+        Sub-requests of the batch endpoint reuse the batch's user and token.
+        """
+        self.not_modified_etag = None
+        # Sub-request of /api/batch/: the batch has already authenticated
+        batch_auth = getattr(request._request, "batch_auth", None)
+        if batch_auth is not None:
+            request.user, request.auth = batch_auth
+            return
+        if_none_match = request.headers.get("If-None-Match")
+        if (
+            request.method == "GET"
+            and if_none_match
+            and self.action in ["profile", "search_users"]
+        ):
+            validated_token = self._get_stateless_token(request)
+            if validated_token is not None:
+                if self.action == "profile":
+                    etag = get_cached_profile_etag(
+                        validated_token[jwt_settings.USER_ID_CLAIM]
+                    )
+                else:
+                    # Short queries get an unconditional 200 [] with no ETag
+                    query = request.query_params.get("q", "").strip()
+                    etag = search_etag(query) if len(query) >= 2 else None
+                if etag and if_none_match_matches(if_none_match, etag):
+                    request.user = TokenUser(validated_token)
+                    request.auth = validated_token
+                    record_seen(request.user.pk)
+                    self.not_modified_etag = etag
+                    return
+        super().perform_authentication(request)
+
+    def _get_stateless_token(self, request):
+        """Return the request's validated JWT without a DB lookup, or None."""
+        authenticator = JWTAuthentication()
+        header = authenticator.get_header(request)
+        if header is None:
+            return None
+        try:
+            raw_token = authenticator.get_raw_token(header)
+            if raw_token is None:
+                return None
+            validated_token = authenticator.get_validated_token(raw_token)
+        except AuthenticationFailed:
+            return None
+        if jwt_settings.USER_ID_CLAIM not in validated_token:
+            return None
+        return validated_token
+
+    def _not_modified(self, etag):
+        """Return an empty 304 response for the given ETag."""
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
     @action(detail=False, methods=["post"])
     def login(self, request):
         """
@@ -60,19 +182,28 @@ class AuthViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Check if user exists
-        user = User.objects.filter(email=email).first()
-        if not user:
-            return Response(
-                {"detail": "Email or password is incorrect."},
-                status=status.HTTP_401_UNAUTHORIZED,
-            )
-
-        # Try to get token using the serializer
+        # The serializer's authentication backend does the only user lookup;
+        # unknown emails and wrong passwords get the same generic 401 below
         serializer = CustomTokenObtainPairSerializer(data=request.data)
-        if serializer.is_valid():
-            return Response(serializer.validated_data, status=status.HTTP_200_OK)
+        try:
+            is_valid = serializer.is_valid()
+        except AuthenticationFailed:
+            is_valid = False
+        if is_valid:
+            # last_login is written behind (SIMPLE_JWT UPDATE_LAST_LOGIN is off)
+            record_login(serializer.user.pk)
+            audit.record(
+                Event.LOGIN_SUCCESS,
+                serializer.user.pk,
+                serializer.user.email,
+                audit.client_ip(request),
+            )
+            # Token pairs must never be compressed alongside user input (BREACH)
+            return mark_uncompressible(
+                Response(serializer.validated_data, status=status.HTTP_200_OK)
+            )
 
+        audit.record(Event.LOGIN_FAILURE, email=email, ip=audit.client_ip(request))
         # If serializer fails, provide generic error message for security
         return Response(
             {"detail": "Email or password is incorrect."},
@@ -89,14 +220,10 @@ class AuthViewSet(viewsets.ViewSet):
         - password: str
         - password_confirm: str
         """
-        if User.objects.filter(email=request.data.get("email")).exists():
-            return Response(
-                {"email": "Email already exists."}, status=status.HTTP_400_BAD_REQUEST
-            )
-
         serializer = UserRegistrationSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
+            audit.record(Event.REGISTER, user.pk, user.email, audit.client_ip(request))
             user_data = UserSerializer(user).data
             return Response(user_data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -107,32 +234,79 @@ class AuthViewSet(viewsets.ViewSet):
         User profile endpoint.
 
         GET /api/auth/profile/ - Get current user profile
+        - If-None-Match: ETag from a previous response (optional, 304 on match)
         PUT /api/auth/profile/ - Update current user profile
+        - If-Match: ETag from a previous response (optional, 412 on mismatch)
 
         Requires: Authorization header with valid JWT token
         """
         if request.method == "GET":
+            if self.not_modified_etag:
+                return self._not_modified(self.not_modified_etag)
+
+            etag = user_etag(request.user)
+            cache_profile_etag(request.user)
+            if if_none_match_matches(request.headers.get("If-None-Match"), etag):
+                return self._not_modified(etag)
+
             serializer = UserSerializer(request.user)
-            return Response(serializer.data)
+            return Response(serializer.data, headers={"ETag": etag})
 
         elif request.method == "PUT":
             user = request.user
+            etag = user_etag(user)
 
-            if "email" in request.data:
-                if (
-                    User.objects.filter(email=request.data["email"])
-                    .exclude(id=user.id)
-                    .exists()
-                ):
+            if not if_match_satisfied(request.headers.get("If-Match"), etag):
+                return Response(
+                    {"detail": "Profile has been modified. Reload and retry."},
+                    status=status.HTTP_412_PRECONDITION_FAILED,
+                )
+
+            update = ProfileUpdateSerializer(data=request.data)
+            if not update.is_valid():
+                return Response(update.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            # Only write the columns that actually changed
+            changes = {}
+            email = update.validated_data.get("email")
+            if email is not None and email != user.email:
+                if User.objects.filter_by_email(email).exclude(id=user.id).exists():
                     return Response(
                         {"email": "Email already exists."},
                         status=status.HTTP_400_BAD_REQUEST,
                     )
-                user.email = request.data["email"]
+                changes["email"] = email
+                changes["email_canonical"] = canonical_email(email)
+
+            if changes:
+                # Compare-and-swap on the row version so a concurrent write
+                # between authentication and now is rejected, not clobbered
+                updated = User.objects.filter(pk=user.pk, version=user.version).update(
+                    version=F("version") + 1, **changes
+                )
+                if not updated:
+                    return Response(
+                        {"detail": "Profile has been modified. Reload and retry."},
+                        status=status.HTTP_412_PRECONDITION_FAILED,
+                    )
+                if "email" in changes:
+                    audit.record(
+                        Event.EMAIL_CHANGE,
+                        user.pk,
+                        changes["email"],
+                        audit.client_ip(request),
+                        old_email=user.email,
+                    )
+                for field, value in changes.items():
+                    setattr(user, field, value)
+                user.version += 1
+                # Queryset updates bypass post_save, so invalidate explicitly
+                cache_profile_etag(user)
+                invalidate_cached_user(user.pk)
+                bump_search_generation()
 
-            user.save()
             serializer = UserSerializer(user)
-            return Response(serializer.data)
+            return Response(serializer.data, headers={"ETag": user_etag(user)})
 
     @action(detail=False, methods=["get"])
     def search_users(self, request):
@@ -141,6 +315,7 @@ class AuthViewSet(viewsets.ViewSet):
 
         GET /api/auth/search-users/?q=email
         - q: str (search query, minimum 2 characters)
+        - If-None-Match: ETag from a previous response (optional, 304 on match)
 
         Returns: List of matching users
         """
@@ -149,8 +324,65 @@ class AuthViewSet(viewsets.ViewSet):
         if len(query) < 2:
             return Response([], status=status.HTTP_200_OK)
 
-        users = User.objects.filter(Q(email__icontains=query)).values("id", "email")[
-            :10
-        ]  # Limit to 10 results
+        if self.not_modified_etag:
+            return self._not_modified(self.not_modified_etag)
+
+        etag = search_etag(query)
+        if if_none_match_matches(request.headers.get("If-None-Match"), etag):
+            return self._not_modified(etag)
+
+        # The ETag carries the search generation, so it is a safe flight key
+        users = SEARCH_FLIGHTS.do(etag, lambda: find_users(query))
+
+        return Response(users, status=status.HTTP_200_OK, headers={"ETag": etag})
+
+    @action(detail=False, methods=["get"])
+    def users(self, request):
+        """
+        Look up many users by id in one request.
+
+        GET /api/auth/users/?ids=1,2,3&fields=id,email
+        - ids: comma-separated user ids, at most LOOKUP_LIMIT
+        - fields: comma-separated subset of id, email (optional, default all)
+
+        Returns: the matching users in the order of ``ids``; unknown ids are
+        left out.
+        """
+        try:
+            ids = [
+                int(value)
+                for value in request.query_params.get("ids", "").split(",")
+                if value.strip()
+            ]
+        except ValueError:
+            ids = None
+        # Out-of-range ids overflow the primary key column
+        if ids is None or not all(0 < user_id <= MAX_USER_ID for user_id in ids):
+            return Response(
+                {"ids": "Expected comma-separated integers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not ids:
+            return Response(
+                {"ids": "At least one id is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(ids) > LOOKUP_LIMIT:
+            return Response(
+                {"ids": f"At most {LOOKUP_LIMIT} ids per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fields = [
+            field.strip()
+            for field in request.query_params.get("fields", "").split(",")
+            if field.strip()
+        ] or list(LOOKUP_FIELDS)
+        unknown = sorted(set(fields) - set(LOOKUP_FIELDS))
+        if unknown:
+            return Response(
+                {"fields": f"Unknown field(s): {', '.join(unknown)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        return Response(list(users), status=status.HTTP_200_OK)
+        return Response(lookup_users(ids, fields), status=status.HTTP_200_OK)
@@ -0,0 +1,221 @@
+"""
+Batch endpoint: several AuthViewSet requests in one round trip.
+
+The batch request is authenticated once (JWT verification and the user
+lookup); every sub-request reuses that user and token and is dispatched
+straight to its AuthViewSet view, skipping the middleware stack. Each
+sub-request still runs the view's own permission checks, throttles,
+conditional-request handling and metrics. The AllowAny login and register
+actions cannot be batched, and the batch response is never compressed when a
+sub-response opted out of compression (BREACH).
+
+Consecutive read-only sub-requests (GET/HEAD) run concurrently on a small
+thread pool; any other method runs alone, in order, so reads placed after
+a write see its result. Reads fall back to running one by one when the
+batch itself runs inside a transaction, which other threads cannot see.
+"""
+
+import io
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import close_old_connections, connection
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ..middleware import mark_uncompressible
+from ..middleware.compression import UNCOMPRESSIBLE_ATTR
+from .auth import AuthViewSet
+
+BATCH_AUTH_ATTR = "batch_auth"
+READ_METHODS = {"GET", "HEAD"}
+ALLOWED_METHODS = {"GET", "HEAD", "POST", "PUT"}
+FORWARDED_HEADERS = ("If-Match", "If-None-Match")
+RETURNED_HEADERS = ("ETag", "Retry-After", "Location")
+# Unauthenticated, throttled actions; login returns the token pair
+UNBATCHABLE_ACTIONS = {"login", "register"}
+# Request META copied from the batch into every sub-request
+INHERITED_META = (
+    "REMOTE_ADDR",
+    "HTTP_X_FORWARDED_FOR",
+    "HTTP_HOST",
+    "SERVER_NAME",
+    "SERVER_PORT",
+    "wsgi.url_scheme",
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.BATCH_MAX_WORKERS,
+                    thread_name_prefix="batch",
+                )
+    return _executor
+
+
+def _reset_executor():
+    global _executor
+    _executor = None
+
+
+os.register_at_fork(after_in_child=_reset_executor)
+
+
+def _error(status_code, detail):
+    return {"status": status_code, "headers": {}, "body": {"detail": detail}}
+
+
+def _parse_items(data):
+    """Validate the batch payload; returns (items, error message)."""
+    items = data.get("requests") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None, "Expected a non-empty 'requests' list."
+    if len(items) > settings.BATCH_MAX_REQUESTS:
+        return None, f"At most {settings.BATCH_MAX_REQUESTS} requests per batch."
+    parsed = []
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get("path"), str):
+            return None, "Each request needs a 'path' string."
+        method = str(item.get("method", "GET")).upper()
+        headers = item.get("headers") or {}
+        if not isinstance(headers, dict):
+            return None, "'headers' must be an object."
+        parsed.append((method, item["path"], item.get("body"), headers))
+    return parsed, None
+
+
+class BatchRunner:
+    """Builds, dispatches and collects the sub-requests of one batch."""
+
+    def __init__(self, request):
+        self.request = request
+        self.api_root = request.path.removesuffix("batch/")
+        # Set when any sub-response opted out of compression
+        self.uncompressible = False
+
+    def run(self, items):
+        results = [None] * len(items)
+        concurrent = settings.BATCH_MAX_WORKERS > 1 and not connection.in_atomic_block
+        reads = []
+        for index, item in enumerate(items):
+            if item[0] in READ_METHODS:
+                reads.append(index)
+                continue
+            self._run_reads(reads, items, results, concurrent)
+            reads = []
+            results[index] = self._dispatch(*item)
+        self._run_reads(reads, items, results, concurrent)
+        return results
+
+    def _run_reads(self, indexes, items, results, concurrent):
+        if concurrent and len(indexes) > 1:
+            futures = [
+                _get_executor().submit(self._dispatch_in_thread, *items[i])
+                for i in indexes
+            ]
+            for index, future in zip(indexes, futures):
+                results[index] = future.result()
+        else:
+            for index in indexes:
+                results[index] = self._dispatch(*items[index])
+
+    def _dispatch_in_thread(self, *item):
+        # Pool threads see no request_started/finished signals
+        close_old_connections()
+        try:
+            return self._dispatch(*item)
+        finally:
+            close_old_connections()
+
+    def _dispatch(self, method, path, body, headers):
+        if method not in ALLOWED_METHODS:
+            return _error(status.HTTP_405_METHOD_NOT_ALLOWED, "Method not allowed.")
+        url = urlsplit(path)
+        full_path = self.api_root + url.path.lstrip("/")
+        try:
+            match = resolve(full_path)
+        except Resolver404:
+            return _error(status.HTTP_404_NOT_FOUND, "Not found.")
+        if getattr(match.func, "cls", None) is not AuthViewSet:
+            return _error(status.HTTP_404_NOT_FOUND, "Not found.")
+        if match.func.actions.get(method.lower()) in UNBATCHABLE_ACTIONS:
+            return _error(
+                status.HTTP_400_BAD_REQUEST, "This endpoint cannot be batched."
+            )
+
+        sub_request = self._build_request(method, full_path, url.query, body, headers)
+        response = match.func(sub_request, *match.args, **match.kwargs)
+        if getattr(response, UNCOMPRESSIBLE_ATTR, False):
+            self.uncompressible = True
+        return {
+            "status": response.status_code,
+            "headers": {
+                name: response[name] for name in RETURNED_HEADERS if name in response
+            },
+            "body": getattr(response, "data", None),
+        }
+
+    def _build_request(self, method, path, query, body, headers):
+        content = b"" if body is None else json.dumps(body).encode()
+        environ = {
+            key: self.request.META[key]
+            for key in INHERITED_META
+            if key in self.request.META
+        }
+        environ.update(
+            {
+                "REQUEST_METHOD": method,
+                "PATH_INFO": path,
+                "SCRIPT_NAME": "",
+                "QUERY_STRING": query,
+                "CONTENT_TYPE": "application/json",
+                "CONTENT_LENGTH": str(len(content)),
+                "wsgi.input": io.BytesIO(content),
+            }
+        )
+        for name in FORWARDED_HEADERS:
+            if name in headers:
+                environ["HTTP_" + name.upper().replace("-", "_")] = str(headers[name])
+        sub_request = WSGIRequest(environ)
+        setattr(sub_request, BATCH_AUTH_ATTR, (self.request.user, self.request.auth))
+        return sub_request
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def batch(request):
+    """
+    Run several API requests in one round trip.
+
+    POST /api/batch/
+    - requests: list of {method (default GET), path (relative to /api/, may
+      carry a query string), body (JSON, optional), headers (optional
+      If-Match / If-None-Match)}; at most BATCH_MAX_REQUESTS
+
+    Returns: list of {status, headers, body} in request order. Only
+    AuthViewSet endpoints can be batched; others return a 404 entry, and
+    login/register a 400 entry.
+    """
+    items, error = _parse_items(request.data)
+    if error:
+        return Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
+    runner = BatchRunner(request)
+    response = Response(runner.run(items))
+    if runner.uncompressible:
+        mark_uncompressible(response)
+    return response
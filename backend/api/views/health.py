@@ -0,0 +1,30 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_safe
+
+from ..health import READINESS
+
+
+@require_safe
+def live(request):
+    """
+    Liveness probe: the process is serving requests. No I/O.
+
+    GET /api/health/live
+    """
+    return JsonResponse({"status": "ok"})
+
+
+@require_safe
+def ready(request):
+    """
+    Readiness probe: the database answers within HEALTH_READY_TIMEOUT.
+
+    GET /api/health/ready
+
+    Returns 200, or 503 with the reason. The result is cached per process
+    for HEALTH_READY_CACHE_SECONDS.
+    """
+    is_ready, reason = READINESS.check()
+    if is_ready:
+        return JsonResponse({"status": "ok"})
+    return JsonResponse({"status": "unavailable", "reason": reason}, status=503)
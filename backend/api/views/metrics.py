@@ -0,0 +1,30 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+from ..metrics import REGISTRY
+
+
+@require_GET
+def metrics(request):
+    """
+    Prometheus scrape endpoint.
+
+    GET /api/metrics
+    - Authorization: Bearer <METRICS_TOKEN>
+
+    Returns 404 while METRICS_TOKEN is unset, 403 for a missing or wrong token.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        raise Http404
+    provided = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not hmac.compare_digest(provided.encode(), token.encode()):
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        REGISTRY.exposition(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,5 @@
+"""
+Microbenchmark suite with stored baselines and regression gating.
+
+See ``python -m benchmarks --help``.
+"""
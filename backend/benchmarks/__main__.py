@@ -0,0 +1,122 @@
+"""
+Command-line entry point for the microbenchmark suite.
+
+Usage (from backend/):
+    python -m benchmarks --save benchmarks/baseline.json
+    python -m benchmarks --compare benchmarks/baseline.json --tolerance 0.15
+
+Benchmarks run against a throwaway test database created from the
+configured DATABASES (in-memory on SQLite). --compare exits with status 1
+when any median timing regresses beyond the tolerance.
+"""
+
+import argparse
+import fnmatch
+import os
+import sys
+
+import django
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Run the microbenchmark suite."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+        help="User table sizes for the search benchmarks.",
+    )
+    parser.add_argument(
+        "--only", metavar="GLOB", help="Only run benchmarks matching this pattern."
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark.")
+    parser.add_argument("--save", metavar="PATH", help="Write results as a baseline.")
+    parser.add_argument(
+        "--compare", metavar="PATH", help="Compare results against a baseline."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.15,
+        help="Allowed slowdown before --compare fails (0.15 = 15%%).",
+    )
+    return parser.parse_args(argv)
+
+
+def run_suite(args):
+    from . import harness, suite
+
+    def selected(name):
+        return args.only is None or fnmatch.fnmatch(name, args.only)
+
+    results = {}
+
+    def run(name, func):
+        samples, number = harness.measure(func, repeat=args.repeat)
+        results[name] = harness.result_entry(samples, number)
+        print(f"  {name:<40} {harness.format_ns(results[name]['median_ns']):>10}")
+
+    for name, factory in suite.BENCHMARKS.items():
+        if selected(name):
+            run(name, factory())
+
+    sized = [
+        name
+        for name in suite.SIZED_BENCHMARKS
+        if any(selected(f"{name}[{size}]") for size in args.sizes)
+    ]
+    for size in sorted(args.sizes) if sized else []:
+        print(f"  populating {size} users...")
+        suite.populate_users(size)
+        for name in sized:
+            if selected(f"{name}[{size}]"):
+                run(f"{name}[{size}]", suite.SIZED_BENCHMARKS[name]())
+    return results
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    from . import harness
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        results = run_suite(args)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    if args.save:
+        harness.save(args.save, results)
+        print(f"\nSaved {len(results)} results to {args.save}")
+
+    if args.compare:
+        baseline = harness.load(args.compare)
+        rows, regressions = harness.compare(baseline, results, args.tolerance)
+        print(f"\n  {'benchmark':<40} {'baseline':>10} {'current':>10} {'ratio':>7}")
+        for name, before, after, ratio in rows:
+            flag = "  REGRESSION" if name in regressions else ""
+            ratio_text = "-" if ratio is None else f"{ratio:.2f}x"
+            print(
+                f"  {name:<40} {harness.format_ns(before):>10} "
+                f"{harness.format_ns(after):>10} {ratio_text:>7}{flag}"
+            )
+        if regressions:
+            print(
+                f"\n{len(regressions)} benchmark(s) regressed beyond "
+                f"{args.tolerance:.0%}: {', '.join(regressions)}"
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
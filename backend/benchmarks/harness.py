@@ -0,0 +1,100 @@
+"""
+Timing, baseline storage and regression comparison for the benchmark suite.
+"""
+
+import json
+import platform
+import statistics
+import sys
+import time
+
+import django
+from django.db import connection
+
+
+def measure(func, repeat=5, min_time=0.2):
+    """
+    Time ``func`` and return per-call nanoseconds for each of ``repeat`` runs.
+
+    The number of calls per run is calibrated so a run lasts at least
+    ``min_time`` seconds (a single call for slow functions like hashing).
+    """
+    func()  # warm up caches, lazy imports and query compilation
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return [sample * 1e9 for sample in samples], number
+
+
+def result_entry(samples, number):
+    return {
+        "median_ns": round(statistics.median(samples)),
+        "min_ns": round(min(samples)),
+        "max_ns": round(max(samples)),
+        "calls_per_run": number,
+        "runs": len(samples),
+    }
+
+
+def environment():
+    """Describe where the numbers came from."""
+    return {
+        "python": sys.version.split()[0],
+        "django": django.get_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "database": connection.vendor,
+    }
+
+
+def save(path, results):
+    with open(path, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+        f.write("\n")
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline, results, tolerance):
+    """
+    Compare median timings against a baseline.
+
+    Returns (rows, regressions) where each row is
+    (name, baseline_ns, current_ns, ratio) and regressions lists the names
+    slower than ``1 + tolerance`` times their baseline. Benchmarks missing
+    from either side are reported with a None ratio and never fail.
+    """
+    rows, regressions = [], []
+    for name in sorted(set(baseline["results"]) | set(results)):
+        before = baseline["results"].get(name, {}).get("median_ns")
+        after = results.get(name, {}).get("median_ns")
+        ratio = after / before if before and after else None
+        rows.append((name, before, after, ratio))
+        if ratio is not None and ratio > 1 + tolerance:
+            regressions.append(name)
+    return rows, regressions
+
+
+def format_ns(value):
+    if value is None:
+        return "-"
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if value >= scale:
+            return f"{value / scale:.2f}{unit}"
+    return f"{value:.0f}ns"
@@ -0,0 +1,115 @@
+"""
+Benchmark definitions.
+
+Plain benchmarks are zero-argument callables built by a factory that does
+the setup. Sized benchmarks run once per table size; the user table is
+topped up to each size (ascending) before they run.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import JWTAuthentication
+from api.search import find_users
+from api.serializers import (
+    CustomTokenObtainPairSerializer,
+    UserRegistrationSerializer,
+    UserSerializer,
+)
+
+User = get_user_model()
+
+BENCHMARKS = {}
+SIZED_BENCHMARKS = {}
+
+PASSWORD = "BenchPassw0rd!"
+SEARCH_HIT = "user0000"
+SEARCH_MISS = "no-such-user"
+
+
+def benchmark(name):
+    def register(factory):
+        BENCHMARKS[name] = factory
+        return factory
+
+    return register
+
+
+def sized_benchmark(name):
+    def register(factory):
+        SIZED_BENCHMARKS[name] = factory
+        return factory
+
+    return register
+
+
+def bench_user():
+    user, _ = User.objects.get_or_create(
+        email="bench@example.com", defaults={"password": make_password(PASSWORD)}
+    )
+    return user
+
+
+@benchmark("user_serializer")
+def user_serializer():
+    user = bench_user()
+    return lambda: UserSerializer(user).data
+
+
+@benchmark("registration_serializer_validate")
+def registration_serializer_validate():
+    serializer = UserRegistrationSerializer()
+    data = {
+        "email": "new@example.com",
+        "password": PASSWORD,
+        "password_confirm": PASSWORD,
+    }
+    return lambda: serializer.validate(data)
+
+
+@benchmark("token_get_token")
+def token_get_token():
+    user = bench_user()
+    return lambda: CustomTokenObtainPairSerializer.get_token(user)
+
+
+@benchmark("password_hash")
+def password_hash():
+    return lambda: make_password(PASSWORD)
+
+
+@benchmark("password_check")
+def password_check():
+    encoded = make_password(PASSWORD)
+    return lambda: check_password(PASSWORD, encoded)
+
+
+@benchmark("jwt_decode")
+def jwt_decode():
+    raw_token = str(AccessToken.for_user(bench_user())).encode()
+    authenticator = JWTAuthentication()
+    return lambda: authenticator.get_validated_token(raw_token)
+
+
+@sized_benchmark("search_users_hit")
+def search_users_hit():
+    return lambda: find_users(SEARCH_HIT)
+
+
+@sized_benchmark("search_users_miss")
+def search_users_miss():
+    return lambda: find_users(SEARCH_MISS)
+
+
+def populate_users(target, batch_size=10_000):
+    """Top the user table up to ``target`` synthetic rows."""
+    existing = User.objects.filter(email__startswith="user").count()
+    password = make_password(PASSWORD)
+    domains = ("example.com", "mail.example.org", "corp.example.net")
+    for start in range(existing, target, batch_size):
+        stop = min(start + batch_size, target)
+        User.objects.bulk_create(
+            User(email=f"user{i:07d}@{domains[i % len(domains)]}", password=password)
+            for i in range(start, stop)
+        )
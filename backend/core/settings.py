@@ -34,7 +34,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First: health probes skip everything below
+    "api.middleware.HealthCheckMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "api.middleware.ServerTimingMiddleware",
+    "api.middleware.CompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -117,6 +121,40 @@ elif parsed_db_url.scheme in {"mysql", "mysql2"}:
 else:
     raise ValueError(f"Unsupported DATABASE_URL format: {DATABASE_URL}")
 
+# Cache configuration from environment. The default per-process cache is
+# fine for a single worker; multi-worker deployments need a shared backend
+# (e.g. redis://redis:6379/0) so ETag and counter invalidation is global.
+CACHE_URL = config("CACHE_URL", default="locmem://")
+parsed_cache_url = urlparse(CACHE_URL)
+
+if parsed_cache_url.scheme == "locmem":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": parsed_cache_url.netloc or "default",
+        }
+    }
+elif parsed_cache_url.scheme in {"redis", "rediss"}:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        }
+    }
+else:
+    raise ValueError(f"Unsupported CACHE_URL format: {CACHE_URL}")
+
+# gunicorn workers (WEB_CONCURRENCY, exported by the entrypoint) would each
+# keep a private locmem cache: stale ETags, revoked permissions that keep
+# working and throttle limits multiplied by the worker count.
+WEB_CONCURRENCY = config("WEB_CONCURRENCY", default=1, cast=int)
+if WEB_CONCURRENCY > 1 and parsed_cache_url.scheme == "locmem":
+    raise ValueError(
+        f"CACHE_URL={CACHE_URL} is per-process but WEB_CONCURRENCY="
+        f"{WEB_CONCURRENCY}; set CACHE_URL to a shared cache "
+        "(e.g. redis://redis:6379/0)"
+    )
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -142,11 +180,27 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.JWTAuthentication",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
+    # Rate limits for login and register (api.throttling), checked before
+    # any DB lookup or password hash. "" disables a scope.
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": config("THROTTLE_LOGIN_IP", default="30/min") or None,
+        "login_email": config("THROTTLE_LOGIN_EMAIL", default="10/min") or None,
+        "register_ip": config("THROTTLE_REGISTER_IP", default="20/hour") or None,
+        "register_email": config("THROTTLE_REGISTER_EMAIL", default="5/hour") or None,
+    },
+    # Trusted proxies in front of the app; the client IP is taken from
+    # X-Forwarded-For this many hops back. 0 ignores the header (clients can
+    # forge it) and uses REMOTE_ADDR. Edge mode sets 1 for the ingress.
+    "NUM_PROXIES": config("NUM_PROXIES", default=0, cast=int),
 }
 
 SIMPLE_JWT = {
@@ -154,6 +208,7 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": False,
+    # last_login is written behind by api.activity instead
     "UPDATE_LAST_LOGIN": False,
     "ALGORITHM": "HS256",
     "SIGNING_KEY": SECRET_KEY,
@@ -163,6 +218,94 @@ SIMPLE_JWT = {
     "JTI_CLAIM": "jti",
 }
 
+# Server-Timing instrumentation (api.middleware.ServerTimingMiddleware).
+# SERVER_TIMING collects phase timings and logs them on "api.timing";
+# SERVER_TIMING_HEADER also exposes them to clients.
+SERVER_TIMING = config("SERVER_TIMING", default=False, cast=bool)
+SERVER_TIMING_HEADER = config("SERVER_TIMING_HEADER", default=DEBUG, cast=bool)
+
+# Metrics (api.metrics, exposed at /api/metrics). METRICS_DIR enables the
+# per-worker mmap store for pre-fork servers (the production image sets it
+# and scripts/docker-entrypoint.sh clears it on start).
+# The endpoint is disabled until METRICS_TOKEN is set.
+METRICS_DIR = config("METRICS_DIR", default="")
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
+# Batch endpoint (api.views.batch): at most BATCH_MAX_REQUESTS sub-requests
+# per batch; consecutive reads run on up to BATCH_MAX_WORKERS threads (each
+# holding its own DB connection), 1 runs everything in order.
+BATCH_MAX_REQUESTS = config("BATCH_MAX_REQUESTS", default=20, cast=int)
+BATCH_MAX_WORKERS = config("BATCH_MAX_WORKERS", default=4, cast=int)
+
+# Health probes (api.health): /api/health/ready pings the database for at
+# most HEALTH_READY_TIMEOUT seconds and caches the result per process for
+# HEALTH_READY_CACHE_SECONDS.
+HEALTH_READY_TIMEOUT = config("HEALTH_READY_TIMEOUT", default=1.0, cast=float)
+HEALTH_READY_CACHE_SECONDS = config(
+    "HEALTH_READY_CACHE_SECONDS", default=1.0, cast=float
+)
+
+# Write-behind last_login / last_seen tracking (api.activity). Buffered
+# timestamps are flushed every ACTIVITY_FLUSH_INTERVAL seconds (0 disables
+# the background flusher), sooner once ACTIVITY_MAX_PENDING users are
+# buffered, and at process exit.
+ACTIVITY_TRACKING = config("ACTIVITY_TRACKING", default=True, cast=bool)
+ACTIVITY_FLUSH_INTERVAL = config("ACTIVITY_FLUSH_INTERVAL", default=10.0, cast=float)
+ACTIVITY_MAX_PENDING = config("ACTIVITY_MAX_PENDING", default=10_000, cast=int)
+
+# Auth audit log (api.audit). Events are queued in-process and bulk-inserted
+# by a background writer at most AUDIT_FLUSH_INTERVAL seconds later; once
+# AUDIT_QUEUE_SIZE events are waiting, new ones are dropped and counted.
+# `manage.py purge_audit_log` deletes events older than AUDIT_RETENTION_DAYS.
+AUDIT_LOG = config("AUDIT_LOG", default=True, cast=bool)
+AUDIT_QUEUE_SIZE = config("AUDIT_QUEUE_SIZE", default=10_000, cast=int)
+AUDIT_BATCH_SIZE = config("AUDIT_BATCH_SIZE", default=500, cast=int)
+AUDIT_FLUSH_INTERVAL = config("AUDIT_FLUSH_INTERVAL", default=1.0, cast=float)
+AUDIT_RETENTION_DAYS = config("AUDIT_RETENTION_DAYS", default=90, cast=int)
+
+# Concurrent identical search_users queries share one DB query per worker
+# (api.singleflight). SEARCH_COALESCE_ACROSS_WORKERS extends this across
+# workers through a cache lock held for at most SEARCH_COALESCE_LOCK_TIMEOUT
+# seconds; it needs a shared CACHE_URL.
+SEARCH_COALESCE_ACROSS_WORKERS = config(
+    "SEARCH_COALESCE_ACROSS_WORKERS", default=False, cast=bool
+)
+SEARCH_COALESCE_LOCK_TIMEOUT = config(
+    "SEARCH_COALESCE_LOCK_TIMEOUT", default=2.0, cast=float
+)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "api": {
+            "handlers": ["console"],
+            "level": config("API_LOG_LEVEL", default="INFO"),
+        },
+    },
+}
+
+# Response compression (api.middleware.CompressionMiddleware). Brotli is used
+# when the optional `brotli` package is installed, gzip otherwise. text/html
+# is deliberately absent: admin pages embed CSRF tokens (BREACH).
+COMPRESSION_MIN_SIZE = config("COMPRESSION_MIN_SIZE", default=1024, cast=int)
+COMPRESSION_CONTENT_TYPES = config(
+    "COMPRESSION_CONTENT_TYPES",
+    default="application/json,application/x-ndjson,text/csv,text/plain",
+    cast=lambda v: [s.strip().lower() for s in v.split(",")],
+)
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+# Streaming responses are flushed to the client once this many uncompressed
+# bytes have been fed in. Flushing every chunk pads the output and defeats
+# compression for small chunks such as NDJSON rows.
+COMPRESSION_STREAM_FLUSH_SIZE = config(
+    "COMPRESSION_STREAM_FLUSH_SIZE", default=16384, cast=int
+)
+
 CORS_ALLOWED_ORIGINS = config(
     "CORS_ALLOWED_ORIGINS",
     default="http://localhost:3000,http://localhost:3001,http://127.0.0.1:3000,http://127.0.0.1:3001",
@@ -177,3 +320,6 @@ CSRF_TRUSTED_ORIGINS = config(
 
 
 AUTH_USER_MODEL = "api.CustomUser"
+
+# ModelBackend with per-user permission sets kept in the cache (api.backends)
+AUTHENTICATION_BACKENDS = ["api.backends.CachedModelBackend"]
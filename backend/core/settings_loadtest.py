@@ -0,0 +1,19 @@
+"""
+Django settings for a backend under load test (python -m loadtest).
+
+Extends core.settings with the rate limits off. The harness drives every
+virtual user from one IP and logs in repeatedly as the same accounts, so
+the default limits (login_email 10/min, register_ip 20/hour) would answer
+most of a run with 429s and the report would measure the throttle instead
+of the endpoints. Everything else, the password hasher included, stays as
+in production so the numbers mean something.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,  # noqa: F405
+    "DEFAULT_THROTTLE_RATES": {
+        scope: None for scope in REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]  # noqa: F405
+    },
+}
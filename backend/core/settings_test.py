@@ -0,0 +1,27 @@
+"""
+Django settings for the test suite.
+
+Extends core.settings with a cheap password hasher: every create_user in
+the suite would otherwise pay the full production PBKDF2 cost.
+
+Write-behind activity tracking and the audit log are off: their background
+writers use their own connection, outside each test's transaction. Tests
+that cover them enable them and flush explicitly.
+
+Rate limits are off too: their counters live in the cache, which outlives
+each test. tests/test_throttling.py sets its own rates.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+ACTIVITY_TRACKING = False
+AUDIT_LOG = False
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,  # noqa: F405
+    "DEFAULT_THROTTLE_RATES": {
+        scope: None for scope in REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]  # noqa: F405
+    },
+}
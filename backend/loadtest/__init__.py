@@ -0,0 +1,5 @@
+"""
+Asyncio load test harness for the auth API.
+
+See ``python -m loadtest --help``.
+"""
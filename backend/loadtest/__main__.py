@@ -0,0 +1,76 @@
+"""
+Command-line entry point for the load test harness.
+
+Usage (from backend/):
+    python -m loadtest --target http://localhost:8000 \\
+        --scenario login_storm profile_polling --concurrency 50 --ramp 10 \\
+        --duration 60 --json loadtest-report.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from .runner import format_text, run
+from .scenarios import SCENARIOS
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m loadtest", description="Load test the auth API."
+    )
+    parser.add_argument("--target", default="http://localhost:8000")
+    parser.add_argument(
+        "--scenario",
+        nargs="+",
+        choices=sorted(SCENARIOS),
+        default=sorted(SCENARIOS),
+        help="Scenarios to run, one after another (default: all).",
+    )
+    parser.add_argument("--concurrency", type=int, default=10, help="Virtual users.")
+    parser.add_argument(
+        "--ramp", type=float, default=5.0, help="Seconds over which users start."
+    )
+    parser.add_argument(
+        "--duration", type=float, default=30.0, help="Seconds per scenario."
+    )
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=0.0,
+        help="Seconds each user waits between iterations.",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=10.0, help="Per-request timeout."
+    )
+    parser.add_argument("--json", metavar="PATH", help="Also write reports as JSON.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    reports = []
+    for name in args.scenario:
+        report = asyncio.run(
+            run(
+                SCENARIOS[name](),
+                target=args.target,
+                concurrency=args.concurrency,
+                ramp=args.ramp,
+                duration=args.duration,
+                think_time=args.think_time,
+                timeout=args.timeout,
+            )
+        )
+        reports.append(report)
+        print(format_text(report), end="\n\n")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+Load test runner: virtual users, request recording and reporting.
+"""
+
+import asyncio
+import json
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+# Error key for 429 responses. They are counted as requests but kept out of
+# the latency percentiles: a rejection by the rate limiter skips the work the
+# endpoint exists to do, so its latency would flatter the results.
+THROTTLED = "throttled"
+
+
+class Stats:
+    """Latencies and outcomes per request name."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(Counter)
+
+    def record(self, name, latency, error=None):
+        self.latencies[name].append(latency)
+        if error is not None:
+            self.errors[name][error] += 1
+
+    def record_exception(self, name, exc):
+        self.errors[name][type(exc).__name__] += 1
+
+    def record_throttled(self, name):
+        self.errors[name][THROTTLED] += 1
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies, errors, elapsed):
+    """Summary dict for one set of latencies (seconds) and error counts."""
+    ordered = sorted(latencies)
+    requests = len(ordered) + sum(
+        count for error, count in errors.items() if not error.isdigit()
+    )
+
+    def ms(value):
+        return None if value is None else round(value * 1000, 2)
+
+    return {
+        "requests": requests,
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "errors": dict(errors),
+        "error_count": sum(errors.values()),
+        "latency_ms": {
+            "p50": ms(percentile(ordered, 50)),
+            "p95": ms(percentile(ordered, 95)),
+            "p99": ms(percentile(ordered, 99)),
+            "max": ms(ordered[-1] if ordered else None),
+            "mean": ms(sum(ordered) / len(ordered) if ordered else None),
+        },
+    }
+
+
+class Session:
+    """A virtual user's view of the target: an HTTP client plus recording."""
+
+    def __init__(self, client, stats, deadline, think_time, index, run_id):
+        self.client = client
+        self.stats = stats
+        self.deadline = deadline
+        self.think_time = think_time
+        self.index = index
+        self.run_id = run_id
+        self.headers = {}
+
+    @property
+    def running(self):
+        return time.monotonic() < self.deadline
+
+    async def request(self, name, method, path, record=True, **kwargs):
+        """
+        Send a request and record its latency under ``name``.
+
+        Responses with status >= 400 are recorded as errors keyed by status,
+        except 429s, which are counted as THROTTLED without a latency;
+        transport failures are recorded by exception type and return None.
+        """
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(
+                method, path, headers=headers, **kwargs
+            )
+        except httpx.HTTPError as exc:
+            if record:
+                self.stats.record_exception(name, exc)
+            return None
+        if not record:
+            return response
+        if response.status_code == 429:
+            self.stats.record_throttled(name)
+        else:
+            error = str(response.status_code) if response.status_code >= 400 else None
+            self.stats.record(name, time.perf_counter() - start, error)
+        return response
+
+    async def think(self, seconds=None):
+        await asyncio.sleep(self.think_time if seconds is None else seconds)
+
+
+async def _virtual_user(scenario, session, start_delay):
+    await asyncio.sleep(start_delay)
+    if not session.running:
+        return
+    try:
+        state = await scenario.setup(session)
+    except Exception as exc:  # setup failures are reported, not fatal
+        session.stats.record_exception("setup", exc)
+        return
+    while session.running:
+        await scenario.step(session, state)
+
+
+async def run(scenario, target, concurrency, ramp, duration, think_time, timeout):
+    """
+    Run ``scenario`` against ``target`` and return its report dict.
+
+    Virtual users start evenly over ``ramp`` seconds; the run stops
+    ``duration`` seconds after the first user starts.
+    """
+    stats = Stats()
+    run_id = f"{int(time.time())}"
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    started = time.monotonic()
+    deadline = started + duration
+
+    async with httpx.AsyncClient(
+        base_url=target, timeout=timeout, limits=limits
+    ) as client:
+        await asyncio.gather(
+            *(
+                _virtual_user(
+                    scenario,
+                    Session(client, stats, deadline, think_time, index, run_id),
+                    ramp * index / concurrency,
+                )
+                for index in range(concurrency)
+            )
+        )
+    elapsed = time.monotonic() - started
+
+    all_latencies = [value for values in stats.latencies.values() for value in values]
+    all_errors = Counter()
+    for errors in stats.errors.values():
+        all_errors.update(errors)
+
+    return {
+        "scenario": scenario.name,
+        "target": target,
+        "concurrency": concurrency,
+        "ramp_s": ramp,
+        "duration_s": round(elapsed, 2),
+        **summarize(all_latencies, all_errors, elapsed),
+        "endpoints": {
+            name: summarize(
+                stats.latencies.get(name, []), stats.errors.get(name, {}), elapsed
+            )
+            for name in sorted(set(stats.latencies) | set(stats.errors))
+        },
+    }
+
+
+def format_text(report):
+    """Render a report dict as a human-readable table."""
+    lines = [
+        f"scenario {report['scenario']} against {report['target']}",
+        f"  concurrency {report['concurrency']}, ramp {report['ramp_s']}s, "
+        f"ran {report['duration_s']}s",
+        "",
+        f"  {'endpoint':<20} {'reqs':>7} {'rps':>8} {'p50':>8} {'p95':>8} "
+        f"{'p99':>8} {'errors':>7}",
+    ]
+    rows = list(report["endpoints"].items()) + [("TOTAL", report)]
+    for name, summary in rows:
+        latency = summary["latency_ms"]
+        lines.append(
+            f"  {name:<20} {summary['requests']:>7} {summary['throughput_rps']:>8} "
+            f"{_fmt_ms(latency['p50'])} {_fmt_ms(latency['p95'])} "
+            f"{_fmt_ms(latency['p99'])} {summary['error_count']:>7}"
+        )
+    if report["errors"]:
+        lines.append("")
+        lines.append("  errors: " + json.dumps(report["errors"], sort_keys=True))
+    if report["errors"].get(THROTTLED):
+        lines.append(
+            "  warning: the target rate limited this run; serve it with "
+            "DJANGO_SETTINGS_MODULE=core.settings_loadtest (see loadtest/README.md)"
+        )
+    return "\n".join(lines)
+
+
+def _fmt_ms(value):
+    return f"{'-':>8}" if value is None else f"{value:>6.1f}ms"
@@ -0,0 +1,128 @@
+"""
+Load test scenarios for the auth API.
+
+Each scenario has an async ``setup(session)`` run once per virtual user
+(unrecorded unless noted) and an async ``step(session, state)`` looped until
+the run ends. Accounts created by the scenarios use the
+``@loadtest.example`` domain so they are easy to find and delete afterwards.
+"""
+
+PASSWORD = "LoadTest-Passw0rd"
+
+
+def _email(session, suffix=""):
+    return f"lt-{session.run_id}-{session.index}{suffix}@loadtest.example"
+
+
+async def _register_and_login(session, email):
+    await session.request(
+        "register",
+        "POST",
+        "/api/auth/register/",
+        record=False,
+        json={"email": email, "password": PASSWORD, "password_confirm": PASSWORD},
+    )
+    response = await session.request(
+        "login",
+        "POST",
+        "/api/auth/login/",
+        record=False,
+        json={"email": email, "password": PASSWORD},
+    )
+    if response is None or response.status_code != 200:
+        status = None if response is None else response.status_code
+        raise RuntimeError(f"setup login failed with status {status}")
+    return response.json()["access"]
+
+
+class RegisterBurst:
+    """Every iteration registers a brand-new account."""
+
+    name = "register_burst"
+
+    async def setup(self, session):
+        return {"counter": 0}
+
+    async def step(self, session, state):
+        state["counter"] += 1
+        email = _email(session, f"-{state['counter']}")
+        await session.request(
+            "register",
+            "POST",
+            "/api/auth/register/",
+            json={"email": email, "password": PASSWORD, "password_confirm": PASSWORD},
+        )
+        await session.think()
+
+
+class LoginStorm:
+    """Every virtual user logs in to its own account repeatedly."""
+
+    name = "login_storm"
+
+    async def setup(self, session):
+        email = _email(session)
+        await _register_and_login(session, email)
+        return {"email": email}
+
+    async def step(self, session, state):
+        await session.request(
+            "login",
+            "POST",
+            "/api/auth/login/",
+            json={"email": state["email"], "password": PASSWORD},
+        )
+        await session.think()
+
+
+class ProfilePolling:
+    """Authenticated dashboard polling of the profile with If-None-Match."""
+
+    name = "profile_polling"
+
+    async def setup(self, session):
+        access = await _register_and_login(session, _email(session))
+        session.headers["Authorization"] = f"Bearer {access}"
+        return {"etag": None}
+
+    async def step(self, session, state):
+        headers = {"If-None-Match": state["etag"]} if state["etag"] else {}
+        response = await session.request(
+            "profile", "GET", "/api/auth/profile/", headers=headers
+        )
+        if response is not None and response.headers.get("ETag"):
+            state["etag"] = response.headers["ETag"]
+        await session.think()
+
+
+class SearchKeystrokes:
+    """Search-as-you-type: one search-users call per keystroke of an email."""
+
+    name = "search_keystrokes"
+
+    keystroke_interval = 0.1
+
+    async def setup(self, session):
+        access = await _register_and_login(session, _email(session))
+        session.headers["Authorization"] = f"Bearer {access}"
+        return {"term": f"lt-{session.run_id}-{session.index}"}
+
+    async def step(self, session, state):
+        term = state["term"]
+        for length in range(2, len(term) + 1):
+            if not session.running:
+                return
+            await session.request(
+                "search_users",
+                "GET",
+                "/api/auth/search-users/",
+                params={"q": term[:length]},
+            )
+            await session.think(self.keystroke_interval)
+        await session.think()
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (RegisterBurst, LoginStorm, ProfilePolling, SearchKeystrokes)
+}
@@ -1,16 +1,56 @@
 #!/bin/sh
 set -e
 
-attempt=1
-max_attempts=30
-until python manage.py migrate --noinput; do
-    if [ "$attempt" -ge "$max_attempts" ]; then
-        echo "Database migration failed after $max_attempts attempts."
-        exit 1
-    fi
-    echo "Database not ready yet (attempt $attempt/$max_attempts), retrying in 2s..."
-    attempt=$((attempt + 1))
-    sleep 2
-done
+# Milliseconds since the entrypoint started
+started=$(date +%s%N)
+elapsed_ms() {
+    echo $(( ($(date +%s%N) - started) / 1000000 ))
+}
+
+# Raw TCP wait with backoff; does not boot Django
+python scripts/wait_for_db.py
 
+# `migrate --check` exits 0 only when every migration is applied, so a
+# container restart on a current schema skips migrate (and its post-migrate
+# permission/content-type sync). Any failure falls through to a real migrate.
+if python manage.py migrate --check --skip-checks >/dev/null 2>&1; then
+    echo "Migrations up to date (checked at $(elapsed_ms)ms), skipping migrate."
+else
+    # An open port does not mean the server accepts queries yet (MySQL
+    # listens before init scripts finish), so keep the full ~60s budget
+    attempt=1
+    max_attempts=30
+    until python manage.py migrate --noinput; do
+        if [ "$attempt" -ge "$max_attempts" ]; then
+            echo "Database migration failed after $max_attempts attempts."
+            exit 1
+        fi
+        echo "Migration failed (attempt $attempt/$max_attempts), retrying in 2s..."
+        attempt=$((attempt + 1))
+        sleep 2
+    done
+    echo "Migrations applied at $(elapsed_ms)ms."
+fi
+
+echo "Entrypoint finished in $(elapsed_ms)ms, starting server."
+# The production image sets APP_SERVER=gunicorn; the dev image keeps the
+# autoreloading development server
+if [ "${APP_SERVER:-runserver}" = "gunicorn" ]; then
+    # Exported so core.settings can refuse a per-process cache with several
+    # workers
+    export WEB_CONCURRENCY="${WEB_CONCURRENCY:-3}"
+    # Per-pid metric files from a previous run (docker restart keeps /tmp)
+    # would otherwise be summed into this run's totals
+    if [ -n "${METRICS_DIR:-}" ]; then
+        rm -rf "$METRICS_DIR"
+    fi
+    # Threaded workers serve concurrent requests in one process, which is
+    # what lets api.singleflight coalesce identical searches
+    exec gunicorn core.wsgi:application \
+        --bind 0.0.0.0:8000 \
+        --workers "$WEB_CONCURRENCY" \
+        --worker-class gthread \
+        --threads "${GUNICORN_THREADS:-4}" \
+        --access-logfile -
+fi
 exec python manage.py runserver 0.0.0.0:8000
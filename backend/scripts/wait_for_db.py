@@ -0,0 +1,57 @@
+"""
+Wait until the database in DATABASE_URL accepts TCP connections.
+
+Used by docker-entrypoint.sh before anything boots Django. It only opens a
+socket, so each attempt costs milliseconds instead of a full `manage.py`
+start. Retries back off from 0.1s to 2s until DB_WAIT_TIMEOUT seconds
+(default 60) have passed. SQLite URLs return immediately.
+
+Both variables are read with python-decouple, like core/settings.py, so a
+DATABASE_URL set only in backend/.env is honoured.
+
+Exit status: 0 when reachable, 1 on timeout.
+"""
+
+import socket
+import sys
+import time
+from urllib.parse import urlparse
+
+from decouple import config
+
+DEFAULT_PORTS = {"mysql": 3306, "mysql2": 3306, "postgres": 5432, "postgresql": 5432}
+
+
+def main():
+    url = urlparse(config("DATABASE_URL", default="sqlite:///db.sqlite3"))
+    if url.scheme not in DEFAULT_PORTS:
+        return 0
+    host, port = url.hostname or "localhost", url.port or DEFAULT_PORTS[url.scheme]
+    timeout = config("DB_WAIT_TIMEOUT", default=60.0, cast=float)
+
+    start = time.monotonic()
+    delay, attempts = 0.1, 0
+    while True:
+        attempts += 1
+        try:
+            with socket.create_connection((host, port), timeout=2):
+                pass
+        except OSError as exc:
+            elapsed = time.monotonic() - start
+            if elapsed + delay > timeout:
+                print(
+                    f"Database {host}:{port} unreachable after {elapsed:.1f}s "
+                    f"({attempts} attempts): {exc}",
+                    file=sys.stderr,
+                )
+                return 1
+            time.sleep(delay)
+            delay = min(delay * 2, 2.0)
+        else:
+            elapsed = time.monotonic() - start
+            print(f"Database {host}:{port} reachable after {elapsed:.2f}s")
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,16 +2,25 @@
 Pytest configuration and shared fixtures for authentication tests.
 """
 
+import json
 import os
+from contextlib import contextmanager
 
 import django
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from playwright.async_api import Browser, BrowserContext, async_playwright
 
+# Private helpers used by django_db_setup below; their signatures change
+# between releases, so keep requirements.txt pinned to the version tested.
+from pytest_django.fixtures import _disable_migrations, _get_databases_for_setup
+
 # Setup Django
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings_test")
 django.setup()
 
 User = get_user_model()
@@ -30,12 +39,83 @@ FRONTEND_HOST = os.getenv("FRONTEND_TEST_HOST", "http://localhost:3000")
 # ============================================================================
 
 
+@pytest.fixture(scope="session")
+def django_db_setup(
+    request,
+    django_test_environment,
+    django_db_blocker,
+    django_db_use_migrations,
+    django_db_keepdb,
+    django_db_createdb,
+    django_db_modify_db_settings,
+):
+    """
+    Create the test databases, cloning a migrated snapshot when one exists.
+
+    Mirrors pytest-django's fixture; see tests/db_snapshot.py for how
+    snapshots are keyed and cloned. --reuse-db and --nomigrations keep their
+    usual behaviour and bypass snapshots.
+    """
+    from django.test.utils import setup_databases, teardown_databases
+
+    from tests import db_snapshot
+
+    keepdb = django_db_keepdb and not django_db_createdb
+    if not django_db_use_migrations:
+        _disable_migrations()
+
+    aliases, serialized_aliases = _get_databases_for_setup(request.session.items)
+    verbosity = request.config.option.verbose
+
+    with django_db_blocker.unblock():
+        snapshots = None
+        if db_snapshot.SNAPSHOTS_ENABLED and django_db_use_migrations and not keepdb:
+            snapshots = db_snapshot.snapshots(aliases)
+        restored = bool(snapshots) and all(snapshot.restore() for snapshot in snapshots)
+        try:
+            db_cfg = setup_databases(
+                verbosity=verbosity,
+                interactive=False,
+                aliases=aliases,
+                serialized_aliases=serialized_aliases,
+                keepdb=keepdb or restored,
+            )
+        finally:
+            for snapshot in snapshots or ():
+                snapshot.release()
+        if snapshots and not restored:
+            for snapshot in snapshots:
+                snapshot.save()
+
+    yield
+
+    if not django_db_keepdb:
+        with django_db_blocker.unblock():
+            teardown_databases(db_cfg, verbosity=verbosity)
+
+
 @pytest.fixture
 def db_reset(db):
-    """Ensure a clean database for each test."""
-    User.objects.all().delete()
-    yield db
-    User.objects.all().delete()
+    """
+    Ensure a clean database for each test.
+
+    pytest-django's ``db`` fixture wraps every test in a transaction that is
+    rolled back afterwards, so no explicit cleanup is needed.
+    """
+    return db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Empty the cache around every test.
+
+    The locmem cache lives in the test process, so cached users, permissions
+    and throttle counters would otherwise leak from one test into the next.
+    """
+    cache.clear()
+    yield
+    cache.clear()
 
 
 # ============================================================================
@@ -213,9 +293,7 @@ def pytest_collection_modifyitems(config, items):
 
     # Skip E2E tests if servers not available
     if not servers_available:
-        skip_reason = (
-            "E2E servers not available (run: make local-run-backend && make local-run-frontend)"
-        )
+        skip_reason = "E2E servers not available (run: make local-run-backend && make local-run-frontend)"
         if not django_available:
             skip_reason += f"\n  - Django not running on {DJANGO_HOST}"
         if not frontend_available:
@@ -268,6 +346,120 @@ def login_response(http_client, test_user):
     return response.json() if response.status_code == 200 else None
 
 
+# ============================================================================
+# Query Budget Fixtures
+# ============================================================================
+
+# Maximum queries per endpoint, authentication included. Lower a budget when
+# an optimisation lands; raising one needs a justification in review.
+QUERY_BUDGETS = {
+    # The serializer's unique-email check plus the INSERT
+    "register": 2,
+    "login": 1,
+    "profile_get": 1,
+    "profile_put": 3,
+    # A PUT that leaves the email as is skips the uniqueness check and write
+    "profile_put_unchanged": 1,
+    # Indexed prefix lookup, plus a substring top-up when it finds < 10 rows
+    "search_users": 3,
+    # Authentication plus one in_bulk query for ids missing from the cache
+    "users_lookup": 2,
+}
+
+_query_budget_results = []
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--query-budget-report",
+        metavar="PATH",
+        help="Write per-endpoint query budgets and measured counts as JSON.",
+    )
+
+
+@pytest.fixture
+def query_budget(request):
+    """
+    Context manager enforcing the query budget of the marked endpoint.
+
+    Usage:
+        @pytest.mark.query_budget("login")
+        def test_login(query_budget, http_client):
+            with query_budget:
+                http_client.post("/api/auth/login/", ...)
+
+    Fails with the captured SQL when the block runs more queries than
+    QUERY_BUDGETS allows (or the marker's explicit second argument).
+    """
+    marker = request.node.get_closest_marker("query_budget")
+    if marker is None:
+        pytest.fail("query_budget fixture requires @pytest.mark.query_budget")
+    endpoint = marker.args[0]
+    budget = marker.args[1] if len(marker.args) > 1 else QUERY_BUDGETS[endpoint]
+
+    @contextmanager
+    def _measure():
+        with CaptureQueriesContext(connection) as captured:
+            yield captured
+        count = len(captured.captured_queries)
+        _query_budget_results.append(
+            {
+                "test": request.node.nodeid,
+                "endpoint": endpoint,
+                "budget": budget,
+                "queries": count,
+            }
+        )
+        if count > budget:
+            sql = "\n".join(
+                f"  {i}. {query['sql']}"
+                for i, query in enumerate(captured.captured_queries, 1)
+            )
+            pytest.fail(
+                f"{endpoint} ran {count} queries, budget is {budget}:\n{sql}",
+                pytrace=False,
+            )
+
+    return _measure()
+
+
+def pytest_sessionfinish(session):
+    """Hand this xdist worker's query budget results to the controller."""
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["query_budget_results"] = json.dumps(_query_budget_results)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect query budget results from a finished xdist worker."""
+    results = getattr(node, "workeroutput", {}).get("query_budget_results")
+    if results:
+        _query_budget_results.extend(json.loads(results))
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Print measured query counts and optionally export them as JSON."""
+    if not _query_budget_results:
+        return
+
+    terminalreporter.section("query budgets")
+    for result in _query_budget_results:
+        terminalreporter.write_line(
+            f"{result['endpoint']:<21} {result['queries']:>3} / {result['budget']:<3}"
+            f" {result['test']}"
+        )
+
+    report_path = config.getoption("--query-budget-report")
+    if report_path:
+        with open(report_path, "w") as report:
+            json.dump(
+                {"budgets": QUERY_BUDGETS, "results": _query_budget_results},
+                report,
+                indent=2,
+            )
+
+
 # ============================================================================
 # Test Utilities
 # ============================================================================
@@ -0,0 +1,222 @@
+"""
+Snapshot-based test database creation.
+
+Running every migration to build the test database dominates short test
+sessions (especially on MySQL). Instead, the first session migrates as usual
+and stores a snapshot of the result, keyed by a hash of every installed
+app's migration files and the Django version. Later sessions, and every
+pytest-xdist worker, clone the snapshot into their test database; Django's
+create_test_db then runs with keepdb=True, so migrate finds nothing to apply.
+
+Cloning per backend:
+- PostgreSQL: CREATE DATABASE ... TEMPLATE <snapshot database>
+- SQLite: file copy (or the sqlite3 backup API for in-memory test DBs)
+- MySQL: replay of a dumped schema (SHOW CREATE TABLE) plus django_migrations
+
+Snapshots live in TEST_DB_SNAPSHOT_DIR (default backend/.test-db-snapshots);
+PostgreSQL snapshots are databases named ``snapshot_<NAME>_<key>``. Set
+TEST_DB_SNAPSHOTS=0 to always migrate from scratch.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import shutil
+import sqlite3
+from pathlib import Path
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+SNAPSHOTS_ENABLED = os.environ.get("TEST_DB_SNAPSHOTS", "1") != "0"
+SNAPSHOT_DIR = Path(
+    os.environ.get(
+        "TEST_DB_SNAPSHOT_DIR", Path(settings.BASE_DIR) / ".test-db-snapshots"
+    )
+)
+
+
+def migrations_key():
+    """Hash of the Django version and every installed app's migration files."""
+    digest = hashlib.sha256(django.get_version().encode())
+    for app_config in sorted(apps.get_app_configs(), key=lambda app: app.label):
+        spec = importlib.util.find_spec(f"{app_config.name}.migrations")
+        if spec is None or not spec.submodule_search_locations:
+            continue
+        for location in spec.submodule_search_locations:
+            for path in sorted(Path(location).glob("*.py")):
+                digest.update(f"{app_config.label}/{path.name}".encode())
+                digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+class SQLiteSnapshot:
+    def __init__(self, connection, key):
+        self.connection = connection
+        self.path = SNAPSHOT_DIR / f"sqlite-{connection.alias}-{key}.sqlite3"
+        self._holder = None
+
+    def restore(self):
+        if not self.path.exists():
+            return False
+        creation = self.connection.creation
+        test_name = creation._get_test_db_name()
+        if creation.is_in_memory_db(test_name):
+            # The shared-cache memory DB lives while a connection holds it;
+            # keep one open until Django has connected (see release()).
+            self._holder = sqlite3.connect(test_name, uri=True)
+            with sqlite3.connect(self.path) as snapshot:
+                snapshot.backup(self._holder)
+        else:
+            shutil.copyfile(self.path, test_name)
+        return True
+
+    def release(self):
+        if self._holder is not None:
+            self._holder.close()
+            self._holder = None
+
+    def save(self):
+        SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        self.connection.ensure_connection()
+        with sqlite3.connect(tmp_path) as target:
+            self.connection.connection.backup(target)
+        target.close()
+        os.replace(tmp_path, self.path)
+        _prune(self.path, f"sqlite-{self.connection.alias}-*.sqlite3")
+
+
+class PostgreSQLSnapshot:
+    def __init__(self, connection, key):
+        self.connection = connection
+        self.name = f"snapshot_{connection.settings_dict['NAME']}_{key}"[:63]
+        self.prefix = f"snapshot_{connection.settings_dict['NAME']}_"
+
+    def restore(self):
+        quote = self.connection.ops.quote_name
+        test_name = self.connection.creation._get_test_db_name()
+        with self.connection._nodb_cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", [self.name])
+            if cursor.fetchone() is None:
+                return False
+            cursor.execute(f"DROP DATABASE IF EXISTS {quote(test_name)}")
+            cursor.execute(
+                f"CREATE DATABASE {quote(test_name)} TEMPLATE {quote(self.name)}"
+            )
+        return True
+
+    def release(self):
+        pass
+
+    def save(self):
+        quote = self.connection.ops.quote_name
+        test_name = self.connection.settings_dict["NAME"]
+        # A template database must have no other sessions
+        self.connection.close()
+        with self.connection._nodb_cursor() as cursor:
+            try:
+                cursor.execute(
+                    f"CREATE DATABASE {quote(self.name)} TEMPLATE {quote(test_name)}"
+                )
+            except DatabaseError:
+                return  # another xdist worker created it first
+            cursor.execute(
+                "SELECT datname FROM pg_database WHERE datname LIKE %s "
+                "AND datname <> %s",
+                [self.prefix + "%", self.name],
+            )
+            for (stale,) in cursor.fetchall():
+                try:
+                    cursor.execute(f"DROP DATABASE {quote(stale)}")
+                except DatabaseError:
+                    pass
+
+
+class MySQLSnapshot:
+    _auto_increment_re = re.compile(r" AUTO_INCREMENT=\d+")
+
+    def __init__(self, connection, key):
+        self.connection = connection
+        self.path = SNAPSHOT_DIR / (
+            f"mysql-{connection.settings_dict['NAME']}-{key}.json"
+        )
+        self.pattern = f"mysql-{connection.settings_dict['NAME']}-*.json"
+
+    def restore(self):
+        if not self.path.exists():
+            return False
+        statements = json.loads(self.path.read_text())
+        creation = self.connection.creation
+        quote = self.connection.ops.quote_name
+        test_name = creation._get_test_db_name()
+        with self.connection._nodb_cursor() as cursor:
+            cursor.execute(f"DROP DATABASE IF EXISTS {quote(test_name)}")
+            cursor.execute(
+                f"CREATE DATABASE {quote(test_name)} "
+                f"{creation.sql_table_creation_suffix()}"
+            )
+            cursor.execute(f"USE {quote(test_name)}")
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+            for sql, params in statements:
+                cursor.execute(sql, params or None)
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        return True
+
+    def release(self):
+        pass
+
+    def save(self):
+        quote = self.connection.ops.quote_name
+        statements = []
+        with self.connection.cursor() as cursor:
+            cursor.execute("SHOW FULL TABLES WHERE Table_type = 'BASE TABLE'")
+            for table, _ in cursor.fetchall():
+                cursor.execute(f"SHOW CREATE TABLE {quote(table)}")
+                create_sql = cursor.fetchone()[1]
+                statements.append([self._auto_increment_re.sub("", create_sql), []])
+            cursor.execute("SELECT app, name, applied FROM django_migrations")
+            for app, name, applied in cursor.fetchall():
+                statements.append(
+                    [
+                        "INSERT INTO django_migrations (app, name, applied) "
+                        "VALUES (%s, %s, %s)",
+                        [app, name, applied.strftime("%Y-%m-%d %H:%M:%S.%f")],
+                    ]
+                )
+        SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(statements))
+        os.replace(tmp_path, self.path)
+        _prune(self.path, self.pattern)
+
+
+SNAPSHOT_BACKENDS = {
+    "sqlite": SQLiteSnapshot,
+    "postgresql": PostgreSQLSnapshot,
+    "mysql": MySQLSnapshot,
+}
+
+
+def _prune(current, pattern):
+    """Delete snapshot files for other migration states."""
+    for path in current.parent.glob(pattern):
+        if path != current:
+            path.unlink(missing_ok=True)
+
+
+def snapshots(aliases):
+    """One snapshot handler per test database, or None if any is unsupported."""
+    key = migrations_key()
+    handlers = []
+    for alias in sorted(aliases):
+        connection = connections[alias]
+        backend = SNAPSHOT_BACKENDS.get(connection.vendor)
+        if backend is None:
+            return None
+        handlers.append(backend(connection, key))
+    return handlers
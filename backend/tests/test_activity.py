@@ -0,0 +1,117 @@
+"""Tests for write-behind last_login / last_seen tracking."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.activity import ACTIVITY
+
+User = get_user_model()
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def activity(settings):
+    settings.ACTIVITY_TRACKING = True
+    settings.ACTIVITY_FLUSH_INTERVAL = 0
+    ACTIVITY.reset()
+    yield ACTIVITY
+    ACTIVITY.reset()
+
+
+@pytest.mark.integration
+class TestActivityBuffer:
+    def test_events_coalesce_into_one_batched_update(self, db_reset, activity):
+        users = [
+            User.objects.create_user(email=f"u{i}@example.com", password="x")
+            for i in range(3)
+        ]
+        for minutes in (1, 3, 2):
+            for user in users:
+                activity.record_seen(user.pk, T0 + timedelta(minutes=minutes))
+
+        with CaptureQueriesContext(connection) as queries:
+            assert activity.flush() == 3
+
+        assert len(queries) == 1
+        assert set(User.objects.values_list("last_seen", flat=True)) == {
+            T0 + timedelta(minutes=3)
+        }
+
+    def test_seen_only_flush_keeps_last_login(self, db_reset, activity):
+        user = User.objects.create_user(email="u@example.com", password="x")
+        User.objects.filter(pk=user.pk).update(last_login=T0)
+
+        activity.record_seen(user.pk, T0 + timedelta(hours=1))
+        activity.flush()
+
+        user.refresh_from_db()
+        assert user.last_login == T0
+        assert user.last_seen == T0 + timedelta(hours=1)
+
+    def test_flush_never_moves_timestamps_backwards(self, db_reset, activity):
+        user = User.objects.create_user(email="u@example.com", password="x")
+        activity.record_login(user.pk, T0 + timedelta(hours=2))
+        activity.flush()
+
+        activity.record_login(user.pk, T0)
+        activity.flush()
+
+        user.refresh_from_db()
+        assert user.last_login == T0 + timedelta(hours=2)
+        assert user.last_seen == T0 + timedelta(hours=2)
+
+    def test_flush_does_not_bump_profile_version(self, db_reset, activity):
+        user = User.objects.create_user(email="u@example.com", password="x")
+        activity.record_login(user.pk)
+        activity.flush()
+
+        user.refresh_from_db()
+        assert user.version == 1
+
+    def test_shutdown_flushes_pending_events(self, db_reset, activity):
+        user = User.objects.create_user(email="u@example.com", password="x")
+        activity.record_seen(user.pk, T0)
+
+        activity.shutdown()
+
+        user.refresh_from_db()
+        assert user.last_seen == T0
+
+    def test_disabled_tracking_records_nothing(self, db_reset, activity, settings):
+        settings.ACTIVITY_TRACKING = False
+        activity.record_login(1)
+
+        assert activity.flush() == 0
+
+
+@pytest.mark.auth
+class TestActivityRecording:
+    def test_login_records_last_login_without_a_write(
+        self, db_reset, http_client, test_user, activity, django_assert_num_queries
+    ):
+        with django_assert_num_queries(1):
+            response = http_client.post(
+                "/api/auth/login/",
+                json={"email": "test@example.com", "password": "testpassword123"},
+            )
+        assert response.status_code == 200
+
+        activity.flush()
+        test_user.refresh_from_db()
+        assert test_user.last_login is not None
+        assert test_user.last_seen == test_user.last_login
+
+    def test_authenticated_request_records_last_seen(
+        self, db_reset, authenticated_client, test_user, activity
+    ):
+        authenticated_client.get("/api/auth/profile/")
+        activity.flush()
+
+        test_user.refresh_from_db()
+        assert test_user.last_seen is not None
+        assert test_user.last_login is None
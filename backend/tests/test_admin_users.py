@@ -0,0 +1,116 @@
+"""Tests for the CustomUser admin changelist on large tables."""
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from api import pagination
+from api.pagination import EstimatedCountPaginator
+from api.search import filter_users, find_users
+
+User = get_user_model()
+
+CHANGELIST = "/admin/api/customuser/"
+
+
+@pytest.fixture
+def admin_client(db_reset):
+    User.objects.create_superuser(email="admin@example.com", password="x")
+    client = Client()
+    client.login(username="admin@example.com", password="x")
+    return client
+
+
+@pytest.fixture
+def many_users(db_reset):
+    User.objects.bulk_create(
+        [User(email=f"user{i:03d}@example.com") for i in range(30)]
+        + [User(email=f"someone{i}@user.example.com") for i in range(3)]
+    )
+
+
+def count_queries(queries):
+    return [q["sql"] for q in queries if "COUNT(" in q["sql"].upper()]
+
+
+@pytest.mark.integration
+class TestEstimatedCountPaginator:
+    def test_unfiltered_large_table_uses_estimate(self, many_users, monkeypatch):
+        monkeypatch.setattr(pagination, "estimated_count", lambda *args: 2_000_000)
+
+        with CaptureQueriesContext(connection) as queries:
+            count = EstimatedCountPaginator(User.objects.order_by("pk"), 100).count
+
+        assert count == 2_000_000
+        assert count_queries(queries) == []
+
+    def test_small_or_filtered_tables_are_counted_exactly(
+        self, many_users, monkeypatch
+    ):
+        monkeypatch.setattr(pagination, "estimated_count", lambda *args: 500)
+
+        assert EstimatedCountPaginator(User.objects.order_by("pk"), 10).count == 33
+        queryset = User.objects.filter(email__startswith="user").order_by("pk")
+        assert EstimatedCountPaginator(queryset, 10).count == 30
+
+    def test_exact_count_is_capped(self, many_users, monkeypatch):
+        monkeypatch.setattr(EstimatedCountPaginator, "count_limit", 20)
+
+        assert EstimatedCountPaginator(User.objects.order_by("pk"), 10).count == 20
+
+
+@pytest.mark.integration
+class TestUserSearch:
+    def test_prefix_matches_come_first(self, many_users):
+        emails = [row["email"] for row in find_users("user", limit=33)]
+
+        assert emails[:30] == [f"user{i:03d}@example.com" for i in range(30)]
+        assert set(emails[30:]) == {f"someone{i}@user.example.com" for i in range(3)}
+
+    def test_prefix_uses_the_canonical_column(self, many_users):
+        with CaptureQueriesContext(connection) as queries:
+            emails = [row["email"] for row in find_users("USER00", limit=5)]
+
+        assert emails == [f"user{i:03d}@example.com" for i in range(5)]
+        prefix_sql = queries[0]["sql"]
+        assert '"email_canonical" LIKE' in prefix_sql
+        assert "UPPER" not in prefix_sql
+
+    def test_substring_only_when_prefix_finds_nothing(self, many_users):
+        assert filter_users(User.objects.all(), "user").count() == 30
+        assert filter_users(User.objects.all(), "example").count() == 33
+
+
+@pytest.mark.integration
+class TestCustomUserChangelist:
+    def test_changelist_runs_a_single_bounded_count(self, admin_client, many_users):
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(CHANGELIST)
+
+        assert response.status_code == 200
+        counts = count_queries(queries)
+        assert len(counts) == 1
+        assert "LIMIT" in counts[0].upper()
+
+    def test_changelist_loads_only_displayed_columns(self, admin_client, many_users):
+        with CaptureQueriesContext(connection) as queries:
+            admin_client.get(CHANGELIST)
+
+        listing = [q["sql"] for q in queries if "ORDER BY" in q["sql"]][-1]
+        assert '"password"' not in listing
+        assert '"is_superuser"' not in listing
+        assert 'ORDER BY "api_customuser"."id" DESC' in listing
+
+    def test_unindexed_columns_are_not_sortable(self, admin_client, many_users):
+        response = admin_client.get(CHANGELIST)
+
+        headers = response.context["cl"].model_admin.get_sortable_by(None)
+        assert list(headers) == ["email"]
+
+    def test_search_uses_prefix_lookup(self, admin_client, many_users):
+        response = admin_client.get(CHANGELIST, {"q": "user00"})
+
+        emails = {user.email for user in response.context["cl"].result_list}
+        assert emails == {f"user00{i}@example.com" for i in range(10)}
@@ -0,0 +1,186 @@
+"""Tests for the batched auth audit log."""
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.audit import AUDIT_LOG, client_ip, purge, record
+from api.metrics import REGISTRY
+from api.models import AuthAuditEvent
+
+User = get_user_model()
+Event = AuthAuditEvent.Event
+
+
+@pytest.fixture
+def audit_log(settings):
+    settings.AUDIT_LOG = True
+    settings.AUDIT_FLUSH_INTERVAL = 0
+    settings.METRICS_DIR = ""
+    AUDIT_LOG.reset()
+    REGISTRY.reset()
+    yield AUDIT_LOG
+    AUDIT_LOG.reset()
+    REGISTRY.reset()
+
+
+def make_events(count, age):
+    created_at = timezone.now() - age
+    AuthAuditEvent.objects.bulk_create(
+        AuthAuditEvent(created_at=created_at, event=Event.LOGIN_SUCCESS)
+        for _ in range(count)
+    )
+
+
+@pytest.mark.integration
+class TestAuditLog:
+    def test_record_does_not_touch_the_database(
+        self, db_reset, audit_log, django_assert_num_queries
+    ):
+        with django_assert_num_queries(0):
+            record(Event.REGISTER, 1, "a@example.com")
+
+        assert not AuthAuditEvent.objects.exists()
+
+    def test_flush_bulk_inserts_in_batches(self, db_reset, audit_log, settings):
+        settings.AUDIT_BATCH_SIZE = 3
+        for i in range(7):
+            record(Event.LOGIN_FAILURE, email=f"u{i}@example.com", ip="10.0.0.1")
+
+        with CaptureQueriesContext(connection) as queries:
+            assert audit_log.flush() == 7
+
+        inserts = [q for q in queries if q["sql"].startswith("INSERT")]
+        assert len(inserts) == 3
+        assert AuthAuditEvent.objects.filter(ip="10.0.0.1").count() == 7
+
+    def test_long_emails_are_truncated(self, db_reset, audit_log):
+        record(Event.LOGIN_FAILURE, email="a" * 1000 + "@example.com")
+
+        assert audit_log.flush() == 1
+        assert len(AuthAuditEvent.objects.get().email) == 254
+
+    def test_a_rejected_row_does_not_lose_its_batch(self, db_reset, audit_log):
+        record(Event.REGISTER, 1, "a@example.com")
+        # Violates the user_id >= 0 check constraint
+        record(Event.REGISTER, -1, "bad@example.com")
+        record(Event.REGISTER, 2, "b@example.com")
+
+        assert audit_log.flush() == 2
+
+        assert set(AuthAuditEvent.objects.values_list("email", flat=True)) == {
+            "a@example.com",
+            "b@example.com",
+        }
+        exposition = REGISTRY.exposition()
+        assert (
+            'api_audit_events_total{event="register",outcome="failed"} 1.0'
+            in exposition
+        )
+
+    def test_full_queue_drops_and_counts(self, db_reset, audit_log, settings):
+        settings.AUDIT_QUEUE_SIZE = 2
+        for _ in range(5):
+            record(Event.LOGIN_FAILURE, email="x@example.com")
+
+        exposition = REGISTRY.exposition()
+        assert (
+            'api_audit_events_total{event="login_failure",outcome="dropped"} 3.0'
+            in exposition
+        )
+        assert audit_log.flush() == 2
+
+    def test_shutdown_writes_queued_events(self, db_reset, audit_log):
+        record(Event.REGISTER, 1, "a@example.com")
+
+        audit_log.shutdown()
+
+        assert AuthAuditEvent.objects.get().email == "a@example.com"
+
+
+@pytest.mark.auth
+class TestAuditedActions:
+    def test_login_success_and_failure(
+        self, db_reset, http_client, test_user, audit_log
+    ):
+        http_client.post(
+            "/api/auth/login/",
+            json={"email": "test@example.com", "password": "testpassword123"},
+        )
+        http_client.post(
+            "/api/auth/login/",
+            json={"email": "test@example.com", "password": "wrong"},
+        )
+        audit_log.flush()
+
+        events = list(
+            AuthAuditEvent.objects.order_by("pk").values_list("event", "user_id", "ip")
+        )
+        assert events == [
+            (Event.LOGIN_SUCCESS, test_user.pk, "127.0.0.1"),
+            (Event.LOGIN_FAILURE, None, "127.0.0.1"),
+        ]
+
+    def test_register(self, db_reset, http_client, test_user_data, audit_log):
+        http_client.post("/api/auth/register/", json=test_user_data)
+        audit_log.flush()
+
+        event = AuthAuditEvent.objects.get()
+        assert event.event == Event.REGISTER
+        assert event.email == test_user_data["email"]
+
+    def test_email_change_keeps_old_email(
+        self, db_reset, authenticated_client, test_user, audit_log
+    ):
+        authenticated_client.put(
+            "/api/auth/profile/", json={"email": "new@example.com"}
+        )
+        audit_log.flush()
+
+        event = AuthAuditEvent.objects.get(event=Event.EMAIL_CHANGE)
+        assert event.email == "new@example.com"
+        assert event.detail == {"old_email": "test@example.com"}
+
+
+class TestClientIP:
+    def request(self, xff):
+        return RequestFactory().get(
+            "/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR=xff
+        )
+
+    def test_forwarded_for_is_ignored_without_trusted_proxies(self):
+        assert client_ip(self.request("1.2.3.4")) == "10.0.0.1"
+
+    def test_trusted_proxy_hop_is_used(self, settings):
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}
+
+        assert client_ip(self.request("6.6.6.6, 1.2.3.4")) == "1.2.3.4"
+        assert client_ip(self.request("not-an-ip")) is None
+
+
+@pytest.mark.integration
+class TestRetention:
+    def test_purge_deletes_old_events_in_chunks(self, db_reset):
+        make_events(5, timedelta(days=100))
+        make_events(2, timedelta(days=1))
+
+        totals = list(purge(timezone.now() - timedelta(days=90), chunk_size=2))
+
+        assert totals == [2, 4, 5]
+        assert AuthAuditEvent.objects.count() == 2
+
+    def test_purge_command_uses_retention_days(self, db_reset):
+        make_events(3, timedelta(days=40))
+        out = StringIO()
+
+        call_command("purge_audit_log", days=30, stdout=out)
+
+        assert "Purged 3 audit events" in out.getvalue()
+        assert not AuthAuditEvent.objects.exists()
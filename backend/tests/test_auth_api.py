@@ -54,6 +54,18 @@ class TestRegistration:
         assert response.status_code == 400
         assert "email" in response.json()
 
+    def test_registration_duplicate_email_differing_case(
+        self, db_reset, http_client, test_user, test_user_data
+    ):
+        """Test registration treats emails differing only by case as duplicates."""
+        duplicate_data = test_user_data.copy()
+        duplicate_data["email"] = test_user.email.upper()
+
+        response = http_client.post("/api/auth/register/", json=duplicate_data)
+
+        assert response.status_code == 400
+        assert "email" in response.json()
+
     def test_registration_password_mismatch(
         self, db_reset, http_client, test_user_data
     ):
@@ -139,6 +151,16 @@ class TestLogin:
         assert "access" in data
         assert "refresh" in data
 
+    def test_login_ignores_email_case(self, db_reset, http_client, test_user):
+        """Test login matches the email case-insensitively."""
+        response = http_client.post(
+            "/api/auth/login/",
+            json={"email": "Test@Example.COM", "password": "testpassword123"},
+        )
+
+        assert response.status_code == 200
+        assert "access" in response.json()
+
     def test_login_invalid_email(self, db_reset, http_client, test_user):
         """Test login fails with non-existent email."""
         response = http_client.post(
@@ -266,6 +288,78 @@ class TestProfile:
         assert response.status_code == 200
         assert response.json()["email"] == test_user.email
 
+    def test_update_profile_email_case_only(
+        self, db_reset, authenticated_client, test_user
+    ):
+        """Test changing only the case of one's own email succeeds."""
+        response = authenticated_client.put(
+            "/api/auth/profile/", json={"email": "TEST@example.com"}
+        )
+
+        assert response.status_code == 200
+        test_user.refresh_from_db()
+        assert test_user.email == "TEST@example.com"
+        assert test_user.email_canonical == "test@example.com"
+
+    @pytest.mark.parametrize("email", [123, None, "not-an-email", ["a@b.co"]])
+    def test_update_profile_invalid_email(
+        self, db_reset, authenticated_client, test_user, email
+    ):
+        """Test a PUT with a malformed email is rejected with 400."""
+        response = authenticated_client.put("/api/auth/profile/", json={"email": email})
+
+        assert response.status_code == 400
+        assert "email" in response.json()
+        test_user.refresh_from_db()
+        assert test_user.email == "test@example.com"
+
+    def test_update_profile_unchanged_skips_write(
+        self, db_reset, authenticated_client, test_user
+    ):
+        """Test a PUT that changes nothing does not touch the row."""
+        response = authenticated_client.put(
+            "/api/auth/profile/", json={"email": test_user.email}
+        )
+
+        assert response.status_code == 200
+        test_user.refresh_from_db()
+        assert test_user.version == 1
+        assert response.headers["ETag"] == f'"u{test_user.id}-v1"'
+
+    def test_update_profile_bumps_etag(self, db_reset, authenticated_client, test_user):
+        """Test a changing PUT returns a new ETag."""
+        etag = authenticated_client.get("/api/auth/profile/").headers["ETag"]
+
+        response = authenticated_client.put(
+            "/api/auth/profile/",
+            json={"email": "changed@example.com"},
+            headers={"If-Match": etag},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        test_user.refresh_from_db()
+        assert response.headers["ETag"] == f'"u{test_user.id}-v{test_user.version}"'
+
+    def test_update_profile_stale_if_match(
+        self, db_reset, authenticated_client, test_user
+    ):
+        """Test a PUT with a stale If-Match is rejected with 412."""
+        stale_etag = authenticated_client.get("/api/auth/profile/").headers["ETag"]
+        authenticated_client.put(
+            "/api/auth/profile/", json={"email": "first@example.com"}
+        )
+
+        response = authenticated_client.put(
+            "/api/auth/profile/",
+            json={"email": "second@example.com"},
+            headers={"If-Match": stale_etag},
+        )
+
+        assert response.status_code == 412
+        test_user.refresh_from_db()
+        assert test_user.email == "first@example.com"
+
     def test_update_profile_unauthenticated(self, db_reset, http_client):
         """Test updating profile fails without authentication."""
         response = http_client.put(
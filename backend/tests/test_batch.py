@@ -0,0 +1,168 @@
+"""Tests for the /api/batch/ endpoint."""
+
+import threading
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import Client
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.middleware import mark_uncompressible
+from api.views.auth import AuthViewSet
+from api.views.batch import BatchRunner
+
+User = get_user_model()
+
+BATCH_URL = "/api/batch/"
+
+
+def run_batch(client, *requests, **kwargs):
+    return client.post(BATCH_URL, json={"requests": list(requests)}, **kwargs)
+
+
+@pytest.mark.integration
+class TestBatch:
+    def test_results_are_returned_in_order(self, authenticated_client, test_user):
+        response = run_batch(
+            authenticated_client,
+            {"path": "/auth/profile/"},
+            {"path": "/auth/search-users/?q=test"},
+            {"path": "/auth/search-users/?q=x"},
+        )
+
+        assert response.status_code == 200
+        profile, search, short = response.json()
+        assert profile["status"] == 200
+        assert profile["body"]["email"] == "test@example.com"
+        assert profile["headers"]["ETag"]
+        assert [user["email"] for user in search["body"]] == ["test@example.com"]
+        assert short == {"status": 200, "headers": {}, "body": []}
+
+    def test_authenticates_once(
+        self, authenticated_client, test_user, django_assert_num_queries
+    ):
+        # One user lookup for the whole batch; profile GETs add no queries
+        with django_assert_num_queries(1):
+            response = run_batch(
+                authenticated_client, *[{"path": "/auth/profile/"}] * 3
+            )
+
+        assert [item["status"] for item in response.json()] == [200, 200, 200]
+
+    def test_conditional_headers_are_forwarded(self, authenticated_client, test_user):
+        etag = authenticated_client.get("/api/auth/profile/").headers["ETag"]
+
+        (item,) = run_batch(
+            authenticated_client,
+            {"path": "/auth/profile/", "headers": {"If-None-Match": etag}},
+        ).json()
+
+        assert item["status"] == 304
+        assert item["headers"] == {"ETag": etag}
+
+    def test_reads_after_a_write_see_it(self, authenticated_client, test_user):
+        results = run_batch(
+            authenticated_client,
+            {
+                "method": "PUT",
+                "path": "/auth/profile/",
+                "body": {"email": "renamed@example.com"},
+            },
+            {"path": "/auth/profile/"},
+        ).json()
+
+        assert [item["status"] for item in results] == [200, 200]
+        assert results[1]["body"]["email"] == "renamed@example.com"
+
+    def test_only_auth_endpoints_can_be_batched(self, authenticated_client, test_user):
+        results = run_batch(
+            authenticated_client,
+            {"path": "/metrics"},
+            {"method": "POST", "path": "/batch/"},
+            {"path": "/nope/"},
+            {"method": "DELETE", "path": "/auth/profile/"},
+        ).json()
+
+        assert [item["status"] for item in results] == [404, 404, 404, 405]
+
+    def test_login_and_register_cannot_be_batched(
+        self, authenticated_client, test_user, test_user_data
+    ):
+        results = run_batch(
+            authenticated_client,
+            {
+                "method": "POST",
+                "path": "/auth/login/",
+                "body": {"email": "test@example.com", "password": "testpassword123"},
+            },
+            {"method": "POST", "path": "/auth/register/", "body": test_user_data},
+        ).json()
+
+        assert [item["status"] for item in results] == [400, 400]
+        assert not User.objects.filter(email=test_user_data["email"]).exists()
+
+    def test_uncompressible_sub_responses_disable_compression(
+        self, authenticated_client, test_user, monkeypatch
+    ):
+        dispatch = AuthViewSet.dispatch
+
+        def uncompressible_dispatch(self, request, *args, **kwargs):
+            return mark_uncompressible(dispatch(self, request, *args, **kwargs))
+
+        monkeypatch.setattr(AuthViewSet, "dispatch", uncompressible_dispatch)
+        response = run_batch(
+            authenticated_client,
+            *[{"path": "/auth/profile/"}] * 20,
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert response.status_code == 200
+        assert len(response.content) > 1024
+        assert "Content-Encoding" not in response.headers
+
+    def test_batch_size_is_capped(self, authenticated_client, test_user, settings):
+        settings.BATCH_MAX_REQUESTS = 2
+
+        response = run_batch(authenticated_client, *[{"path": "/auth/profile/"}] * 3)
+
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize(
+        "payload",
+        [{}, {"requests": []}, {"requests": [{}]}, {"requests": ["/auth/profile/"]}],
+    )
+    def test_malformed_batches_are_rejected(
+        self, authenticated_client, test_user, payload
+    ):
+        response = authenticated_client.post(BATCH_URL, json=payload)
+
+        assert response.status_code == 400
+
+    def test_requires_authentication(self, http_client):
+        response = run_batch(http_client, {"path": "/auth/profile/"})
+
+        assert response.status_code == 401
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reads_run_concurrently_outside_a_transaction(monkeypatch, settings):
+    settings.BATCH_MAX_WORKERS = 4
+    user = User.objects.create_user(email="test@example.com", password="x")
+    token = RefreshToken.for_user(user).access_token
+    threads = set()
+    dispatch = BatchRunner._dispatch_in_thread
+
+    def record_thread(self, *item):
+        threads.add(threading.current_thread().name)
+        return dispatch(self, *item)
+
+    monkeypatch.setattr(BatchRunner, "_dispatch_in_thread", record_thread)
+    response = Client().post(
+        BATCH_URL,
+        {"requests": [{"path": "/auth/profile/"}] * 4},
+        content_type="application/json",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert [item["status"] for item in response.json()] == [200] * 4
+    assert threads and all(name.startswith("batch") for name in threads)
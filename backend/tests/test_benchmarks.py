@@ -0,0 +1,39 @@
+"""Tests for the microbenchmark harness's baseline comparison."""
+
+from benchmarks.harness import compare, format_ns, measure
+
+
+def baseline(**medians):
+    return {"results": {name: {"median_ns": ns} for name, ns in medians.items()}}
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    rows, regressions = compare(
+        baseline(fast=100, slow=100),
+        {"fast": {"median_ns": 110}, "slow": {"median_ns": 130}},
+        tolerance=0.2,
+    )
+
+    assert regressions == ["slow"]
+    assert ("fast", 100, 110, 1.1) in rows
+
+
+def test_compare_ignores_benchmarks_missing_on_either_side():
+    rows, regressions = compare(
+        baseline(removed=100), {"added": {"median_ns": 100}}, tolerance=0.0
+    )
+
+    assert regressions == []
+    assert {row[0] for row in rows} == {"added", "removed"}
+
+
+def test_measure_returns_per_call_samples():
+    samples, number = measure(lambda: None, repeat=3, min_time=0.001)
+
+    assert len(samples) == 3
+    assert number >= 1
+
+
+def test_format_ns():
+    assert format_ns(1_500_000) == "1.50ms"
+    assert format_ns(None) == "-"
@@ -0,0 +1,109 @@
+"""Tests for the response compression middleware."""
+
+import gzip
+import json
+
+import pytest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+
+from api.middleware import CompressionMiddleware, mark_uncompressible
+from api.middleware.compression import (
+    accepted_encodings,
+    choose_encoding,
+    compress_stream,
+)
+
+LARGE_PAYLOAD = {"items": [f"user{i}@example.com" for i in range(200)]}
+
+
+def run_middleware(response, accept_encoding="gzip"):
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+    return CompressionMiddleware(lambda request: response)(request)
+
+
+class TestCompressionMiddleware:
+    def test_compresses_large_json(self):
+        response = run_middleware(JsonResponse(LARGE_PAYLOAD))
+
+        assert response["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response["Vary"]
+        assert int(response["Content-Length"]) == len(response.content)
+        assert json.loads(gzip.decompress(response.content)) == LARGE_PAYLOAD
+
+    def test_skips_small_bodies(self):
+        response = run_middleware(JsonResponse({"ok": True}))
+
+        assert not response.has_header("Content-Encoding")
+
+    @override_settings(COMPRESSION_MIN_SIZE=0)
+    def test_skips_content_types_outside_allowlist(self):
+        response = run_middleware(HttpResponse("<p>" * 1000, content_type="text/html"))
+
+        assert not response.has_header("Content-Encoding")
+
+    def test_skips_when_client_does_not_accept(self):
+        response = run_middleware(JsonResponse(LARGE_PAYLOAD), accept_encoding="")
+
+        assert not response.has_header("Content-Encoding")
+        assert "Accept-Encoding" in response["Vary"]
+
+    def test_skips_uncompressible_responses(self):
+        response = run_middleware(mark_uncompressible(JsonResponse(LARGE_PAYLOAD)))
+
+        assert not response.has_header("Content-Encoding")
+
+    def test_weakens_strong_etag(self):
+        original = JsonResponse(LARGE_PAYLOAD)
+        original["ETag"] = '"u1-v1"'
+
+        response = run_middleware(original)
+
+        assert response["ETag"] == 'W/"u1-v1"'
+
+    def test_compresses_streaming_responses(self):
+        chunks = [b'{"row": %d}\n' % i for i in range(100)]
+        original = StreamingHttpResponse(
+            iter(chunks), content_type="application/x-ndjson"
+        )
+
+        response = run_middleware(original)
+
+        assert response["Content-Encoding"] == "gzip"
+        assert not response.has_header("Content-Length")
+        assert gzip.decompress(b"".join(response.streaming_content)) == b"".join(chunks)
+
+    @override_settings(COMPRESSION_STREAM_FLUSH_SIZE=100)
+    def test_streams_flush_on_a_byte_threshold(self):
+        chunks = [b"x" * 10] * 25
+
+        output = list(compress_stream(iter(chunks), "gzip"))
+
+        # A sync flush ends with an empty stored block: one per 100 bytes of
+        # input, not one per chunk
+        flushes = [data for data in output if data.endswith(b"\x00\x00\xff\xff")]
+        assert len(flushes) == 2
+        assert gzip.decompress(b"".join(output)) == b"".join(chunks)
+
+    def test_accept_encoding_ignores_zero_quality(self):
+        assert accepted_encodings("gzip;q=0, deflate", ("gzip", "deflate")) == {
+            "deflate"
+        }
+
+    def test_explicit_zero_quality_beats_the_wildcard(self):
+        assert accepted_encodings("br;q=0, *", ("br", "gzip")) == {"gzip"}
+        assert choose_encoding("br;q=0, *") == "gzip"
+        assert choose_encoding("gzip;q=0, br;q=0, *") is None
+
+
+@pytest.mark.auth
+@pytest.mark.login
+def test_login_token_pair_is_never_compressed(db_reset, http_client, test_user):
+    response = http_client.post(
+        "/api/auth/login/",
+        json={"email": "test@example.com", "password": "testpassword123"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 200
+    assert not response.has_header("Content-Encoding")
@@ -0,0 +1,118 @@
+"""Tests for ETag / If-None-Match handling on profile and search endpoints."""
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+User = get_user_model()
+
+
+@pytest.mark.auth
+@pytest.mark.profile
+class TestProfileConditionalGet:
+    def test_profile_returns_etag(self, authenticated_client, test_user):
+        response = authenticated_client.get("/api/auth/profile/")
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] == f'"u{test_user.id}-v{test_user.version}"'
+
+    def test_matching_etag_returns_304_without_queries(self, authenticated_client):
+        etag = authenticated_client.get("/api/auth/profile/").headers["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(
+                "/api/auth/profile/", headers={"If-None-Match": etag}
+            )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert len(queries) == 0
+
+    def test_etag_changes_after_update(self, authenticated_client):
+        etag = authenticated_client.get("/api/auth/profile/").headers["ETag"]
+        authenticated_client.put(
+            "/api/auth/profile/", json={"email": "changed@example.com"}
+        )
+
+        response = authenticated_client.get(
+            "/api/auth/profile/", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["email"] == "changed@example.com"
+
+    def test_etag_changes_after_model_save(
+        self, authenticated_client, test_user, django_capture_on_commit_callbacks
+    ):
+        etag = authenticated_client.get("/api/auth/profile/").headers["ETag"]
+        test_user.email = "saved@example.com"
+        with django_capture_on_commit_callbacks(execute=True):
+            test_user.save()
+
+        response = authenticated_client.get(
+            "/api/auth/profile/", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_matching_etag_still_requires_valid_token(self, http_client, test_user):
+        http_client.headers["Authorization"] = "Bearer invalid.token.here"
+
+        response = http_client.get(
+            "/api/auth/profile/",
+            headers={"If-None-Match": f'"u{test_user.id}-v{test_user.version}"'},
+        )
+
+        assert response.status_code == 401
+
+
+@pytest.mark.auth
+class TestSearchConditionalGet:
+    def test_matching_etag_returns_304(self, authenticated_client):
+        User.objects.create_user(email="search@example.com", password="pass123456")
+        first = authenticated_client.get("/api/auth/search-users/?q=search")
+
+        response = authenticated_client.get(
+            "/api/auth/search-users/?q=search",
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+
+        assert response.status_code == 304
+
+    def test_user_write_invalidates_search_etag(
+        self, authenticated_client, django_capture_on_commit_callbacks
+    ):
+        first = authenticated_client.get("/api/auth/search-users/?q=search")
+        with django_capture_on_commit_callbacks(execute=True):
+            User.objects.create_user(email="search@example.com", password="pass123456")
+
+        response = authenticated_client.get(
+            "/api/auth/search-users/?q=search",
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {
+                "id": User.objects.get(email="search@example.com").id,
+                "email": "search@example.com",
+            }
+        ]
+
+    def test_etag_is_per_query(self, authenticated_client):
+        first = authenticated_client.get("/api/auth/search-users/?q=alpha")
+        second = authenticated_client.get("/api/auth/search-users/?q=beta")
+
+        assert first.headers["ETag"] != second.headers["ETag"]
+
+    @pytest.mark.parametrize("query", ["", "a"])
+    def test_short_queries_are_never_304(self, authenticated_client, query):
+        response = authenticated_client.get(
+            f"/api/auth/search-users/?q={query}", headers={"If-None-Match": "*"}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == []
+        assert not response.has_header("ETag")
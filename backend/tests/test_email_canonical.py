@@ -0,0 +1,91 @@
+"""Tests for the canonical (case-insensitive) email lookup key."""
+
+import importlib
+
+import pytest
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+User = get_user_model()
+
+backfill = importlib.import_module(
+    "api.migrations.0004_backfill_email_canonical"
+).backfill_email_canonical
+
+
+class SchemaEditorStub:
+    connection = connection
+
+
+def create_legacy_user(email):
+    """Create a user as it existed before email_canonical was added."""
+    user = User.objects.create_user(email=email, password="x")
+    User.objects.filter(pk=user.pk).update(email_canonical=None)
+    return user
+
+
+@pytest.mark.integration
+class TestCanonicalEmail:
+    def test_save_sets_canonical_email(self, db_reset):
+        user = User.objects.create_user(email="Mixed.Case@Example.COM", password="x")
+
+        assert user.email_canonical == "mixed.case@example.com"
+
+    def test_update_fields_keeps_canonical_in_step(self, db_reset):
+        user = User.objects.create_user(email="old@example.com", password="x")
+        user.email = "New@Example.com"
+        user.save(update_fields=["email"])
+
+        user.refresh_from_db()
+        assert user.email_canonical == "new@example.com"
+
+    def test_bulk_create_sets_canonical_email(self, db_reset):
+        User.objects.bulk_create([User(email="Bulk@Example.com")])
+
+        assert User.objects.get(email="Bulk@Example.com").email_canonical == (
+            "bulk@example.com"
+        )
+
+    def test_natural_key_lookup_is_one_indexed_query(
+        self, db_reset, django_assert_num_queries
+    ):
+        user = User.objects.create_user(email="someone@example.com", password="x")
+
+        with django_assert_num_queries(1) as queries:
+            found = User.objects.get_by_natural_key("SomeOne@example.com")
+
+        assert found == user
+        assert "email_canonical" in queries.captured_queries[0]["sql"]
+
+
+@pytest.mark.integration
+class TestBackfillMigration:
+    def test_backfills_and_reports_collisions(self, db_reset, capsys, monkeypatch):
+        monkeypatch.setattr(
+            importlib.import_module("api.migrations.0004_backfill_email_canonical"),
+            "BATCH_SIZE",
+            2,
+        )
+        first = create_legacy_user("dup@example.com")
+        second = create_legacy_user("Dup@example.com")
+        other = create_legacy_user("Other@example.com")
+
+        backfill(apps, SchemaEditorStub())
+
+        canonical = dict(User.objects.values_list("pk", "email_canonical"))
+        assert canonical == {
+            first.pk: "dup@example.com",
+            second.pk: None,
+            other.pk: "other@example.com",
+        }
+        output = capsys.readouterr().out
+        assert "2 user(s), 1 collision(s)" in output
+        assert f"user {second.pk} <Dup@example.com> matches user {first.pk}" in output
+
+    def test_collided_user_can_log_in_with_exact_email(self, db_reset):
+        legacy = create_legacy_user("Dup@example.com")
+        User.objects.create_user(email="dup@example.com", password="x")
+
+        assert User.objects.get_by_natural_key("Dup@example.com") == legacy
+        assert User.objects.get_by_natural_key("DUP@example.com") != legacy
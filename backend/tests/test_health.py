@@ -0,0 +1,103 @@
+"""Tests for the liveness and readiness probes."""
+
+import threading
+import time
+
+import pytest
+from django.db import OperationalError
+from django.test import Client
+
+from api import health
+from api.health import READINESS
+
+LIVE = "/api/health/live"
+READY = "/api/health/ready"
+
+
+@pytest.fixture
+def readiness(settings):
+    settings.HEALTH_READY_TIMEOUT = 0.2
+    settings.HEALTH_READY_CACHE_SECONDS = 60
+    READINESS.reset()
+    yield READINESS
+    READINESS.reset()
+
+
+@pytest.fixture
+def pings(monkeypatch):
+    """Replace the database ping; tests may set .error or .release."""
+
+    class Pings:
+        count = 0
+        error = None
+        release = None
+
+    def ping():
+        Pings.count += 1
+        if Pings.release is not None:
+            Pings.release.wait(5)
+        if Pings.error is not None:
+            raise Pings.error
+
+    monkeypatch.setattr(health, "_ping", ping)
+    return Pings
+
+
+@pytest.mark.integration
+class TestHealthProbes:
+    def test_live_does_no_io(self, db, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            response = Client().get(LIVE)
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+    def test_probes_skip_host_validation_and_other_middleware(self, db, readiness):
+        client = Client(HTTP_HOST="template-backend:8000")
+
+        for path in (LIVE, READY, READY + "/"):
+            response = client.get(path)
+            assert response.status_code == 200
+            assert "X-Frame-Options" not in response
+
+    def test_ready_pings_the_database(self, db, readiness):
+        response = Client().get(READY)
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+    def test_ready_result_is_cached(self, readiness, pings):
+        for _ in range(5):
+            assert Client().get(READY).status_code == 200
+
+        assert pings.count == 1
+
+    def test_ready_reports_database_errors(self, readiness, pings):
+        pings.error = OperationalError("connection refused")
+
+        response = Client().get(READY)
+
+        assert response.status_code == 503
+        assert response.json() == {
+            "status": "unavailable",
+            "reason": "database error: OperationalError",
+        }
+
+    def test_ready_times_out_without_piling_up_pings(self, readiness, pings, settings):
+        settings.HEALTH_READY_CACHE_SECONDS = 0
+        pings.release = threading.Event()
+
+        start = time.monotonic()
+        first = Client().get(READY)
+        second = Client().get(READY)
+        elapsed = time.monotonic() - start
+        pings.release.set()
+
+        assert first.status_code == second.status_code == 503
+        assert first.json()["reason"] == "database timeout"
+        assert elapsed < 1
+        assert pings.count == 1
+
+    def test_only_safe_methods(self):
+        assert Client().post(LIVE).status_code == 405
+        assert Client().head(LIVE).status_code == 200
@@ -0,0 +1,79 @@
+"""Tests for the load test harness (run against pytest-django's live server)."""
+
+import time
+
+import httpx
+import pytest
+
+from loadtest.runner import (
+    THROTTLED,
+    Session,
+    Stats,
+    format_text,
+    percentile,
+    run,
+    summarize,
+)
+from loadtest.scenarios import ProfilePolling
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) is None
+
+
+def test_summarize_counts_transport_errors_as_requests():
+    summary = summarize([0.1, 0.2], {"500": 1, "ConnectError": 2}, elapsed=2.0)
+
+    assert summary["requests"] == 4
+    assert summary["error_count"] == 3
+    assert summary["throughput_rps"] == 2.0
+
+
+async def test_throttled_responses_are_kept_out_of_latencies():
+    transport = httpx.MockTransport(lambda request: httpx.Response(429))
+    stats = Stats()
+    async with httpx.AsyncClient(base_url="http://t", transport=transport) as client:
+        session = Session(client, stats, time.monotonic() + 60, 0, 0, "run")
+        await session.request("login", "POST", "/api/auth/login/")
+
+    summary = summarize(stats.latencies["login"], stats.errors["login"], 1.0)
+    assert summary["requests"] == 1
+    assert summary["errors"] == {THROTTLED: 1}
+    assert summary["latency_ms"]["p50"] is None
+
+
+def test_report_warns_about_throttling():
+    summary = summarize([], {THROTTLED: 3}, elapsed=1.0)
+    report = {
+        "scenario": "login_storm",
+        "target": "http://t",
+        "concurrency": 1,
+        "ramp_s": 0,
+        "duration_s": 1.0,
+        **summary,
+        "endpoints": {"login": summary},
+    }
+
+    assert "core.settings_loadtest" in format_text(report)
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+async def test_profile_polling_against_live_server(live_server):
+    report = await run(
+        ProfilePolling(),
+        target=live_server.url,
+        concurrency=2,
+        ramp=0.1,
+        duration=1.5,
+        think_time=0.05,
+        timeout=10,
+    )
+
+    assert report["endpoints"]["profile"]["requests"] > 0
+    assert report["error_count"] == 0
+    assert report["latency_ms"]["p50"] is not None
@@ -0,0 +1,102 @@
+"""Tests for the metrics registry and the /api/metrics endpoint."""
+
+import os
+
+import pytest
+from django.test import override_settings
+
+from api.metrics import REGISTRY, Counter, Histogram, Registry
+
+
+@pytest.fixture
+def registry(settings):
+    settings.METRICS_DIR = ""
+    return Registry()
+
+
+@pytest.fixture
+def fresh_metrics(settings):
+    """Reset the global registry so each test sees its own counts."""
+    settings.METRICS_DIR = ""
+    REGISTRY.reset()
+    yield REGISTRY
+    REGISTRY.reset()
+
+
+class TestRegistry:
+    def test_counter_exposition(self, registry):
+        counter = Counter("test_total", "Test counter.", ["action"], registry=registry)
+        counter.inc(("login",))
+        counter.inc(("login",), 2)
+
+        assert 'test_total{action="login"} 3.0' in registry.exposition()
+
+    def test_histogram_buckets_are_cumulative(self, registry):
+        histogram = Histogram(
+            "test_seconds", "Test.", ["action"], buckets=(0.1, 1.0), registry=registry
+        )
+        histogram.observe(("login",), 0.05)
+        histogram.observe(("login",), 0.5)
+        histogram.observe(("login",), 5)
+
+        text = registry.exposition()
+        assert 'test_seconds_bucket{action="login",le="0.1"} 1.0' in text
+        assert 'test_seconds_bucket{action="login",le="1.0"} 2.0' in text
+        assert 'test_seconds_bucket{action="login",le="+Inf"} 3.0' in text
+        assert 'test_seconds_count{action="login"} 3.0' in text
+        assert 'test_seconds_sum{action="login"} 5.55' in text
+
+    def test_label_values_are_escaped(self, registry):
+        counter = Counter("test_total", "Test.", ["q"], registry=registry)
+        counter.inc(('say "hi"\n',))
+
+        assert r'test_total{q="say \"hi\"\n"} 1.0' in registry.exposition()
+
+    def test_mmap_store_aggregates_across_processes(self, settings, tmp_path):
+        settings.METRICS_DIR = str(tmp_path)
+        registry = Registry()
+        counter = Counter("test_total", "Test.", registry=registry)
+        counter.inc()
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - child process
+            registry.reset()
+            counter.inc(amount=2)
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+        assert len(list(tmp_path.glob("metrics_*.db"))) == 2
+        assert "test_total 3.0" in registry.exposition()
+
+
+@pytest.mark.integration
+class TestMetricsEndpoint:
+    def test_disabled_without_token(self, client):
+        with override_settings(METRICS_TOKEN=""):
+            assert client.get("/api/metrics").status_code == 404
+
+    def test_rejects_wrong_token(self, client):
+        with override_settings(METRICS_TOKEN="secret"):
+            response = client.get(
+                "/api/metrics", headers={"Authorization": "Bearer nope"}
+            )
+        assert response.status_code == 403
+
+    def test_reports_action_metrics(
+        self, client, db_reset, http_client, test_user, fresh_metrics
+    ):
+        http_client.post(
+            "/api/auth/login/",
+            json={"email": "test@example.com", "password": "testpassword123"},
+        )
+
+        with override_settings(METRICS_TOKEN="secret"):
+            response = client.get(
+                "/api/metrics", headers={"Authorization": "Bearer secret"}
+            )
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        text = response.content.decode()
+        assert 'api_requests_total{action="login",status="200"} 1.0' in text
+        assert 'api_request_duration_seconds_count{action="login"} 1.0' in text
@@ -0,0 +1,200 @@
+"""Tests for the online migration operations (SQLite code path)."""
+
+from io import StringIO
+
+import pytest
+from django.core.management.base import OutputWrapper
+from django.contrib.auth import get_user_model
+from django.db import NotSupportedError, connection, models, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.db.models import F, Q
+from django.test.utils import CaptureQueriesContext
+
+from api.models.user import CanonicalEmailField
+from api.online_migrations import (
+    AddIndexOnline,
+    AlterFieldOnline,
+    BackfillField,
+    RemoveIndexOnline,
+    capture_migrate_output,
+    release_migrate_output,
+)
+
+User = get_user_model()
+INDEX = "user_date_joined_idx"
+BEFORE = "0007_authauditevent"
+AFTER = "0008_customuser_date_joined_index"
+
+
+def project_state(migration):
+    return MigrationLoader(connection).project_state(("api", migration))
+
+
+def date_joined_index():
+    return models.Index(fields=["date_joined"], name=INDEX)
+
+
+def index_names():
+    with connection.cursor() as cursor:
+        return set(connection.introspection.get_constraints(cursor, "api_customuser"))
+
+
+def apply(operation, from_state, backwards=False):
+    to_state = from_state.clone()
+    operation.state_forwards("api", to_state)
+    with connection.schema_editor(atomic=False) as editor:
+        if backwards:
+            operation.database_backwards("api", editor, to_state, from_state)
+        else:
+            operation.database_forwards("api", editor, from_state, to_state)
+    return to_state
+
+
+@pytest.mark.django_db(transaction=True)
+class TestIndexOperations:
+    def test_remove_and_add_index(self):
+        state = apply(RemoveIndexOnline("customuser", INDEX), project_state(AFTER))
+        assert INDEX not in index_names()
+
+        apply(AddIndexOnline("customuser", date_joined_index()), state)
+        assert INDEX in index_names()
+
+    def test_rerun_keeps_an_existing_index(self):
+        state = project_state(BEFORE)
+        add = AddIndexOnline("customuser", date_joined_index())
+
+        with CaptureQueriesContext(connection) as queries:
+            apply(add, state)
+
+        assert not [q for q in queries if "CREATE INDEX" in q["sql"]]
+        assert INDEX in index_names()
+
+    def test_backwards_drops_the_index(self):
+        state = project_state(BEFORE)
+        add = AddIndexOnline("customuser", date_joined_index())
+
+        apply(add, state, backwards=True)
+        assert INDEX not in index_names()
+        apply(add, state)
+        assert INDEX in index_names()
+
+    def test_refuses_to_run_in_a_transaction(self):
+        add = AddIndexOnline("customuser", date_joined_index())
+        state = project_state(BEFORE)
+        to_state = state.clone()
+        add.state_forwards("api", to_state)
+        editor = connection.schema_editor(atomic=False)
+
+        with pytest.raises(NotSupportedError, match="atomic = False"):
+            with transaction.atomic():
+                add.database_forwards("api", editor, state, to_state)
+
+
+def email_canonical(**kwargs):
+    return CanonicalEmailField(editable=False, max_length=254, null=True, **kwargs)
+
+
+def email_canonical_constraints():
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, "api_customuser")
+    return [
+        info for info in constraints.values() if info["columns"] == ["email_canonical"]
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAlterFieldOnline:
+    def test_switches_between_unique_and_index(self):
+        # From the current (unique) state to a plain index and back
+        to_index = AlterFieldOnline(
+            "customuser", "email_canonical", email_canonical(db_index=True)
+        )
+        state = project_state(AFTER)
+
+        apply(to_index, state)
+        assert [info["unique"] for info in email_canonical_constraints()] == [False]
+
+        apply(to_index, state, backwards=True)
+        assert [info["unique"] for info in email_canonical_constraints()] == [True]
+
+    def test_rejects_changes_other_than_indexes(self):
+        resize = AlterFieldOnline(
+            "customuser",
+            "email_canonical",
+            CanonicalEmailField(editable=False, max_length=100, null=True),
+        )
+
+        with pytest.raises(ValueError, match="db_index and unique"):
+            apply(resize, project_state(AFTER))
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBackfillField:
+    def make_users(self, count):
+        User.objects.bulk_create(
+            User(email=f"user{i}@example.com", email_canonical=f"user{i}@example.com")
+            for i in range(count)
+        )
+
+    def test_updates_in_batches(self, capsys):
+        self.make_users(5)
+        backfill = BackfillField(
+            "customuser", "last_seen", F("date_joined"), batch_size=2
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            apply(backfill, project_state(AFTER))
+
+        updates = [q for q in queries if q["sql"].startswith("UPDATE")]
+        assert len(updates) == 3
+        assert not User.objects.filter(last_seen__isnull=True).exists()
+        assert "on 5 row(s)" in capsys.readouterr().out
+
+    def test_resumes_with_the_remaining_rows(self):
+        self.make_users(4)
+        User.objects.filter(pk__in=User.objects.order_by("pk")[:3]).update(
+            last_seen=F("date_joined")
+        )
+        backfill = BackfillField("customuser", "last_seen", F("date_joined"))
+
+        with CaptureQueriesContext(connection) as queries:
+            apply(backfill, project_state(AFTER))
+
+        updates = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+        assert len(updates) == 1
+
+    @pytest.mark.parametrize("verbosity, lines", [(0, 0), (1, 1), (2, 3)])
+    def test_reports_at_the_migrate_verbosity(self, verbosity, lines):
+        self.make_users(3)
+        backfill = BackfillField(
+            "customuser", "last_seen", F("date_joined"), batch_size=2
+        )
+        out = StringIO()
+
+        capture_migrate_output(verbosity=verbosity, stdout=OutputWrapper(out))
+        try:
+            apply(backfill, project_state(AFTER))
+        finally:
+            release_migrate_output()
+
+        # One line per batch at verbosity 2, plus the summary
+        assert len([line for line in out.getvalue().splitlines() if line]) == lines
+
+    def test_custom_where(self):
+        self.make_users(3)
+        backfill = BackfillField(
+            "customuser", "is_staff", True, where=Q(is_staff=False, pk__gt=0)
+        )
+
+        apply(backfill, project_state(AFTER))
+
+        assert User.objects.filter(is_staff=True).count() == 3
+
+    def test_deconstructs_for_migration_files(self):
+        backfill = BackfillField("customuser", "last_seen", F("date_joined"), pause=1)
+
+        name, args, kwargs = backfill.deconstruct()
+
+        assert name == "BackfillField"
+        assert args == ("customuser", "last_seen", F("date_joined"))
+        assert kwargs == {"pause": 1}
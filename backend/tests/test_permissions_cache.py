@@ -0,0 +1,141 @@
+"""Tests for the cached effective-permission backend."""
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from api.backends import PERMISSIONS_CACHE_KEY, permissions_generation
+
+User = get_user_model()
+
+CHANGELIST = "/admin/api/customuser/"
+
+
+def permission(codename):
+    return Permission.objects.get(content_type__app_label="api", codename=codename)
+
+
+def fresh(user):
+    """Reload the user, as a new request would."""
+    return User.objects.get(pk=user.pk)
+
+
+def permission_queries(queries):
+    return [
+        q["sql"]
+        for q in queries
+        if "auth_permission" in q["sql"] or "auth_group" in q["sql"]
+    ]
+
+
+def permissions_key(user):
+    return PERMISSIONS_CACHE_KEY.format(
+        generation=permissions_generation(), user_id=user.pk
+    )
+
+
+@pytest.fixture
+def commit(django_capture_on_commit_callbacks):
+    """Run the on_commit callbacks of the writes in the block, as COMMIT would."""
+    return lambda: django_capture_on_commit_callbacks(execute=True)
+
+
+@pytest.fixture
+def editors(db_reset):
+    group = Group.objects.create(name="editors")
+    group.permissions.add(permission("view_customuser"))
+    return group
+
+
+@pytest.fixture
+def staff(editors):
+    user = User.objects.create_user(
+        email="staff@example.com", password="x", is_staff=True
+    )
+    user.groups.add(editors)
+    return user
+
+
+@pytest.mark.integration
+class TestCachedPermissions:
+    def test_permissions_are_served_from_the_cache(
+        self, staff, django_assert_num_queries
+    ):
+        assert fresh(staff).has_perm("api.view_customuser")
+
+        user = fresh(staff)
+        with django_assert_num_queries(0):
+            assert user.has_perm("api.view_customuser")
+            assert not user.has_perm("api.change_customuser")
+            assert user.has_module_perms("api")
+
+    def test_direct_permission_change_invalidates(self, staff, commit):
+        assert not fresh(staff).has_perm("api.change_customuser")
+
+        with commit():
+            staff.user_permissions.add(permission("change_customuser"))
+        assert fresh(staff).has_perm("api.change_customuser")
+
+        with commit():
+            permission("change_customuser").user_set.remove(staff)
+        assert not fresh(staff).has_perm("api.change_customuser")
+
+    def test_group_membership_change_invalidates(self, staff, editors, commit):
+        assert fresh(staff).has_perm("api.view_customuser")
+
+        with commit():
+            staff.groups.remove(editors)
+        assert not fresh(staff).has_perm("api.view_customuser")
+
+        with commit():
+            editors.user_set.add(staff)
+        assert fresh(staff).has_perm("api.view_customuser")
+
+        with commit():
+            editors.user_set.clear()
+        assert not fresh(staff).has_perm("api.view_customuser")
+
+    def test_group_permission_change_invalidates_members(self, staff, editors, commit):
+        assert not fresh(staff).has_perm("api.delete_customuser")
+
+        with commit():
+            editors.permissions.add(permission("delete_customuser"))
+        assert fresh(staff).has_perm("api.delete_customuser")
+
+        with commit():
+            editors.delete()
+        assert not fresh(staff).has_perm("api.view_customuser")
+
+    def test_invalidation_waits_for_the_commit(self, staff, commit):
+        assert not fresh(staff).has_perm("api.change_customuser")
+
+        with commit():
+            staff.user_permissions.add(permission("change_customuser"))
+            # A request racing the open transaction must not re-cache the
+            # old set after the entry is dropped, so nothing is dropped yet
+            assert "api.change_customuser" not in fresh(staff).get_all_permissions()
+            assert cache.get(permissions_key(staff)) is not None
+
+        assert cache.get(permissions_key(staff)) is None
+        assert fresh(staff).has_perm("api.change_customuser")
+
+    def test_user_save_invalidates(self, staff):
+        assert not fresh(staff).has_perm("api.delete_customuser")
+
+        staff.is_superuser = True
+        staff.save()
+        assert fresh(staff).has_perm("api.delete_customuser")
+
+    def test_admin_page_makes_no_permission_queries_after_warm_up(self, staff):
+        client = Client()
+        client.force_login(staff)
+        assert client.get(CHANGELIST).status_code == 200
+
+        with CaptureQueriesContext(connection) as queries:
+            assert client.get(CHANGELIST).status_code == 200
+
+        assert permission_queries(queries) == []
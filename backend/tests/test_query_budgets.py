@@ -0,0 +1,83 @@
+"""
+Query-count budgets for the authentication endpoints.
+
+Budgets live in conftest.QUERY_BUDGETS. Run with
+``--query-budget-report=query-budgets.json`` to export the measured counts.
+"""
+
+import pytest
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.mark.auth
+class TestQueryBudgets:
+    @pytest.mark.query_budget("register")
+    def test_register(self, db_reset, http_client, test_user_data, query_budget):
+        with query_budget:
+            response = http_client.post("/api/auth/register/", json=test_user_data)
+        assert response.status_code == 201
+
+    @pytest.mark.query_budget("login")
+    def test_login(self, db_reset, http_client, test_user, query_budget):
+        with query_budget:
+            response = http_client.post(
+                "/api/auth/login/",
+                json={"email": "test@example.com", "password": "testpassword123"},
+            )
+        assert response.status_code == 200
+
+    @pytest.mark.query_budget("login")
+    def test_login_unknown_email(self, db_reset, http_client, query_budget):
+        with query_budget:
+            response = http_client.post(
+                "/api/auth/login/",
+                json={"email": "nobody@example.com", "password": "testpassword123"},
+            )
+        assert response.status_code == 401
+
+    @pytest.mark.query_budget("profile_get")
+    def test_profile_get(self, db_reset, authenticated_client, query_budget):
+        with query_budget:
+            response = authenticated_client.get("/api/auth/profile/")
+        assert response.status_code == 200
+
+    @pytest.mark.query_budget("profile_put")
+    def test_profile_put(self, db_reset, authenticated_client, query_budget):
+        with query_budget:
+            response = authenticated_client.put(
+                "/api/auth/profile/", json={"email": "changed@example.com"}
+            )
+        assert response.status_code == 200
+
+    @pytest.mark.query_budget("profile_put_unchanged")
+    def test_profile_put_unchanged(
+        self, db_reset, authenticated_client, test_user, query_budget
+    ):
+        with query_budget:
+            response = authenticated_client.put(
+                "/api/auth/profile/", json={"email": test_user.email}
+            )
+        assert response.status_code == 200
+
+    @pytest.mark.query_budget("search_users")
+    def test_search_users(self, db_reset, authenticated_client, query_budget):
+        for i in range(5):
+            User.objects.create_user(email=f"search{i}@example.com", password="x")
+        with query_budget:
+            response = authenticated_client.get("/api/auth/search-users/?q=search")
+        assert response.status_code == 200
+        assert len(response.json()) == 5
+
+    @pytest.mark.query_budget("users_lookup")
+    def test_users_lookup(self, db_reset, authenticated_client, query_budget):
+        ids = [
+            User.objects.create_user(email=f"lookup{i}@example.com").pk
+            for i in range(20)
+        ]
+        with query_budget:
+            response = authenticated_client.get(
+                f"/api/auth/users/?ids={','.join(map(str, ids))}"
+            )
+        assert len(response.json()) == 20
@@ -0,0 +1,69 @@
+"""Tests for the synthetic user generator."""
+
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+
+from api.conditional import search_generation
+
+User = get_user_model()
+
+
+def seed(**options):
+    out = StringIO()
+    call_command("seed_synthetic", workers=1, stdout=out, **options)
+    return out.getvalue()
+
+
+def snapshot():
+    return list(
+        User.objects.order_by("email").values_list(
+            "email", "is_active", "is_staff", "date_joined", "last_login"
+        )
+    )
+
+
+@pytest.mark.integration
+class TestSeedSynthetic:
+    def test_creates_requested_rows_in_batches(self, db_reset):
+        output = seed(count=250, batch_size=100, joined_until="2024-01-01")
+
+        assert User.objects.count() == 250
+        assert "rows/s" in output
+        assert User.objects.values("password").distinct().count() == 1
+
+    def test_same_seed_is_deterministic_and_idempotent(self, db_reset):
+        seed(count=200, batch_size=50, seed=7, joined_until="2024-01-01")
+        first = snapshot()
+
+        seed(count=200, batch_size=50, seed=7, joined_until="2024-01-01")
+        assert snapshot() == first
+
+        User.objects.all().delete()
+        seed(count=200, batch_size=200, seed=7, joined_until="2024-01-01")
+        assert snapshot() == first
+
+    def test_ratios_are_respected(self, db_reset):
+        seed(count=1000, active_ratio=0.5, staff_ratio=0, joined_until="2024-01-01")
+
+        assert 400 < User.objects.filter(is_active=True).count() < 600
+        assert not User.objects.filter(is_staff=True).exists()
+
+    def test_emails_share_prefixes_and_domains(self, db_reset):
+        seed(count=1000, joined_until="2024-01-01")
+
+        emails = list(User.objects.values_list("email", flat=True))
+        assert len({email.split("@")[1] for email in emails}) < len(emails) / 2
+        assert User.objects.filter(email__startswith="james").count() > 10
+
+    def test_invalidates_cached_searches(self, db_reset):
+        before = search_generation()
+        seed(count=10)
+
+        assert search_generation() != before
+
+    def test_rejects_invalid_ratio(self, db_reset):
+        with pytest.raises(CommandError):
+            seed(count=10, active_ratio=1.5)
@@ -0,0 +1,76 @@
+"""Tests for Server-Timing instrumentation."""
+
+import pytest
+from django.test import override_settings
+
+from api.timing import collect, phase
+
+
+def parse_server_timing(header):
+    return {
+        entry.split(";")[0].strip(): float(entry.split("dur=")[1])
+        for entry in header.split(",")
+    }
+
+
+class TestPhaseTimer:
+    def test_phase_is_noop_without_collector(self):
+        with phase("db"):
+            pass
+
+    def test_repeated_phases_accumulate(self):
+        with collect() as timing:
+            with phase("db"):
+                pass
+            first = timing.durations["db"]
+            with phase("db"):
+                pass
+
+        assert timing.durations["db"] >= first
+        assert list(timing.durations) == ["db"]
+
+
+@pytest.mark.auth
+@pytest.mark.login
+class TestServerTimingHeader:
+    @override_settings(SERVER_TIMING=True, SERVER_TIMING_HEADER=True)
+    def test_login_reports_phases(self, db_reset, http_client, test_user):
+        response = http_client.post(
+            "/api/auth/login/",
+            json={"email": "test@example.com", "password": "testpassword123"},
+        )
+
+        assert response.status_code == 200
+        timings = parse_server_timing(response.headers["Server-Timing"])
+        assert {"db", "hash", "mint", "render", "total"} <= set(timings)
+
+    @override_settings(SERVER_TIMING=True, SERVER_TIMING_HEADER=True)
+    def test_authenticated_request_reports_jwt_phases(
+        self, db_reset, authenticated_client
+    ):
+        response = authenticated_client.get("/api/auth/profile/")
+
+        timings = parse_server_timing(response.headers["Server-Timing"])
+        assert {"jwt", "auth_db", "render", "total"} <= set(timings)
+
+    @override_settings(SERVER_TIMING=True, SERVER_TIMING_HEADER=False)
+    def test_header_can_be_disabled(self, db_reset, http_client, test_user, caplog):
+        with caplog.at_level("INFO", logger="api.timing"):
+            response = http_client.post(
+                "/api/auth/login/",
+                json={"email": "test@example.com", "password": "testpassword123"},
+            )
+
+        assert not response.has_header("Server-Timing")
+        record = caplog.records[-1]
+        assert record.status == 200
+        assert record.hash_ms >= 0
+
+    @override_settings(SERVER_TIMING=False)
+    def test_disabled_by_default(self, db_reset, http_client, test_user):
+        response = http_client.post(
+            "/api/auth/login/",
+            json={"email": "test@example.com", "password": "testpassword123"},
+        )
+
+        assert not response.has_header("Server-Timing")
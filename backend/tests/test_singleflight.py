@@ -0,0 +1,123 @@
+"""Tests for singleflight request coalescing."""
+
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+
+from api.metrics import REGISTRY
+from api.singleflight import LOCK_KEY, RESULT_KEY, Group
+
+
+@pytest.fixture(autouse=True)
+def metrics(settings):
+    settings.METRICS_DIR = ""
+    REGISTRY.reset()
+    yield
+    REGISTRY.reset()
+
+
+def calls(role, group="test"):
+    key = f'["api_coalesced_calls_total",[["group","{group}"],["role","{role}"]]]'
+    return REGISTRY.collect().get(key, 0)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run_concurrently(group, key, fn, count):
+    results = [None] * count
+
+    def call(i):
+        try:
+            results[i] = group.do(key, fn)
+        except Exception as exc:
+            results[i] = exc
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+class TestGroup:
+    def test_concurrent_calls_share_one_execution(self):
+        group, release, executions = Group("test"), threading.Event(), []
+
+        def fn():
+            executions.append(1)
+            release.wait(5)
+            return ["result"]
+
+        threads, results = run_concurrently(group, "k", fn, 8)
+        wait_for(lambda: calls("follower") == 7)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(executions) == 1
+        assert results == [["result"]] * 8
+        assert calls("leader") == 1
+
+    def test_followers_receive_the_leaders_exception(self):
+        group, release = Group("test"), threading.Event()
+
+        def fn():
+            release.wait(5)
+            raise RuntimeError("db down")
+
+        threads, results = run_concurrently(group, "k", fn, 3)
+        wait_for(lambda: calls("follower") == 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    def test_results_are_not_kept_after_the_flight(self):
+        group, counter = Group("test"), iter(range(10))
+
+        assert group.do("k", lambda: next(counter)) == 0
+        assert group.do("k", lambda: next(counter)) == 1
+        assert group._flights == {}
+
+    def test_different_keys_do_not_coalesce(self):
+        group = Group("test")
+
+        assert group.do("a", lambda: "a") == "a"
+        assert group.do("b", lambda: "b") == "b"
+        assert calls("leader") == 2
+
+
+class TestGroupAcrossWorkers:
+    def test_waits_for_the_result_of_another_worker(self):
+        group = Group("test", across_workers=True, lock_timeout=2)
+        cache.add(LOCK_KEY.format(group="test", key="k"), 1, 2)
+
+        def other_worker():
+            time.sleep(0.05)
+            cache.set(RESULT_KEY.format(group="test", key="k"), (["shared"],), 2)
+
+        threading.Thread(target=other_worker).start()
+
+        assert group.do("k", lambda: pytest.fail("should not run")) == ["shared"]
+        assert calls("shared") == 1
+
+    def test_runs_itself_when_the_lock_holder_never_publishes(self):
+        group = Group("test", across_workers=True, lock_timeout=0.05)
+        cache.add(LOCK_KEY.format(group="test", key="k"), 1, 60)
+
+        assert group.do("k", lambda: "own") == "own"
+        assert calls("leader") == 1
+
+    def test_leader_publishes_and_releases(self):
+        group = Group("test", across_workers=True, lock_timeout=2)
+
+        assert group.do("k", lambda: None) is None
+        assert cache.get(RESULT_KEY.format(group="test", key="k")) == (None,)
+        assert cache.get(LOCK_KEY.format(group="test", key="k")) is None
@@ -0,0 +1,223 @@
+"""Tests for the login/register rate limits."""
+
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+
+from api import throttling
+from api.metrics import REGISTRY
+from api.throttling import LoginEmailThrottle, LoginIPThrottle, SlidingWindowThrottle
+
+LOGIN_URL = "/api/auth/login/"
+REGISTER_URL = "/api/auth/register/"
+
+
+@pytest.fixture
+def rates(monkeypatch, settings):
+    rates = {
+        "login_ip": "5/min",
+        "login_email": "3/min",
+        "register_ip": "2/hour",
+        "register_email": "1/hour",
+    }
+    monkeypatch.setattr(SlidingWindowThrottle, "THROTTLE_RATES", rates)
+    settings.METRICS_DIR = ""
+    REGISTRY.reset()
+    yield rates
+    REGISTRY.reset()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Pin time.time() in api.throttling; tests move it by assigning .now."""
+
+    class Clock:
+        now = 6000.0  # the start of a 60-second window
+
+    monkeypatch.setattr(throttling.time, "time", lambda: Clock.now)
+    return Clock
+
+
+def login(http_client, email, ip="10.0.0.1", **extra):
+    return http_client.post(
+        LOGIN_URL,
+        json={"email": email, "password": "wrong-password"},
+        REMOTE_ADDR=ip,
+        **extra,
+    )
+
+
+@pytest.mark.integration
+class TestAuthRateLimits:
+    def test_login_is_limited_per_email(self, http_client, test_user, rates):
+        for _ in range(3):
+            assert login(http_client, "test@example.com").status_code == 401
+
+        response = login(http_client, "test@example.com", ip="10.0.0.2")
+
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+
+    def test_email_limit_uses_the_canonical_address(
+        self, http_client, test_user, rates
+    ):
+        for email in ["test@example.com", "Test@Example.com", " TEST@example.com"]:
+            login(http_client, email)
+
+        assert login(http_client, "test@EXAMPLE.com").status_code == 429
+
+    def test_login_is_limited_per_ip(self, http_client, db, rates):
+        for i in range(5):
+            assert login(http_client, f"user{i}@example.com").status_code == 401
+
+        assert login(http_client, "other@example.com").status_code == 429
+        assert login(http_client, "other@example.com", ip="10.0.0.2").status_code == 401
+
+    def test_forged_forwarded_for_does_not_reset_the_ip_limit(
+        self, http_client, db, rates
+    ):
+        for i in range(5):
+            login(
+                http_client, f"user{i}@example.com", HTTP_X_FORWARDED_FOR=f"1.1.1.{i}"
+            )
+
+        response = login(
+            http_client, "other@example.com", HTTP_X_FORWARDED_FOR="2.2.2.2"
+        )
+
+        assert response.status_code == 429
+
+    def test_long_emails_are_limited_under_a_bounded_key(self, http_client, db, rates):
+        email = "a" * 1000 + "@example.com"
+        for _ in range(3):
+            login(http_client, email)
+        request = Request(
+            RequestFactory().post(
+                LOGIN_URL, {"email": email}, content_type="application/json"
+            ),
+            parsers=[JSONParser()],
+        )
+
+        assert login(http_client, email.upper()).status_code == 429
+        assert len(LoginEmailThrottle().get_cache_key(request, None)) == 64
+
+    def test_limited_request_skips_database_and_hashing(
+        self, http_client, test_user, rates, django_assert_num_queries, monkeypatch
+    ):
+        for _ in range(3):
+            login(http_client, "test@example.com")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("password hashed for a limited request")
+
+        monkeypatch.setattr("django.contrib.auth.hashers.check_password", fail)
+        monkeypatch.setattr("django.contrib.auth.base_user.check_password", fail)
+        with django_assert_num_queries(0):
+            response = login(http_client, "test@example.com")
+
+        assert response.status_code == 429
+
+    def test_register_is_limited(self, http_client, db, rates, test_user_data):
+        assert http_client.post(REGISTER_URL, json=test_user_data).status_code == 201
+
+        response = http_client.post(REGISTER_URL, json=test_user_data)
+
+        assert response.status_code == 429
+        assert "Retry-After" in response.headers
+
+    @pytest.mark.parametrize("pause", [0, 90])
+    def test_retrying_at_retry_after_succeeds(
+        self, http_client, test_user, rates, clock, pause
+    ):
+        # login_ip is 5/min: ten attempts overflow one window
+        for i in range(10):
+            login(http_client, f"user{i}@example.com")
+        clock.now += pause
+        credentials = {"email": "test@example.com", "password": "testpassword123"}
+
+        response = http_client.post(LOGIN_URL, json=credentials, REMOTE_ADDR="10.0.0.1")
+        assert response.status_code == 429
+
+        clock.now += int(response.headers["Retry-After"])
+        response = http_client.post(LOGIN_URL, json=credentials, REMOTE_ADDR="10.0.0.1")
+        assert response.status_code == 200
+
+    def test_profile_is_not_limited(self, authenticated_client, rates):
+        for _ in range(10):
+            assert authenticated_client.get("/api/auth/profile/").status_code == 200
+
+    def test_decisions_are_counted(self, http_client, db, rates):
+        for _ in range(4):
+            login(http_client, "nobody@example.com")
+
+        totals = REGISTRY.collect()
+        assert (
+            totals[
+                '["api_rate_limit_decisions_total",[["scope","login_email"],'
+                '["decision","allowed"]]]'
+            ]
+            == 3
+        )
+        assert (
+            totals[
+                '["api_rate_limit_decisions_total",[["scope","login_email"],'
+                '["decision","limited"]]]'
+            ]
+            == 1
+        )
+
+
+class TestSlidingWindow:
+    def check(self, ip="10.0.0.1"):
+        request = Request(RequestFactory().post(LOGIN_URL, REMOTE_ADDR=ip))
+        throttle = LoginIPThrottle()
+        return throttle.allow_request(request, None), throttle
+
+    def test_previous_window_is_weighted_by_overlap(self, rates, clock):
+        for _ in range(5):
+            assert self.check()[0]
+
+        # 3/4 of the way into the next window a quarter of the previous
+        # window still overlaps: 5 * 0.25 + 3 = 4.25 fits, a fourth does not
+        clock.now += 60 + 45
+        assert all(self.check()[0] for _ in range(3))
+        allowed, throttle = self.check()
+
+        assert not allowed
+        # A retry in this window would make 5 + 5 * (1 - t/60) > 5; in the
+        # next one 1 + 4 * (1 - t/60) <= 5 holds at once: 15 seconds from now
+        assert throttle.wait() == 15
+
+    def test_wait_within_the_window(self, rates, clock):
+        for _ in range(10):
+            self.check()
+
+        clock.now += 60 + 30
+        allowed, throttle = self.check()
+
+        assert not allowed
+        # The retry makes 2 + 10 * (1 - t/60) <= 5 once t >= 42
+        assert throttle.wait() == 12
+
+    def test_wait_covers_an_over_limit_window(self, rates, clock):
+        for _ in range(10):
+            allowed, throttle = self.check()
+
+        assert not allowed
+        # Rest of this window, then until 1 + 10 * (1 - t/60) <= 5
+        assert throttle.wait() == 60 + 36
+
+    def test_windows_older_than_the_previous_one_do_not_count(self, rates, clock):
+        for _ in range(6):
+            self.check()
+
+        clock.now += 120
+        assert self.check()[0]
+
+    def test_disabled_scope_allows_everything(self, rates, clock):
+        rates["login_ip"] = None
+
+        assert all(self.check()[0] for _ in range(20))
+        assert cache.get("throttle:login_ip:10.0.0.1:100") is None
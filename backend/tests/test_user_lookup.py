@@ -0,0 +1,104 @@
+"""Tests for the bulk user lookup endpoint."""
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from api.lookup import LOOKUP_LIMIT
+
+User = get_user_model()
+
+USERS_URL = "/api/auth/users/"
+
+
+@pytest.fixture
+def users(test_user):
+    return [test_user] + [
+        User.objects.create_user(email=f"user{i}@example.com", password="x")
+        for i in range(3)
+    ]
+
+
+def ids_param(*users):
+    return ",".join(str(user.pk) for user in users)
+
+
+@pytest.mark.integration
+class TestUserLookup:
+    def test_returns_users_in_request_order(self, authenticated_client, users):
+        a, b, c, d = users
+
+        response = authenticated_client.get(
+            f"{USERS_URL}?ids={ids_param(c, a, d, c)},999999"
+        )
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"id": c.pk, "email": c.email},
+            {"id": a.pk, "email": a.email},
+            {"id": d.pk, "email": d.email},
+        ]
+
+    def test_sparse_fieldsets(self, authenticated_client, users):
+        response = authenticated_client.get(
+            f"{USERS_URL}?ids={ids_param(*users[:2])}&fields=email"
+        )
+
+        assert response.json() == [{"email": user.email} for user in users[:2]]
+
+    def test_cached_representations_are_reused(
+        self, authenticated_client, users, django_assert_num_queries
+    ):
+        url = f"{USERS_URL}?ids={ids_param(*users)}"
+        # Authentication plus one in_bulk query for the misses
+        with django_assert_num_queries(2):
+            authenticated_client.get(url)
+
+        with django_assert_num_queries(1):
+            response = authenticated_client.get(url)
+
+        assert [user["id"] for user in response.json()] == [u.pk for u in users]
+
+    def test_cache_is_invalidated_on_change(
+        self, authenticated_client, users, django_capture_on_commit_callbacks
+    ):
+        url = f"{USERS_URL}?ids={ids_param(users[1])}"
+        authenticated_client.get(url)
+
+        users[1].email = "changed@example.com"
+        with django_capture_on_commit_callbacks(execute=True):
+            users[1].save()
+
+        assert authenticated_client.get(url).json()[0]["email"] == (
+            "changed@example.com"
+        )
+
+    def test_profile_update_invalidates_the_cache(self, authenticated_client, users):
+        url = f"{USERS_URL}?ids={ids_param(users[0])}"
+        authenticated_client.get(url)
+
+        authenticated_client.put(
+            "/api/auth/profile/", json={"email": "renamed@example.com"}
+        )
+
+        assert authenticated_client.get(url).json()[0]["email"] == (
+            "renamed@example.com"
+        )
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "",
+            "?ids=",
+            "?ids=1,abc",
+            "?ids=99999999999999999999999",
+            "?ids=0",
+            "?ids=-1",
+            "?ids=1&fields=password",
+            "?ids=" + ",".join(str(i) for i in range(LOOKUP_LIMIT + 1)),
+        ],
+    )
+    def test_invalid_parameters(self, authenticated_client, users, query):
+        assert authenticated_client.get(USERS_URL + query).status_code == 400
+
+    def test_requires_authentication(self, http_client, users):
+        assert http_client.get(f"{USERS_URL}?ids=1").status_code == 401
@@ -86,6 +86,27 @@ export async function updateProfile(email: string): Promise<User> {
   });
 }
 
+export interface BatchRequest {
+  method?: 'GET' | 'HEAD' | 'POST' | 'PUT';
+  path: string;
+  body?: unknown;
+  headers?: Record<string, string>;
+}
+
+export interface BatchResult<T = unknown> {
+  status: number;
+  headers: Record<string, string>;
+  body: T;
+}
+
+// Several API requests in one round trip; results come back in order.
+export async function batch(requests: BatchRequest[]): Promise<BatchResult[]> {
+  return apiCall('/batch/', {
+    method: 'POST',
+    body: JSON.stringify({ requests }),
+  });
+}
+
 export function setTokens(tokens: AuthTokens) {
   if (typeof window !== 'undefined') {
     localStorage.setItem('accessToken', tokens.access);